@@ -1,24 +1,250 @@
 """
 Admin API routes with role-based access control.
 """
-from fastapi import APIRouter, Depends
+import csv
+import io
+from datetime import datetime
+from typing import Iterator, Optional
 
-from app.models import User
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.auth.principal import Principal, principal_cache
 from app.auth.deps import require_role
+from app.auth.admission import hashing_limiter, rehash_limiter
+from app.auth.audit import AuditService, audit_log
+from app.auth.ratelimit import rate_limit_store
+from app.auth.security import hashing_pool
+from app.auth.tokens import token_cache
+from app.auth.users import UserService
+from app.db import get_engine, get_read_db, replica_router
+from app.db.engine import pool_stats
+from app.core.profiling import profile_store
+from app.schemas.auth import AuditEventListResponse, UserListResponse, UserResponse
 
 router = APIRouter()
 
 
 @router.get("/status", response_model=dict)
 def get_admin_status(
-    current_user: User = Depends(require_role("admin")),
+    current_user: Principal = Depends(require_role("admin")),
 ) -> dict:
     """Get admin status endpoint (admin only).
     
     Args:
-        current_user: Current authenticated user (must have admin role)
+        current_user: Current authenticated principal (must have admin role)
         
     Returns:
         Status dictionary
     """
     return {"status": "ok"}
+
+
+@router.get("/stats", response_model=dict)
+def get_admin_stats(
+    current_user: Principal = Depends(require_role("admin")),
+) -> dict:
+    """Get in-process runtime statistics (admin only).
+
+    Args:
+        current_user: Current authenticated principal (must have admin role)
+
+    Returns:
+        Hashing pool, admission control, cache, DB pool, rate limit and
+        audit queue counters
+    """
+    return {
+        "hashing_pool": hashing_pool.stats(),
+        "hashing_admission": hashing_limiter.stats(),
+        "rehash_admission": rehash_limiter.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "db_pool": pool_stats(get_engine()),
+        "db_replicas": replica_router.stats(),
+        "rate_limit": rate_limit_store.stats(),
+        "audit_log": audit_log.stats(),
+    }
+
+
+@router.get("/profiles", response_model=dict)
+def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: Principal = Depends(require_role("admin")),
+) -> dict:
+    """List the most recent request profiles (admin only).
+
+    Args:
+        limit: Maximum number of profiles returned
+        current_user: Current authenticated principal (must have admin role)
+
+    Returns:
+        Profile summaries with time breakdowns, newest first
+    """
+    return {"profiles": profile_store.list(limit)}
+
+
+@router.get("/profiles/{profile_id}", response_model=dict)
+def get_profile(
+    profile_id: str,
+    current_user: Principal = Depends(require_role("admin")),
+) -> dict:
+    """Fetch one request profile with its collapsed stacks (admin only).
+
+    Args:
+        profile_id: Profile id from the listing
+        current_user: Current authenticated principal (must have admin role)
+
+    Returns:
+        Profile summary plus collapsed-stack samples
+
+    Raises:
+        HTTPException: If the profile does not exist
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return profile
+
+
+@router.get("/audit", response_model=AuditEventListResponse)
+def list_audit_events(
+    after: Optional[int] = Query(None, ge=0, description="next_after from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    event: Optional[str] = Query(None, max_length=32, description="Only events of this type"),
+    user_id: Optional[int] = Query(None, description="Only events about this user"),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(require_role("admin")),
+) -> dict:
+    """List audit events with keyset pagination (admin only).
+
+    Events are written in batches, so the newest ones appear up to
+    ``AUDIT_FLUSH_INTERVAL_SECONDS`` after they happened.
+
+    Args:
+        after: Id cursor returned as ``next_after`` by the previous page
+        limit: Page size
+        event: Event type filter
+        user_id: User filter
+        db: Read-only database session
+        current_user: Current authenticated principal (must have admin role)
+
+    Returns:
+        Page of events ordered by id and the cursor for the next page
+    """
+    events, next_after = AuditService.list_events(
+        db, after=after, limit=limit, event=event, user_id=user_id
+    )
+    return {"events": events, "next_after": next_after}
+
+
+def user_filters(
+    role: Optional[str] = Query(None, description="Only users with this role"),
+    created_after: Optional[datetime] = Query(None, description="Created at or after"),
+    created_before: Optional[datetime] = Query(None, description="Created before"),
+    email_prefix: Optional[str] = Query(None, min_length=1, max_length=320),
+) -> dict:
+    """Filters shared by the user listing and export endpoints."""
+    return {
+        "role": role,
+        "created_after": created_after,
+        "created_before": created_before,
+        "email_prefix": email_prefix,
+    }
+
+
+@router.get("/users", response_model=UserListResponse)
+def list_users(
+    after: Optional[int] = Query(None, ge=0, description="next_after from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    filters: dict = Depends(user_filters),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(require_role("admin")),
+) -> dict:
+    """List users with keyset pagination (admin only).
+
+    Args:
+        after: Id cursor returned as ``next_after`` by the previous page
+        limit: Page size
+        filters: Role, creation time range and email prefix filters
+        db: Read-only database session
+        current_user: Current authenticated principal (must have admin role)
+
+    Returns:
+        Page of users ordered by id and the cursor for the next page
+    """
+    rows, next_after = UserService.list_users(db, after=after, limit=limit, **filters)
+    return {"users": rows, "next_after": next_after}
+
+
+EXPORT_FIELDS = list(UserResponse.model_fields)
+
+# Bytes of rendered rows buffered before a chunk is sent
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+
+def _export_csv(rows: Iterator) -> Iterator[str]:
+    """Render user rows as CSV in chunks of about ``EXPORT_FLUSH_BYTES``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        user = UserResponse.model_validate(row, from_attributes=True)
+        writer.writerow([getattr(user, name) for name in EXPORT_FIELDS])
+        if buffer.tell() >= EXPORT_FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _export_ndjson(rows: Iterator) -> Iterator[str]:
+    """Render user rows as newline-delimited JSON in chunks."""
+    lines, size = [], 0
+    for row in rows:
+        line = UserResponse.model_validate(row, from_attributes=True).model_dump_json()
+        lines.append(line)
+        size += len(line) + 1
+        if size >= EXPORT_FLUSH_BYTES:
+            yield "\n".join(lines) + "\n"
+            lines, size = [], 0
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": (_export_csv, "text/csv"),
+    "ndjson": (_export_ndjson, "application/x-ndjson"),
+}
+
+
+@router.get("/users/export")
+def export_users(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    filters: dict = Depends(user_filters),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(require_role("admin")),
+) -> StreamingResponse:
+    """Stream every matching user as CSV or NDJSON (admin only).
+
+    Rows are fetched in ``yield_per`` chunks and written as they arrive,
+    so memory use stays constant regardless of the number of users.
+
+    Args:
+        format: "csv" or "ndjson"
+        filters: Role, creation time range and email prefix filters
+        db: Read-only database session
+        current_user: Current authenticated principal (must have admin role)
+
+    Returns:
+        Streaming response with the export
+    """
+    render, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        render(UserService.iter_users(db, **filters)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
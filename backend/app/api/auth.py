@@ -1,53 +1,96 @@
 """
 Authentication API routes.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Callable, ContextManager
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.db import get_db
-from app.schemas.auth import UserRegisterRequest, UserLoginRequest, TokenResponse, UserResponse
+from app.db import get_db, get_session_scope
+from app.auth.deps import get_token_principal
+from app.auth.principal import Principal
+from app.schemas.auth import (
+    UserRegisterRequest,
+    UserLoginRequest,
+    TokenResponse,
+    UserResponse,
+    RefreshTokenRequest,
+)
 from app.auth.service import AuthService
+from app.auth import audit
+from app.auth.admission import OverloadedError
+from app.auth.audit import audit_log
+from app.auth.ratelimit import RateLimit
+from app.auth.validation import validate_registration
+from app.core.metrics import LOGIN_FAILURE, LOGIN_OVERLOADED, LOGIN_SUCCESS
+from app.core.proxies import client_ip
 
 router = APIRouter()
 
-# Bcrypt maximum password length
-MAX_PASSWORD_LENGTH = 72
+def service_unavailable(exc: OverloadedError) -> HTTPException:
+    """Build the 503 response for a request shed by admission control.
+
+    Args:
+        exc: The admission control error
 
+    Returns:
+        HTTPException carrying a Retry-After header
+    """
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry later",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
-@router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
-def register(
+
+def revoked_token() -> HTTPException:
+    """Build the 401 response for a token whose sessions were revoked."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+@router.post(
+    "/register",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("register"))],
+)
+async def register(
     request: UserRegisterRequest,
+    http_request: Request,
     db: Session = Depends(get_db),
 ) -> dict:
     """Register a new user.
     
     Args:
         request: Registration request with email and password
+        http_request: Incoming request (client address for the audit log)
         db: Database session
         
     Returns:
         Success message
         
     Raises:
-        HTTPException: If email is already registered or validation fails
+        HTTPException: If email is already registered, validation fails or the
+            server is overloaded
     """
     try:
-        # Validate email format (basic check)
-        if len(request.email) > 320:
-            raise ValueError("Email is too long")
-        
-        # Validate password strength and length (bcrypt limit is 72 bytes)
-        if len(request.password) < 8:
-            raise ValueError("Password must be at least 8 characters")
-        
-        if len(request.password) > MAX_PASSWORD_LENGTH:
-            raise ValueError(f"Password must be at most {MAX_PASSWORD_LENGTH} characters")
+        validate_registration(request.email, request.password)
         
         # Register user
-        user = AuthService.register_user(request.email, request.password, db)
+        user = await AuthService.register_user(request.email, request.password, db)
+        await audit_log.emit(
+            audit.REGISTER, user_id=user.id, email=request.email, ip=client_ip(http_request)
+        )
         
         return {"message": "user created"}
     
+    except OverloadedError as e:
+        raise service_unavailable(e)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -60,35 +103,144 @@ def register(
         )
 
 
-@router.post("/login", response_model=TokenResponse, status_code=status.HTTP_200_OK)
-def login(
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RateLimit("login"))],
+)
+async def login(
     request: UserLoginRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    open_session: Callable[[], ContextManager[Session]] = Depends(get_session_scope),
 ) -> TokenResponse:
     """Authenticate user and return tokens.
     
     Args:
         request: Login request with email and password
+        http_request: Incoming request (client address for the audit log)
+        background_tasks: Runs the password hash upgrade after the response
         db: Database session
+        open_session: Opens the session of the background hash upgrade
         
     Returns:
         TokenResponse with access_token, refresh_token, and expires_in
         
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid or the server is overloaded
     """
     try:
-        # Authenticate user
-        user = AuthService.authenticate_user(request.email, request.password, db)
-        
-        # Create tokens
-        tokens = AuthService.create_tokens(user, db)
+        # Authenticate on the primary: the hash, role and token version that
+        # go into the new tokens must not come from a lagging replica
+        user = await AuthService.authenticate_user(request.email, request.password, db)
+        # Create tokens (blocking DB work stays off the event loop)
+        tokens = await run_in_threadpool(AuthService.create_tokens, user, db)
+        LOGIN_SUCCESS.inc()
+        await audit_log.emit(
+            audit.LOGIN, user_id=user.id, email=request.email, ip=client_ip(http_request)
+        )
+        # Stale hashes are upgraded once the response has been sent
+        background_tasks.add_task(
+            AuthService.upgrade_password_hash, user.id, request.password, user.hashed_password, open_session
+        )
         
         return TokenResponse(**tokens)
     
+    except OverloadedError as e:
+        LOGIN_OVERLOADED.inc()
+        raise service_unavailable(e)
     except ValueError:
+        LOGIN_FAILURE.inc()
+        await audit_log.emit(audit.LOGIN_FAILED, email=request.email, ip=client_ip(http_request))
         # Use generic error message to prevent user enumeration
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
         )
+
+
+@router.post("/refresh", response_model=TokenResponse, status_code=status.HTTP_200_OK)
+def refresh(
+    request: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+) -> TokenResponse:
+    """Rotate a refresh token into a new access/refresh token pair.
+
+    The presented refresh token is revoked; presenting it again fails.
+
+    Args:
+        request: Request with the current refresh token
+        db: Database session
+
+    Returns:
+        TokenResponse with access_token, refresh_token, and expires_in
+
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or revoked
+    """
+    try:
+        tokens = AuthService.rotate_refresh_token(request.refresh_token, db)
+        return TokenResponse(**tokens)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+
+@router.post("/logout", response_model=dict, status_code=status.HTTP_200_OK)
+def logout(
+    request: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Revoke a refresh token.
+
+    Args:
+        request: Request with the refresh token to revoke
+        db: Database session
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If the refresh token is invalid or expired
+    """
+    try:
+        AuthService.revoke_refresh_token(request.refresh_token, db)
+        return {"message": "logged out"}
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+
+@router.post("/logout-all", response_model=dict, status_code=status.HTTP_200_OK)
+def logout_all(
+    principal: Principal = Depends(get_token_principal),
+    db: Session = Depends(get_db),
+) -> dict:
+    """Revoke every access and refresh token of the current user.
+
+    The token version check and the revocation are a single conditional
+    update, so no separate user lookup is needed.
+
+    Args:
+        principal: Principal of the presented access token
+        db: Database session
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If the token was already revoked or the user is gone
+    """
+    try:
+        AuthService.revoke_all_sessions(principal.id, db, token_version=principal.token_version)
+    except ValueError:
+        raise revoked_token()
+    return {"message": "logged out everywhere"}
@@ -0,0 +1,216 @@
+"""
+Authentication API routes on the async database stack.
+
+Same contract as ``app.api.auth`` but every handler is ``async def`` and
+talks to the database through ``AsyncSession``, so request concurrency is
+not capped by the threadpool size. Mounted instead of the sync router when
+``settings.database_async`` is enabled.
+"""
+from typing import AsyncContextManager, Callable
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_db, get_async_session_scope
+from app.auth.deps import get_token_principal
+from app.auth.principal import Principal
+from app.schemas.auth import (
+    UserRegisterRequest,
+    UserLoginRequest,
+    TokenResponse,
+    RefreshTokenRequest,
+)
+from app.auth.async_service import AsyncAuthService
+from app.auth import audit
+from app.auth.admission import OverloadedError
+from app.auth.audit import audit_log
+from app.auth.ratelimit import RateLimit
+from app.auth.validation import validate_registration
+from app.api.auth import revoked_token, service_unavailable
+from app.core.metrics import LOGIN_FAILURE, LOGIN_OVERLOADED, LOGIN_SUCCESS
+from app.core.proxies import client_ip
+
+router = APIRouter()
+
+
+@router.post(
+    "/register",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RateLimit("register"))],
+)
+async def register(
+    request: UserRegisterRequest,
+    http_request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """Register a new user.
+
+    Args:
+        request: Registration request with email and password
+        http_request: Incoming request (client address for the audit log)
+        db: Async database session
+        open_session: Opens the session of the background hash upgrade
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If email is already registered, validation fails or the
+            server is overloaded
+    """
+    try:
+        validate_registration(request.email, request.password)
+        user = await AsyncAuthService.register_user(request.email, request.password, db)
+        await audit_log.emit(
+            audit.REGISTER, user_id=user.id, email=request.email, ip=client_ip(http_request)
+        )
+        return {"message": "user created"}
+
+    except OverloadedError as e:
+        raise service_unavailable(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Registration failed",
+        )
+
+
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RateLimit("login"))],
+)
+async def login(
+    request: UserLoginRequest,
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    open_session: Callable[[], AsyncContextManager[AsyncSession]] = Depends(get_async_session_scope),
+) -> TokenResponse:
+    """Authenticate user and return tokens.
+
+    Args:
+        request: Login request with email and password
+        http_request: Incoming request (client address for the audit log)
+        background_tasks: Runs the password hash upgrade after the response
+        db: Async database session
+
+    Returns:
+        TokenResponse with access_token, refresh_token, and expires_in
+
+    Raises:
+        HTTPException: If credentials are invalid or the server is overloaded
+    """
+    try:
+        user = await AsyncAuthService.authenticate_user(request.email, request.password, db)
+        tokens = await AsyncAuthService.create_tokens(user, db)
+        LOGIN_SUCCESS.inc()
+        await audit_log.emit(
+            audit.LOGIN, user_id=user.id, email=request.email, ip=client_ip(http_request)
+        )
+        # Stale hashes are upgraded once the response has been sent
+        background_tasks.add_task(
+            AsyncAuthService.upgrade_password_hash, user.id, request.password, user.hashed_password, open_session
+        )
+        return TokenResponse(**tokens)
+
+    except OverloadedError as e:
+        LOGIN_OVERLOADED.inc()
+        raise service_unavailable(e)
+    except ValueError:
+        LOGIN_FAILURE.inc()
+        await audit_log.emit(audit.LOGIN_FAILED, email=request.email, ip=client_ip(http_request))
+        # Use generic error message to prevent user enumeration
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+        )
+
+
+@router.post("/refresh", response_model=TokenResponse, status_code=status.HTTP_200_OK)
+async def refresh(
+    request: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> TokenResponse:
+    """Rotate a refresh token into a new access/refresh token pair.
+
+    Args:
+        request: Request with the current refresh token
+        db: Async database session
+
+    Returns:
+        TokenResponse with access_token, refresh_token, and expires_in
+
+    Raises:
+        HTTPException: If the refresh token is invalid, expired or revoked
+    """
+    try:
+        tokens = await AsyncAuthService.rotate_refresh_token(request.refresh_token, db)
+        return TokenResponse(**tokens)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+
+@router.post("/logout", response_model=dict, status_code=status.HTTP_200_OK)
+async def logout(
+    request: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """Revoke a refresh token.
+
+    Args:
+        request: Request with the refresh token to revoke
+        db: Async database session
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If the refresh token is invalid or expired
+    """
+    try:
+        await AsyncAuthService.revoke_refresh_token(request.refresh_token, db)
+        return {"message": "logged out"}
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+
+
+@router.post("/logout-all", response_model=dict, status_code=status.HTTP_200_OK)
+async def logout_all(
+    principal: Principal = Depends(get_token_principal),
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """Revoke every access and refresh token of the current user.
+
+    Args:
+        principal: Principal of the presented access token
+        db: Async database session
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If the token was already revoked or the user is gone
+    """
+    try:
+        await AsyncAuthService.revoke_all_sessions(
+            principal.id, db, token_version=principal.token_version
+        )
+    except ValueError:
+        raise revoked_token()
+    return {"message": "logged out everywhere"}
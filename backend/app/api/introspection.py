@@ -0,0 +1,68 @@
+"""
+Batch token introspection routes for gateways and downstream services.
+"""
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.auth.service import AuthService
+from app.core.settings import settings
+from app.db import get_db
+from app.schemas.auth import IntrospectionRequest, IntrospectionResponse
+
+router = APIRouter()
+
+
+def require_introspection_key(
+    x_introspection_key: Optional[str] = Header(None),
+) -> None:
+    """Authenticate the calling service by its shared introspection key.
+
+    Args:
+        x_introspection_key: X-Introspection-Key header from request
+
+    Raises:
+        HTTPException: 404 if introspection is disabled, 401 if the key is
+            missing or wrong
+    """
+    expected = settings.introspection_api_key
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_introspection_key or not hmac.compare_digest(
+        x_introspection_key.encode("utf-8"), expected.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid introspection key",
+        )
+
+
+@router.post(
+    "/introspect",
+    response_model=IntrospectionResponse,
+    dependencies=[Depends(require_introspection_key)],
+)
+def introspect(
+    request: IntrospectionRequest,
+    db: Session = Depends(get_db),
+) -> dict:
+    """Introspect a batch of access and refresh tokens in one round trip.
+
+    Args:
+        request: Tokens to introspect
+        db: Database session (primary, so revocations are current)
+
+    Returns:
+        Per-token validity, claims and revocation status, in request order
+
+    Raises:
+        HTTPException: 413 if the batch exceeds ``introspection_max_tokens``
+    """
+    if len(request.tokens) > settings.introspection_max_tokens:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.introspection_max_tokens} tokens per request",
+        )
+    return {"results": AuthService.introspect_tokens(request.tokens, db)}
@@ -0,0 +1,52 @@
+"""
+Well-known discovery routes for token verification by other services.
+"""
+from fastapi import APIRouter, Request, Response, status
+
+from app.auth.keys import key_ring
+from app.core.settings import settings
+
+router = APIRouter()
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches an entity tag.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``:
+    ``W/`` prefixes are ignored, and ``*`` matches any current entity.
+
+    Args:
+        if_none_match: Header value, a comma-separated list of entity tags
+        etag: Entity tag of the current representation
+    """
+    if not etag:
+        return False
+    target = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == target:
+            return True
+    return False
+
+
+@router.get("/jwks.json", include_in_schema=False)
+def get_jwks(request: Request) -> Response:
+    """Publish the public signing keys as a JSON Web Key Set.
+
+    The body is built once per key ring load, and the ETag lets caches
+    revalidate with a conditional request instead of refetching it.
+
+    Args:
+        request: Incoming request (for ``If-None-Match``)
+
+    Returns:
+        JWKS document, or 304 Not Modified if the client's copy is current
+    """
+    body, etag = key_ring.jwks()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.jwks_max_age_seconds}",
+    }
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,177 @@
+"""
+Admission control for expensive password-hashing work.
+
+Caps how many hashing operations run at once per process, keeps a bounded
+wait queue in front of them and sheds excess load instead of queueing
+forever. Opportunistic work (password hash upgrades after login) has its
+own small budget, taken with ``try_acquire`` so it never waits.
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque
+
+from app.core.settings import settings
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed by admission control."""
+
+    def __init__(self, retry_after: int) -> None:
+        """Initialize the error.
+
+        Args:
+            retry_after: Seconds the client should wait before retrying
+        """
+        super().__init__("Server is overloaded")
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """Concurrency limiter with a bounded FIFO wait queue and queue timeout.
+
+    All state is touched only from the event loop, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float,
+        retry_after: int = 1,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            max_concurrent: Maximum number of admitted operations at once
+            max_queue: Maximum number of operations waiting for a slot
+            queue_timeout: Seconds a waiter may queue before being shed
+            retry_after: Retry-After hint in seconds for shed requests
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Counters
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+
+    async def acquire(self) -> None:
+        """Acquire a slot, waiting in the queue if necessary.
+
+        Raises:
+            OverloadedError: If the queue is full or the wait timed out
+        """
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise OverloadedError(self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            raise OverloadedError(self.retry_after)
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now; never waits.
+
+        Returns:
+            True if a slot was taken (release it with ``release``)
+        """
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return True
+        self.shed += 1
+        return False
+
+    def release(self) -> None:
+        """Release a slot, handing it directly to the next live waiter."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.admitted += 1
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @property
+    def active(self) -> int:
+        """Number of operations currently holding a slot."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Number of operations waiting for a slot."""
+        return len(self._waiters)
+
+    @property
+    def busy(self) -> bool:
+        """Whether every slot is taken or anyone is waiting for one."""
+        return self._active >= self.max_concurrent or bool(self._waiters)
+
+    def stats(self) -> dict:
+        """Return a snapshot of limiter counters."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+        }
+
+
+hashing_limiter = AdmissionLimiter(
+    max_concurrent=settings.hash_max_concurrency,
+    max_queue=settings.hash_max_queue,
+    queue_timeout=settings.hash_queue_timeout_seconds,
+    retry_after=settings.hash_retry_after_seconds,
+)
+
+# Low-priority budget for password hash upgrades (see ``rehash_password_async``)
+rehash_limiter = AdmissionLimiter(
+    max_concurrent=settings.password_rehash_max_concurrency,
+    max_queue=0,
+    queue_timeout=0.0,
+)
@@ -0,0 +1,223 @@
+"""
+Authentication service functions for the async database stack.
+
+Mirrors ``AuthService`` on top of ``AsyncSession`` so handlers never block
+the event loop on database I/O. Token construction and SQL statements are
+shared with the sync service through ``app.auth.queries``.
+"""
+import logging
+from typing import AsyncContextManager, Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionLocal, async_transaction
+from app.models import User
+from app.auth import audit
+from app.auth.audit import audit_log
+from app.auth.queries import (
+    add_tokens,
+    bump_token_version_stmt,
+    consume_refresh_token_stmt,
+    refresh_token_claims,
+    replace_hash_stmt,
+    revoke_refresh_token_stmt,
+)
+from app.auth.security import hash_password_async, verify_password_async
+from app.auth.service import AuthService, claim_hash_upgrade
+from app.auth.principal import principal_cache
+from app.core.metrics import REFRESH_TOKENS_ISSUED
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuthService:
+    """Service class for authentication operations on an AsyncSession."""
+
+    @staticmethod
+    async def register_user(email: str, password: str, db: AsyncSession) -> User:
+        """Register a new user.
+
+        Args:
+            email: User email address
+            password: Plain text password
+            db: Async database session
+
+        Returns:
+            Created User object
+
+        Raises:
+            ValueError: If email already exists
+        """
+        hashed_pwd = await hash_password_async(password)
+        user = User(email=email.lower(), hashed_password=hashed_pwd)
+
+        try:
+            # The INSERT returns the id and server defaults; no refresh needed
+            async with async_transaction(db):
+                db.add(user)
+        except IntegrityError:
+            raise ValueError(f"Email {email} is already registered")
+
+        # Drop any stale entry left behind by a reused id
+        principal_cache.invalidate(user.id)
+        return user
+
+    @staticmethod
+    async def change_role(user_id: int, role: str, db: AsyncSession) -> User:
+        """Change a user's role and invalidate their cached principal.
+
+        Args:
+            user_id: ID of the user to update
+            role: New role (e.g., 'user' or 'admin')
+            db: Async database session
+
+        Returns:
+            Updated User object
+
+        Raises:
+            ValueError: If the user does not exist
+        """
+        async with async_transaction(db):
+            user = await db.get(User, user_id)
+            if not user:
+                raise ValueError(f"User {user_id} not found")
+            user.role = role
+        principal_cache.invalidate(user_id)
+        return user
+
+    @staticmethod
+    async def authenticate_user(email: str, password: str, db: AsyncSession) -> User:
+        """Authenticate a user with email and password.
+
+        Args:
+            email: User email address
+            password: Plain text password
+            db: Async database session
+
+        Returns:
+            User object if authentication successful
+
+        Raises:
+            ValueError: If credentials are invalid
+        """
+        result = await db.execute(select(User).where(User.email == email.lower()))
+        user = result.scalar_one_or_none()
+
+        if not user or not await verify_password_async(password, user.hashed_password):
+            raise ValueError("Invalid credentials")
+
+        return user
+
+    @staticmethod
+    async def upgrade_password_hash(
+        user_id: int,
+        password: str,
+        hashed_password: str,
+        open_session: Callable[[], AsyncContextManager[AsyncSession]] = AsyncSessionLocal,
+    ) -> None:
+        """Upgrade a stale password hash after a successful login.
+
+        Async-stack counterpart of ``AuthService.upgrade_password_hash``.
+
+        Args:
+            user_id: ID of the user who just logged in
+            password: Plain text password that was just verified
+            hashed_password: Hash the password was verified against
+            open_session: Opens the async session the new hash is written with
+        """
+        with claim_hash_upgrade(user_id) as claimed:
+            if not claimed:
+                return
+            try:
+                new_hash = await AuthService.new_hash_if_stale(password, hashed_password)
+                if new_hash is None:
+                    return
+                async with open_session() as db, async_transaction(db):
+                    await db.execute(replace_hash_stmt(user_id, hashed_password, new_hash))
+            except Exception:
+                logger.exception("Password hash upgrade failed for user %s", user_id)
+
+    @staticmethod
+    async def create_tokens(user: User, db: AsyncSession) -> dict:
+        """Create access and refresh tokens for a user.
+
+        Args:
+            user: User object
+            db: Async database session
+
+        Returns:
+            Dictionary with access_token, refresh_token, and expires_in
+        """
+        async with async_transaction(db):
+            tokens = add_tokens(user, db)
+        await AsyncAuthService._tokens_issued(user.id)
+        return tokens
+
+    @staticmethod
+    async def _tokens_issued(user_id: int) -> None:
+        """Count and audit a committed token pair."""
+        REFRESH_TOKENS_ISSUED.inc()
+        await audit_log.emit(audit.TOKEN_ISSUED, user_id=user_id)
+
+    @staticmethod
+    async def rotate_refresh_token(refresh_token: str, db: AsyncSession) -> dict:
+        """Exchange a refresh token for a new token pair, revoking the old one.
+
+        Args:
+            refresh_token: Refresh token presented by the client
+            db: Async database session
+
+        Returns:
+            Dictionary with access_token, refresh_token, and expires_in
+
+        Raises:
+            ValueError: If the refresh token is invalid, expired or already used
+        """
+        claims = refresh_token_claims(refresh_token)
+        # Revocation of the old token commits together with the new one
+        async with async_transaction(db):
+            result = await db.execute(consume_refresh_token_stmt(claims["jti"]))
+            user_id = result.scalar_one_or_none()
+            user = await db.get(User, user_id) if user_id is not None else None
+            if not user or claims.get("ver", 0) != user.token_version:
+                raise ValueError("Invalid refresh token")
+            tokens = add_tokens(user, db)
+        await AsyncAuthService._tokens_issued(user.id)
+        return tokens
+
+    @staticmethod
+    async def revoke_refresh_token(refresh_token: str, db: AsyncSession) -> None:
+        """Revoke a refresh token (logout).
+
+        Args:
+            refresh_token: Refresh token presented by the client
+            db: Async database session
+
+        Raises:
+            ValueError: If the refresh token is invalid or expired
+        """
+        jti = refresh_token_claims(refresh_token)["jti"]
+        async with async_transaction(db):
+            await db.execute(revoke_refresh_token_stmt(jti))
+
+    @staticmethod
+    async def revoke_all_sessions(
+        user_id: int, db: AsyncSession, token_version: Optional[int] = None
+    ) -> None:
+        """Invalidate every access and refresh token issued to a user.
+
+        Args:
+            user_id: ID of the user
+            db: Async database session
+            token_version: Only revoke while the stored version equals this
+
+        Raises:
+            ValueError: If the user does not exist or the version has moved on
+        """
+        async with async_transaction(db):
+            result = await db.execute(bump_token_version_stmt(user_id, token_version))
+            if not result.rowcount:
+                raise ValueError(f"User {user_id} not found or sessions already revoked")
+        principal_cache.invalidate(user_id)
@@ -0,0 +1,364 @@
+"""
+Audit log of logins, failed logins, registrations and token issuance.
+
+Recording an event only appends it to an in-memory queue, so the request
+path pays no extra commit. A background writer thread inserts queued events
+in batches: as soon as ``batch_size`` events are waiting, or when the oldest
+waiting event is ``flush_interval`` seconds old, each batch in a single
+``executemany`` transaction.
+
+When the writer falls behind and the queue reaches ``max_queue`` events,
+producers wait up to ``enqueue_timeout`` seconds for space (async callers
+wait on the threadpool, never on the event loop) and the event is dropped
+and counted only after that. ``close`` drains the queue on shutdown.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import AUDIT_EVENTS_TOTAL
+from app.core.settings import settings
+from app.db import SessionLocal
+from app.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+# Event types
+LOGIN = "login"
+LOGIN_FAILED = "login_failed"
+REGISTER = "register"
+TOKEN_ISSUED = "token_issued"
+
+# Attempts to insert a batch before it is given up, and the first retry delay
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_SECONDS = 0.1
+
+_WRITTEN = AUDIT_EVENTS_TOTAL.labels(result="written")
+_DROPPED = AUDIT_EVENTS_TOTAL.labels(result="dropped")
+_FAILED = AUDIT_EVENTS_TOTAL.labels(result="failed")
+
+
+class AuditLog:
+    """Bounded event queue drained by a batching writer thread.
+
+    The writer starts with the first recorded event, so nothing needs to be
+    started explicitly; ``close`` stops it and a later event restarts it.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue: int = 10000,
+        enqueue_timeout: float = 1.0,
+    ) -> None:
+        """Initialize the audit log.
+
+        Args:
+            session_factory: Callable returning a new database session
+            batch_size: Events inserted per transaction
+            flush_interval: Maximum seconds an event waits in the queue
+            max_queue: Queued events at which producers start waiting
+            enqueue_timeout: Seconds a producer waits for space before the
+                event is dropped
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.enqueue_timeout = enqueue_timeout
+
+        self._lock = threading.Lock()
+        self._has_events = threading.Condition(self._lock)
+        self._has_space = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._queue: deque = deque()
+        # Arrival time of the oldest queued event (monotonic)
+        self._oldest = 0.0
+        self._writing = False
+        self._flushing = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def configure(self, session_factory: Callable[[], Session]) -> None:
+        """Write subsequent batches through another session factory.
+
+        Args:
+            session_factory: Callable returning a new database session
+        """
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _row(
+        event: str,
+        user_id: Optional[int],
+        email: Optional[str],
+        ip: Optional[str],
+    ) -> dict:
+        """Build the insert parameters for one event."""
+        return {
+            "event": event,
+            "user_id": user_id,
+            "email": email.lower()[:320] if email else None,
+            "ip": ip,
+            "created_at": datetime.utcnow(),
+        }
+
+    def record(
+        self,
+        event: str,
+        user_id: Optional[int] = None,
+        email: Optional[str] = None,
+        ip: Optional[str] = None,
+    ) -> None:
+        """Queue an event, waiting for space if the queue is full.
+
+        For synchronous code; async code uses ``emit``.
+
+        Args:
+            event: Event type, e.g. ``LOGIN``
+            user_id: Subject user id, if known
+            email: Email the request named
+            ip: Client address
+        """
+        if not settings.audit_enabled:
+            return
+        if not self._enqueue(self._row(event, user_id, email, ip), self.enqueue_timeout):
+            self._drop(event)
+
+    async def emit(
+        self,
+        event: str,
+        user_id: Optional[int] = None,
+        email: Optional[str] = None,
+        ip: Optional[str] = None,
+    ) -> None:
+        """Queue an event from async code without blocking the event loop.
+
+        Args:
+            event: Event type, e.g. ``LOGIN``
+            user_id: Subject user id, if known
+            email: Email the request named
+            ip: Client address
+        """
+        if not settings.audit_enabled:
+            return
+        row = self._row(event, user_id, email, ip)
+        if self._enqueue(row, 0):
+            return
+        # Queue full: wait for space off the event loop
+        if not await run_in_threadpool(self._enqueue, row, self.enqueue_timeout):
+            self._drop(event)
+
+    def _enqueue(self, row: dict, timeout: float) -> bool:
+        """Append a row, waiting up to ``timeout`` seconds for space.
+
+        Returns:
+            False if the queue was still full
+        """
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                if timeout <= 0 or not self._has_space.wait_for(
+                    lambda: len(self._queue) < self.max_queue, timeout
+                ):
+                    return False
+            if not self._queue:
+                self._oldest = time.monotonic()
+            self._queue.append(row)
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._has_events.notify()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+        return True
+
+    def _drop(self, event: str) -> None:
+        """Count an event lost to a full queue."""
+        with self._lock:
+            self.dropped += 1
+            dropped = self.dropped
+        _DROPPED.inc()
+        # Log the first drop of every thousand, not each one
+        if dropped % 1000 == 1:
+            logger.warning("Audit queue full, dropped %s event (%d dropped so far)", event, dropped)
+
+    def _next_batch(self) -> Optional[List[dict]]:
+        """Wait until a batch is due and take it off the queue.
+
+        Returns:
+            Up to ``batch_size`` rows, or None once closing with an empty queue
+        """
+        with self._lock:
+            while True:
+                if self._queue:
+                    due = self._oldest + self.flush_interval
+                    if (
+                        len(self._queue) >= self.batch_size
+                        or self._flushing
+                        or self._closing
+                        or time.monotonic() >= due
+                    ):
+                        break
+                    self._has_events.wait(due - time.monotonic())
+                elif self._closing:
+                    return None
+                else:
+                    self._has_events.wait()
+
+            count = min(len(self._queue), self.batch_size)
+            batch = [self._queue.popleft() for _ in range(count)]
+            # Leftover events were queued after the batch; restart their clock
+            self._oldest = time.monotonic()
+            self._writing = True
+            self._has_space.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        """Writer thread: insert batches until closed and drained."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._write(batch)
+            with self._lock:
+                self._writing = False
+                if not self._queue:
+                    self._idle.notify_all()
+
+    def _write(self, batch: List[dict]) -> None:
+        """Insert a batch in one transaction, retrying transient failures."""
+        for attempt in range(WRITE_ATTEMPTS):
+            db = self.session_factory()
+            try:
+                db.execute(insert(AuditEvent), batch)
+                db.commit()
+                break
+            except Exception:
+                db.rollback()
+                if attempt == WRITE_ATTEMPTS - 1:
+                    logger.exception("Audit log write failed, %d events lost", len(batch))
+                    with self._lock:
+                        self.failed += len(batch)
+                    _FAILED.inc(len(batch))
+                    return
+                time.sleep(WRITE_RETRY_SECONDS * 2 ** attempt)
+            finally:
+                db.close()
+        with self._lock:
+            self.written += len(batch)
+        _WRITTEN.inc(len(batch))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write every queued event now and wait until it is stored.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            False if events were still pending when the timeout expired
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return not self._queue
+            self._flushing = True
+            self._has_events.notify()
+            try:
+                return self._idle.wait_for(lambda: not self._queue and not self._writing, timeout)
+            finally:
+                self._flushing = False
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Drain the queue and stop the writer (application shutdown).
+
+        Args:
+            timeout: Seconds to wait for the writer to finish
+        """
+        with self._lock:
+            thread = self._thread
+            self._closing = True
+            self._has_events.notify()
+        try:
+            if thread is not None:
+                thread.join(timeout)
+                if thread.is_alive():
+                    logger.warning("Audit writer still busy after %.1fs at shutdown", timeout)
+                    return
+            # Events queued while the writer was exiting
+            with self._lock:
+                leftover = list(self._queue)
+                self._queue.clear()
+            if leftover:
+                self._write(leftover)
+        finally:
+            with self._lock:
+                self._closing = False
+
+    def stats(self) -> dict:
+        """Return a snapshot of queue and writer counters."""
+        with self._lock:
+            return {
+                "queued": len(self._queue),
+                "max_queue": self.max_queue,
+                "batch_size": self.batch_size,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+            }
+
+
+audit_log = AuditLog(
+    SessionLocal,
+    batch_size=settings.audit_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    max_queue=settings.audit_queue_size,
+    enqueue_timeout=settings.audit_enqueue_timeout_seconds,
+)
+
+
+class AuditService:
+    """Service class for audit log queries."""
+
+    @staticmethod
+    def list_events(
+        db: Session,
+        after: Optional[int] = None,
+        limit: int = 100,
+        event: Optional[str] = None,
+        user_id: Optional[int] = None,
+    ) -> Tuple[List[AuditEvent], Optional[int]]:
+        """Fetch one page of audit events in id (write) order.
+
+        Args:
+            db: Database session
+            after: Id of the last event on the previous page
+            limit: Page size
+            event: Only events of this type
+            user_id: Only events about this user
+
+        Returns:
+            Tuple of (events, cursor for the next page or None on the last page)
+        """
+        stmt = select(AuditEvent).order_by(AuditEvent.id)
+        if event is not None:
+            stmt = stmt.where(AuditEvent.event == event)
+        if user_id is not None:
+            stmt = stmt.where(AuditEvent.user_id == user_id)
+        if after is not None:
+            stmt = stmt.where(AuditEvent.id > after)
+        # One extra row tells whether another page exists
+        events = db.execute(stmt.limit(limit + 1)).scalars().all()
+        if len(events) > limit:
+            return events[:limit], events[limit - 1].id
+        return events, None
@@ -0,0 +1,101 @@
+"""
+Pick the password hashing cost for this machine.
+
+Times one hash at increasing cost until a hash takes longer than the target
+latency, and recommends the highest cost that stayed within it:
+
+    python -m app.auth.calibrate [--scheme bcrypt|argon2] [--target-ms 250]
+        [--samples 3]
+
+For bcrypt the cost is ``BCRYPT_ROUNDS`` (each step doubles the work); for
+argon2 it is ``ARGON2_TIME_COST`` at the configured memory cost and
+parallelism. Run it on the production hardware. Existing hashes are
+upgraded to the new cost on each user's next successful login.
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List, Optional, Tuple
+
+from app.auth.security import argon2, hash_password_with
+from app.core.settings import settings
+
+PASSWORD = "calibration-password-123"
+
+# Cost ranges searched, lowest first
+BCRYPT_ROUNDS = range(4, 20)
+ARGON2_TIME_COSTS = range(1, 33)
+
+
+def time_hash(hash_once: Callable[[], object], samples: int) -> float:
+    """Return the median seconds of ``samples`` calls."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hash_once()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(
+    scheme: str,
+    target_seconds: float,
+    samples: int = 3,
+) -> Tuple[Optional[int], List[Tuple[int, float]]]:
+    """Find the highest cost whose median hash time fits the target.
+
+    Args:
+        scheme: "bcrypt" or "argon2"
+        target_seconds: Latency budget for one hash
+        samples: Timed hashes per cost
+
+    Returns:
+        Tuple of (recommended cost or None if even the lowest is too slow,
+        list of (cost, median seconds) measured)
+
+    Raises:
+        ValueError: If argon2 is requested but not installed
+    """
+    if scheme == "argon2":
+        if argon2 is None:
+            raise ValueError("argon2 calibration requires the argon2-cffi package")
+        costs = ARGON2_TIME_COSTS
+
+        def params(cost: int) -> tuple:
+            return (cost, settings.argon2_memory_cost_kib, settings.argon2_parallelism)
+    else:
+        costs = BCRYPT_ROUNDS
+
+        def params(cost: int) -> tuple:
+            return (cost,)
+
+    best, measured = None, []
+    for cost in costs:
+        seconds = time_hash(lambda: hash_password_with(PASSWORD, scheme, params(cost)), samples)
+        measured.append((cost, seconds))
+        if seconds > target_seconds:
+            break
+        best = cost
+    return best, measured
+
+
+def main() -> None:
+    """Command line entry point for cost calibration."""
+    parser = argparse.ArgumentParser(description="Pick the password hashing cost for this machine.")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.password_hash_scheme)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="latency budget for one hash")
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    best, measured = calibrate(args.scheme, args.target_ms / 1000, args.samples)
+    for cost, seconds in measured:
+        print(f"cost {cost:>2}: {seconds * 1000:9.1f} ms")
+    if best is None:
+        print(f"even the lowest cost exceeds {args.target_ms:.0f} ms")
+        return
+    name = "BCRYPT_ROUNDS" if args.scheme == "bcrypt" else "ARGON2_TIME_COST"
+    print(f"\nrecommended: PASSWORD_HASH_SCHEME={args.scheme} {name}={best}")
+
+
+if __name__ == "__main__":
+    main()
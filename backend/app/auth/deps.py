@@ -1,93 +1,197 @@
 """
 Dependency injection functions for authentication and authorization.
 """
-from typing import Optional
+from typing import Callable, ContextManager, Optional
 from fastapi import Depends, HTTPException, status, Header
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_session_scope
 from app.models import User
+from app.auth.principal import Principal, principal_cache
 from app.auth.tokens import decode_token, validate_token_expiry
+from app.core.settings import settings
 
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token.
-    
+def _unauthorized(detail: str) -> HTTPException:
+    """Build a 401 error with the Bearer challenge header."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _principal_from_header(authorization: Optional[str]) -> Principal:
+    """Verify the bearer token in an Authorization header.
+
     Args:
         authorization: Authorization header from request
-        db: Database session
-        
+
     Returns:
-        User object
-        
+        Principal built from the verified token claims
+
     Raises:
-        HTTPException: If token is invalid, expired, or user not found
+        HTTPException: If the header or token is missing, invalid or expired
     """
     if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing authorization header",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        raise _unauthorized("Missing authorization header")
+
     parts = authorization.split()
     if len(parts) != 2 or parts[0].lower() != "bearer":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization header format",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        raise _unauthorized("Invalid authorization header format")
+
     token = parts[1]
-    
+
     payload = decode_token(token)
     if not payload or not validate_token_expiry(payload):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token claims",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user = db.query(User).filter(User.id == int(user_id)).first()
+        raise _unauthorized("Invalid or expired token")
+
+    try:
+        return Principal.from_claims(payload)
+    except (TypeError, ValueError):
+        raise _unauthorized("Invalid token claims")
+
+
+def get_token_principal(authorization: Optional[str] = Header(None)) -> Principal:
+    """Get the principal of a verified bearer token, without a database query.
+
+    For handlers whose own statement checks the token version (e.g. a
+    conditional update), so a separate users lookup would be redundant.
+
+    Args:
+        authorization: Authorization header from request
+
+    Returns:
+        Principal built from the token claims
+
+    Raises:
+        HTTPException: If the header or token is missing, invalid or expired
+    """
+    return _principal_from_header(authorization)
+
+
+def _load_user(principal: Principal, db: Session) -> User:
+    """Load the ORM user for a principal.
+
+    Raises:
+        HTTPException: If the user no longer exists
+    """
+    user = db.query(User).filter(User.id == principal.id).first()
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
+        raise _unauthorized("User not found")
     return user
 
 
+def _check_token_version(token_principal: Principal, token_version: int) -> None:
+    """Reject tokens issued before the user's sessions were revoked.
+
+    Raises:
+        HTTPException: If the token's version does not match the stored one
+    """
+    if token_principal.token_version != token_version:
+        raise _unauthorized("Token has been revoked")
+
+
+def _stored_principal(
+    token_principal: Principal,
+    open_session: Callable[[], ContextManager[Session]],
+) -> Principal:
+    """Check a token's principal against the users table.
+
+    Goes through ``principal_cache`` when it is enabled, so hot users are
+    not re-fetched on every request; deleted users, role changes and
+    session revocations take effect once the cached entry is invalidated
+    or expires. A session is opened only on a cache miss, on the primary
+    rather than a replica so a revocation is seen as soon as the cached
+    entry is invalidated.
+
+    Raises:
+        HTTPException: If the user no longer exists or the token is revoked
+    """
+    stored = principal_cache.get(token_principal.id) if settings.principal_cache_enabled else None
+    if stored is None:
+        # Taken before the query: a role change or revocation committed
+        # while it runs invalidates the entry, and the stale row is not cached
+        generation = principal_cache.generation()
+        with open_session() as db:
+            stored = Principal.from_user(_load_user(token_principal, db))
+        if settings.principal_cache_enabled:
+            principal_cache.set(stored.id, stored, generation=generation)
+
+    _check_token_version(token_principal, stored.token_version)
+    return stored
+
+
+def get_current_user(
+    authorization: Optional[str] = Header(None),
+    open_session: Callable[[], ContextManager[Session]] = Depends(get_session_scope),
+) -> Principal:
+    """Get the current user, always checked against the users table.
+
+    Unlike ``get_current_principal`` this ignores
+    ``settings.auth_stateless_principal``, for handlers that must never
+    trust token claims alone. The stored identity comes from
+    ``principal_cache`` (compact and immutable); load the ORM row in the
+    handler if it needs more columns.
+
+    Args:
+        authorization: Authorization header from request
+        open_session: Opens a database session on a cache miss
+
+    Returns:
+        Principal mirroring the stored user
+
+    Raises:
+        HTTPException: If token is invalid, expired, revoked, or user not found
+    """
+    return _stored_principal(_principal_from_header(authorization), open_session)
+
+
+def get_current_principal(
+    authorization: Optional[str] = Header(None),
+    open_session: Callable[[], ContextManager[Session]] = Depends(get_session_scope),
+) -> Principal:
+    """Get the current principal, checked against the users table by default.
+
+    Same check as ``get_current_user``. When
+    ``settings.auth_stateless_principal`` is enabled the principal is
+    instead built from the verified token claims alone, so revoked access
+    tokens stay usable until they expire.
+
+    Args:
+        authorization: Authorization header from request
+        open_session: Opens a database session (only used in stateful mode)
+
+    Returns:
+        Principal for the authenticated caller
+
+    Raises:
+        HTTPException: If token is invalid, expired, revoked, or user not found
+    """
+    principal = _principal_from_header(authorization)
+    if settings.auth_stateless_principal:
+        return principal
+    return _stored_principal(principal, open_session)
+
+
 def require_role(*allowed_roles: str):
     """Dependency that requires user to have one of the specified roles.
-    
+
     Args:
         allowed_roles: Tuple of allowed role strings
-        
+
     Returns:
-        Dependency function that validates user role
+        Dependency function that validates the principal's role
     """
-    def check_role(current_user: User = Depends(get_current_user)) -> User:
+    def check_role(current_user: Principal = Depends(get_current_principal)) -> Principal:
         """Check if user has required role.
-        
+
         Args:
-            current_user: Current authenticated user
-            
+            current_user: Current authenticated principal
+
         Returns:
-            User object if authorized
-            
+            Principal if authorized
+
         Raises:
             HTTPException: If user role is not allowed
         """
@@ -97,5 +201,5 @@ def require_role(*allowed_roles: str):
                 detail="Insufficient permissions",
             )
         return current_user
-    
+
     return check_role
@@ -0,0 +1,309 @@
+"""
+Bulk user import from CSV or JSON Lines files.
+
+Rows are streamed from the file in batches. Emails already taken (in the
+database or earlier in the file) are rejected before any hashing, the
+remaining passwords are hashed across a process pool on all cores, and each
+batch is inserted with a single ``executemany`` transaction. Hashing of the
+next batches overlaps with the insert of the current one, so throughput is
+bound by bcrypt rather than by commits:
+
+    python -m app.auth.importer users.csv [--format csv|jsonl] [--batch-size N]
+        [--workers N] [--role user]
+
+Each row needs ``email`` and ``password``; ``role`` is optional. Rejected rows
+are reported with their line number and reason without aborting the import.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.auth.security import hash_config, hash_password_with
+from app.auth.validation import validate_registration
+from app.models import User
+
+ROLES = ("user", "admin")
+
+# Passwords hashed per pool task, so inter-process overhead is amortized
+HASH_CHUNK_SIZE = 32
+
+
+@dataclass
+class ImportResult:
+    """Counts for an import run."""
+
+    rows: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Imported users per second."""
+        return self.imported / self.duration_seconds if self.duration_seconds else 0.0
+
+
+@dataclass
+class _Row:
+    """A validated input row awaiting insertion."""
+
+    line: int
+    email: str
+    password: str
+    role: str
+
+
+def read_rows(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, dict]]:
+    """Stream rows from a CSV (with header) or JSON Lines file.
+
+    Args:
+        path: Input file path
+        fmt: "csv" or "jsonl"; inferred from the extension when omitted
+
+    Yields:
+        Tuples of (line number, row dict); malformed JSON lines yield an
+        empty dict so they are reported as invalid
+    """
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = {}
+            yield line_number, row if isinstance(row, dict) else {}
+
+
+def _hash_chunk(passwords: List[str], scheme: str, cost: tuple) -> List[str]:
+    """Hash a chunk of passwords (module-level so it can be pickled)."""
+    return [hash_password_with(password, scheme, cost) for password in passwords]
+
+
+class UserImporter:
+    """Imports users in batches with pooled hashing and batched inserts."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        executor: Executor,
+        batch_size: int = 1000,
+        default_role: str = "user",
+        on_reject: Optional[Callable[[int, str, str], None]] = None,
+        on_progress: Optional[Callable[[ImportResult], None]] = None,
+    ) -> None:
+        """Initialize the importer.
+
+        Args:
+            session_factory: Callable returning a new database session
+            executor: Pool the password hashing runs on
+            batch_size: Rows per insert transaction
+            default_role: Role for rows without one
+            on_reject: Called with (line, email, reason) for each rejected row
+            on_progress: Called with the running totals after each batch
+        """
+        self.session_factory = session_factory
+        self.executor = executor
+        self.batch_size = batch_size
+        self.default_role = default_role
+        self.on_reject = on_reject or (lambda line, email, reason: None)
+        self.on_progress = on_progress or (lambda result: None)
+        # Emails seen earlier in the file, so in-file duplicates skip hashing
+        self._seen: set = set()
+
+    def _validate(self, line: int, raw: dict, result: ImportResult) -> Optional[_Row]:
+        """Turn a raw row into a ``_Row``, or reject it."""
+        email = str(raw.get("email") or "").strip().lower()
+        password = raw.get("password") or ""
+        role = raw.get("role") or self.default_role
+        try:
+            if not email or "@" not in email:
+                raise ValueError("Invalid email")
+            if role not in ROLES:
+                raise ValueError(f"Invalid role {role}")
+            validate_registration(email, str(password))
+        except ValueError as e:
+            result.invalid += 1
+            self.on_reject(line, email, str(e))
+            return None
+        if email in self._seen:
+            result.duplicates += 1
+            self.on_reject(line, email, "duplicate email in file")
+            return None
+        self._seen.add(email)
+        return _Row(line, email, str(password), role)
+
+    def _drop_existing(self, db: Session, rows: List[_Row], result: ImportResult) -> List[_Row]:
+        """Reject rows whose email is already registered (one IN query)."""
+        existing = set(
+            db.execute(select(User.email).where(User.email.in_([row.email for row in rows]))).scalars()
+        )
+        db.rollback()
+        kept = []
+        for row in rows:
+            if row.email in existing:
+                result.duplicates += 1
+                self.on_reject(row.line, row.email, "email already registered")
+            else:
+                kept.append(row)
+        return kept
+
+    def _submit(self, rows: List[_Row]) -> List[Future]:
+        """Start hashing a batch's passwords on the pool."""
+        scheme, cost = hash_config()
+        return [
+            self.executor.submit(
+                _hash_chunk, [row.password for row in rows[i:i + HASH_CHUNK_SIZE]], scheme, cost
+            )
+            for i in range(0, len(rows), HASH_CHUNK_SIZE)
+        ]
+
+    def _insert(self, db: Session, rows: List[_Row], hashes: List[str], result: ImportResult) -> None:
+        """Insert a hashed batch in one transaction.
+
+        If a concurrent registration took one of the emails since the
+        duplicate check, the batch is retried row by row so only the
+        conflicting rows are rejected.
+        """
+        values = [
+            {"email": row.email, "hashed_password": hashed, "role": row.role}
+            for row, hashed in zip(rows, hashes)
+        ]
+        try:
+            db.execute(insert(User), values)
+            db.commit()
+            result.imported += len(values)
+            return
+        except IntegrityError:
+            db.rollback()
+
+        for row, value in zip(rows, values):
+            try:
+                db.execute(insert(User), [value])
+                db.commit()
+                result.imported += 1
+            except IntegrityError:
+                db.rollback()
+                result.duplicates += 1
+                self.on_reject(row.line, row.email, "email already registered")
+
+    def run(self, rows: Iterator[Tuple[int, dict]], max_pending: Optional[int] = None) -> ImportResult:
+        """Import all rows.
+
+        Args:
+            rows: (line number, row dict) pairs, e.g. from ``read_rows``
+            max_pending: Batches hashing ahead of the insert (bounds memory);
+                defaults to 2
+
+        Returns:
+            ImportResult with the final counts
+        """
+        result = ImportResult()
+        started = time.perf_counter()
+        pending: deque = deque()
+        max_pending = max_pending or 2
+        db = self.session_factory()
+
+        def drain(limit: int) -> None:
+            while len(pending) > limit:
+                batch, futures = pending.popleft()
+                hashes = [hashed for future in futures for hashed in future.result()]
+                self._insert(db, batch, hashes, result)
+                result.duration_seconds = time.perf_counter() - started
+                self.on_progress(result)
+
+        def flush(batch: List[_Row]) -> None:
+            batch = self._drop_existing(db, batch, result)
+            if batch:
+                pending.append((batch, self._submit(batch)))
+            drain(max_pending)
+
+        try:
+            batch: List[_Row] = []
+            for line, raw in rows:
+                result.rows += 1
+                row = self._validate(line, raw, result)
+                if row is not None:
+                    batch.append(row)
+                if len(batch) >= self.batch_size:
+                    flush(batch)
+                    batch = []
+            if batch:
+                flush(batch)
+            drain(0)
+        finally:
+            for _batch, futures in pending:
+                for future in futures:
+                    future.cancel()
+            db.close()
+
+        result.duration_seconds = time.perf_counter() - started
+        return result
+
+
+def main() -> None:
+    """Command line entry point for a bulk import."""
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV or JSON Lines.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--role", choices=ROLES, default="user", help="role for rows without one")
+    args = parser.parse_args()
+
+    from app.db import SessionLocal, init_db
+
+    init_db()
+
+    def report(line: int, email: str, reason: str) -> None:
+        print(f"line {line}: {email or '<missing email>'}: {reason}", file=sys.stderr)
+
+    last_report = [0.0]
+
+    def progress(result: ImportResult) -> None:
+        if result.duration_seconds - last_report[0] >= 1.0:
+            last_report[0] = result.duration_seconds
+            print(
+                f"{result.rows} rows read, {result.imported} imported "
+                f"({result.rate:.0f} users/s), {result.duplicates} duplicates, "
+                f"{result.invalid} invalid",
+                file=sys.stderr,
+            )
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        importer = UserImporter(
+            SessionLocal,
+            executor,
+            batch_size=args.batch_size,
+            default_role=args.role,
+            on_reject=report,
+            on_progress=progress,
+        )
+        result = importer.run(read_rows(args.path, args.format))
+    print(
+        f"imported {result.imported} of {result.rows} rows "
+        f"({result.duplicates} duplicates, {result.invalid} invalid) "
+        f"in {result.duration_seconds:.1f}s, {result.rate:.0f} users/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Purge job for expired and revoked refresh tokens.
+
+Rows are deleted in bounded batches, each in its own short transaction,
+with a pause between batches so the purge never holds long locks. It can
+run periodically inside the app or from the command line:
+
+    python -m app.auth.janitor [--batch-size N] [--pause SECONDS]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeResult:
+    """Outcome of a single purge run."""
+
+    expired: int = 0
+    revoked: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def rows_purged(self) -> int:
+        """Total number of rows deleted."""
+        return self.expired + self.revoked
+
+
+def _delete_batches(
+    db: Session,
+    condition,
+    batch_size: int,
+    pause_seconds: float,
+    result: PurgeResult,
+) -> int:
+    """Delete rows matching a condition in batches, committing after each.
+
+    Returns:
+        Number of rows deleted
+    """
+    deleted = 0
+    while True:
+        batch_ids = (
+            select(RefreshToken.id)
+            .where(condition)
+            .order_by(RefreshToken.id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        rowcount = db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(batch_ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+
+        if rowcount <= 0:
+            return deleted
+        deleted += rowcount
+        result.batches += 1
+        if rowcount < batch_size:
+            return deleted
+        if pause_seconds > 0:
+            time.sleep(pause_seconds)
+
+
+def purge_refresh_tokens(
+    db: Session,
+    batch_size: Optional[int] = None,
+    pause_seconds: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> PurgeResult:
+    """Delete expired and revoked refresh tokens in bounded batches.
+
+    Expired rows are found through the ``expires_at`` index and revoked rows
+    through the partial ``revoked`` index.
+
+    Args:
+        db: Database session
+        batch_size: Maximum rows deleted per transaction
+        pause_seconds: Sleep between batches
+        now: Reference time for expiry (defaults to the current UTC time)
+
+    Returns:
+        PurgeResult with row counts and elapsed time
+    """
+    batch_size = batch_size or settings.refresh_token_purge_batch_size
+    if pause_seconds is None:
+        pause_seconds = settings.refresh_token_purge_pause_seconds
+    now = now or datetime.utcnow()
+
+    result = PurgeResult()
+    started = time.perf_counter()
+    result.expired = _delete_batches(
+        db, RefreshToken.expires_at < now, batch_size, pause_seconds, result
+    )
+    result.revoked = _delete_batches(
+        db, RefreshToken.revoked.is_(True), batch_size, pause_seconds, result
+    )
+    result.duration_seconds = time.perf_counter() - started
+    return result
+
+
+async def run_periodic_purge(session_factory: Callable[[], Session], interval_seconds: float) -> None:
+    """Run the purge forever at a fixed interval until cancelled.
+
+    Each run executes in a worker thread so the event loop stays free.
+
+    Args:
+        session_factory: Callable returning a new database session
+        interval_seconds: Seconds between runs
+    """
+    def run_once() -> PurgeResult:
+        db = session_factory()
+        try:
+            return purge_refresh_tokens(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            result = await asyncio.to_thread(run_once)
+        except Exception:
+            logger.exception("Refresh token purge failed")
+            continue
+        logger.info(
+            "Purged %d refresh tokens (%d expired, %d revoked) in %d batches, %.3fs",
+            result.rows_purged,
+            result.expired,
+            result.revoked,
+            result.batches,
+            result.duration_seconds,
+        )
+
+
+def main() -> None:
+    """Command line entry point for a one-off purge."""
+    parser = argparse.ArgumentParser(description="Purge expired and revoked refresh tokens.")
+    parser.add_argument("--batch-size", type=int, default=settings.refresh_token_purge_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.refresh_token_purge_pause_seconds)
+    args = parser.parse_args()
+
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        result = purge_refresh_tokens(db, batch_size=args.batch_size, pause_seconds=args.pause)
+    finally:
+        db.close()
+    print(
+        f"purged {result.rows_purged} rows "
+        f"({result.expired} expired, {result.revoked} revoked) "
+        f"in {result.batches} batches, {result.duration_seconds:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
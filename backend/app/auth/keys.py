@@ -0,0 +1,370 @@
+"""
+Asymmetric signing keys for access and refresh tokens.
+
+Keys are PEM files in ``settings.jwt_keys_dir``; each file's stem is its
+``kid``. A private key PEM signs and verifies, a public key PEM only
+verifies (keep retired keys this way until tokens signed with them have
+expired). Supported algorithms are EdDSA (Ed25519) and ES256 (P-256).
+
+The ring is loaded once and re-checked at most every
+``jwt_keys_reload_seconds``: when the set of files or their modification
+times change it is reloaded, so keys rotate without a restart. Key files
+can be generated with:
+
+    python -m app.auth.keys generate --alg EdDSA [--kid KID] [--dir DIR]
+"""
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.asymmetric.utils import (
+    decode_dss_signature,
+    encode_dss_signature,
+)
+
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ALGORITHMS = ("EdDSA", "ES256")
+
+# Size of each of r and s in a raw (JOSE) P-256 signature
+_P256_COORDINATE_BYTES = 32
+
+# Minimum seconds between directory checks triggered by unknown kids
+_UNKNOWN_KID_RECHECK_SECONDS = 1.0
+
+
+def _b64url(data: bytes) -> str:
+    """Base64url-encode without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+@dataclass
+class SigningKey:
+    """One key of the ring, identified by ``kid``."""
+
+    kid: str
+    alg: str
+    public_key: object
+    private_key: Optional[object] = None
+    # Encoded JWT header segment, built once per key
+    header_segment: bytes = field(init=False, default=b"")
+
+    def __post_init__(self) -> None:
+        header = json.dumps(
+            {"alg": self.alg, "kid": self.kid, "typ": "JWT"},
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+        self.header_segment = base64.urlsafe_b64encode(header.encode("utf-8")).rstrip(b"=")
+
+    @property
+    def can_sign(self) -> bool:
+        """Whether the private half is available."""
+        return self.private_key is not None
+
+    def sign(self, data: bytes) -> bytes:
+        """Sign ``data``, returning a JOSE-format signature.
+
+        Raises:
+            ValueError: If this is a verification-only key
+        """
+        if self.private_key is None:
+            raise ValueError(f"Key {self.kid} has no private key")
+        if self.alg == "EdDSA":
+            return self.private_key.sign(data)
+        der = self.private_key.sign(data, ec.ECDSA(hashes.SHA256()))
+        r, s = decode_dss_signature(der)
+        return r.to_bytes(_P256_COORDINATE_BYTES, "big") + s.to_bytes(_P256_COORDINATE_BYTES, "big")
+
+    def verify(self, signature: bytes, data: bytes) -> bool:
+        """Check a JOSE-format signature over ``data``."""
+        try:
+            if self.alg == "EdDSA":
+                self.public_key.verify(signature, data)
+            else:
+                if len(signature) != 2 * _P256_COORDINATE_BYTES:
+                    return False
+                r = int.from_bytes(signature[:_P256_COORDINATE_BYTES], "big")
+                s = int.from_bytes(signature[_P256_COORDINATE_BYTES:], "big")
+                self.public_key.verify(encode_dss_signature(r, s), data, ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
+            return False
+        return True
+
+    def jwk(self) -> dict:
+        """Return the public key as a JWK."""
+        if self.alg == "EdDSA":
+            raw = self.public_key.public_bytes(
+                serialization.Encoding.Raw, serialization.PublicFormat.Raw
+            )
+            return {"kty": "OKP", "crv": "Ed25519", "x": _b64url(raw), "kid": self.kid, "alg": "EdDSA", "use": "sig"}
+        numbers = self.public_key.public_numbers()
+        return {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": _b64url(numbers.x.to_bytes(_P256_COORDINATE_BYTES, "big")),
+            "y": _b64url(numbers.y.to_bytes(_P256_COORDINATE_BYTES, "big")),
+            "kid": self.kid,
+            "alg": "ES256",
+            "use": "sig",
+        }
+
+
+def _algorithm_for(public_key) -> str:
+    """Map a public key object to its JWS algorithm.
+
+    Raises:
+        ValueError: If the key type is not supported
+    """
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(public_key.curve, ec.SECP256R1):
+        return "ES256"
+    raise ValueError(f"Unsupported key type: {type(public_key).__name__}")
+
+
+def load_key(path: str) -> SigningKey:
+    """Load a private or public key PEM file.
+
+    Args:
+        path: Path to the PEM file; its stem becomes the kid
+
+    Returns:
+        SigningKey for the file
+
+    Raises:
+        ValueError: If the file is not a supported PEM key
+    """
+    kid = os.path.splitext(os.path.basename(path))[0]
+    with open(path, "rb") as f:
+        data = f.read()
+    if b"PRIVATE KEY" in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    else:
+        private_key = None
+        public_key = serialization.load_pem_public_key(data)
+    return SigningKey(kid=kid, alg=_algorithm_for(public_key), public_key=public_key, private_key=private_key)
+
+
+class KeyRing:
+    """Keys indexed by kid, with one active signing key."""
+
+    def __init__(self, directory: str, signing_kid: str = "", reload_seconds: float = 10.0) -> None:
+        """Initialize an empty ring; keys load on first use.
+
+        Args:
+            directory: Directory holding ``<kid>.pem`` files
+            signing_kid: Kid to sign with; defaults to the last private key
+                in sorted order (e.g. date-prefixed kids pick the newest)
+            reload_seconds: Minimum seconds between directory checks
+        """
+        self.directory = directory
+        self.signing_kid = signing_kid
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._keys: Dict[str, SigningKey] = {}
+        self._signing: Optional[SigningKey] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._checked_at = float("-inf")
+        self._jwks: Tuple[bytes, str] = (b'{"keys":[]}', "")
+
+    def _scan(self) -> Tuple:
+        """Return (name, mtime, size) of every PEM file in the directory."""
+        try:
+            entries = sorted(
+                (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(".pem")
+            )
+        except FileNotFoundError:
+            return ()
+        return tuple(entries)
+
+    def _load(self, fingerprint: Tuple) -> None:
+        """Replace the ring with the keys on disk (lock held)."""
+        keys = {}
+        for name, _mtime, _size in fingerprint:
+            key = load_key(os.path.join(self.directory, name))
+            keys[key.kid] = key
+
+        signing = None
+        if self.signing_kid:
+            signing = keys.get(self.signing_kid)
+            if signing is None or not signing.can_sign:
+                raise ValueError(f"Signing key {self.signing_kid} not found or has no private key")
+        else:
+            private = sorted(kid for kid, key in keys.items() if key.can_sign)
+            signing = keys[private[-1]] if private else None
+
+        body = json.dumps(
+            {"keys": [keys[kid].jwk() for kid in sorted(keys)]},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self._keys, self._signing, self._jwks = keys, signing, (body, etag)
+        self._fingerprint = fingerprint
+
+    def configure(self, directory: str, signing_kid: str = "") -> None:
+        """Point the ring at another directory or signing key.
+
+        Args:
+            directory: Directory holding ``<kid>.pem`` files
+            signing_kid: Kid to sign with; empty selects the default
+        """
+        with self._lock:
+            if (directory, signing_kid) == (self.directory, self.signing_kid):
+                return
+            self.directory, self.signing_kid = directory, signing_kid
+            self._fingerprint = None
+            self._checked_at = float("-inf")
+
+    def refresh(self, max_age: Optional[float] = None) -> None:
+        """Reload the ring if the key files changed.
+
+        Args:
+            max_age: Seconds a previous directory check stays valid;
+                defaults to ``reload_seconds``, 0 forces a check
+        """
+        max_age = self.reload_seconds if max_age is None else max_age
+        if time.monotonic() - self._checked_at < max_age:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at < max_age:
+                return
+            self._checked_at = now
+            fingerprint = self._scan()
+            if fingerprint == self._fingerprint:
+                return
+            if self._fingerprint is None:
+                # First load: misconfiguration should fail loudly
+                self._load(fingerprint)
+                return
+            try:
+                self._load(fingerprint)
+            except (OSError, ValueError):
+                # e.g. a key file caught mid-write; keep serving the current
+                # ring and retry on the next check
+                logger.exception("Reloading signing keys from %s failed", self.directory)
+
+    def signing_key(self) -> SigningKey:
+        """Return the active signing key.
+
+        Raises:
+            ValueError: If the ring holds no private key
+        """
+        self.refresh()
+        if self._signing is None:
+            raise ValueError(f"No private signing key in {self.directory}")
+        return self._signing
+
+    def get(self, kid: str) -> Optional[SigningKey]:
+        """Return the key for ``kid``, or None if the ring has no such key.
+
+        An unknown kid (e.g. a key another instance just started signing
+        with) triggers an early directory check, at most once a second so
+        forged kids cannot turn every request into a directory scan.
+        """
+        self.refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            self.refresh(max_age=min(self.reload_seconds, _UNKNOWN_KID_RECHECK_SECONDS))
+            key = self._keys.get(kid)
+        return key
+
+    def jwks(self) -> Tuple[bytes, str]:
+        """Return the JWKS document body and its ETag."""
+        self.refresh()
+        return self._jwks
+
+
+def generate_key(directory: str, alg: str, kid: Optional[str] = None) -> str:
+    """Write a new private key PEM to ``directory``.
+
+    Args:
+        directory: Key directory
+        alg: "EdDSA" or "ES256"
+        kid: Key id; defaults to a UTC timestamp so newer keys sort last
+
+    Returns:
+        Path of the written file
+
+    Raises:
+        ValueError: If the algorithm is unsupported or the file exists
+    """
+    if alg not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported algorithm: {alg}")
+    kid = kid or time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + f"-{alg.lower()}"
+    private_key = ed25519.Ed25519PrivateKey.generate() if alg == "EdDSA" else ec.generate_private_key(ec.SECP256R1())
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{kid}.pem")
+    # Exclusive create with owner-only permissions
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    return path
+
+
+def retire_key(path: str) -> None:
+    """Replace a private key PEM with its public half (verify-only).
+
+    Args:
+        path: Path to a private key PEM file
+    """
+    key = load_key(path)
+    pem = key.public_key.public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pem)
+    os.replace(tmp_path, path)
+
+
+key_ring = KeyRing(
+    directory=settings.jwt_keys_dir,
+    signing_kid=settings.jwt_signing_kid,
+    reload_seconds=settings.jwt_keys_reload_seconds,
+)
+
+
+def main() -> None:
+    """Command line entry point for key generation and retirement."""
+    parser = argparse.ArgumentParser(description="Manage asymmetric JWT signing keys.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    generate = commands.add_parser("generate", help="write a new private key")
+    generate.add_argument("--alg", choices=SUPPORTED_ALGORITHMS, default="EdDSA")
+    generate.add_argument("--kid", default=None)
+    generate.add_argument("--dir", default=settings.jwt_keys_dir)
+    retire = commands.add_parser("retire", help="keep only the public half of a key")
+    retire.add_argument("kid")
+    retire.add_argument("--dir", default=settings.jwt_keys_dir)
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        print(generate_key(args.dir, args.alg, args.kid))
+    else:
+        retire_key(os.path.join(args.dir, f"{args.kid}.pem"))
+        print(f"retired {args.kid}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Lightweight authenticated principal built from verified token claims, and
+the in-process cache of principals loaded from the users table.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.settings import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable identity of an authenticated caller.
+
+    Carries just enough to make authorization decisions without loading the
+    full ``User`` row from the database.
+    """
+
+    id: int
+    role: str
+    token_version: int = 0
+    email: Optional[str] = None
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """Build a principal from a decoded access token payload.
+
+        Args:
+            payload: Verified JWT claims
+
+        Returns:
+            Principal for the token subject
+
+        Raises:
+            ValueError: If required claims are missing or malformed
+        """
+        sub = payload.get("sub")
+        role = payload.get("role")
+        if not sub or not role:
+            raise ValueError("Missing subject or role claim")
+        return cls(
+            id=int(sub),
+            role=role,
+            token_version=int(payload.get("ver", 0)),
+        )
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """Build a principal from a ``User`` row.
+
+        Args:
+            user: ORM user object
+
+        Returns:
+            Principal mirroring the stored identity
+        """
+        return cls(
+            id=user.id,
+            role=user.role,
+            token_version=user.token_version,
+            email=user.email,
+        )
+
+
+# Principals loaded from the database, keyed by user id
+principal_cache: TTLCache[Principal] = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
@@ -0,0 +1,155 @@
+"""
+Statements and token-issuing helpers shared by the auth services.
+
+``AuthService`` (``Session``) and ``AsyncAuthService`` (``AsyncSession``)
+run the same SQL and issue tokens the same way; only how they execute and
+commit differs. The statement builders return unexecuted SQLAlchemy
+statements, and ``add_tokens`` only stages a row, so both stacks can use
+them inside their own unit of work.
+"""
+from datetime import datetime, timedelta
+from typing import Optional, Union
+
+from sqlalchemy import Update, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.auth.tokens import create_access_token, create_refresh_token, decode_token
+from app.core.settings import settings
+from app.models import RefreshToken, User
+
+
+def replace_hash_stmt(user_id: int, old_hash: str, new_hash: str) -> Update:
+    """Build the statement that swaps a password hash if it is unchanged.
+
+    Matching on the old hash keeps a password change that raced with the
+    upgrade from being overwritten.
+
+    Args:
+        user_id: ID of the user
+        old_hash: Hash the password was verified against
+        new_hash: Replacement hash
+    """
+    return (
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+        .execution_options(synchronize_session="evaluate")
+    )
+
+
+def consume_refresh_token_stmt(jti: str) -> Update:
+    """Build the statement that atomically revokes a live refresh token.
+
+    A single conditional ``UPDATE ... WHERE revoked = false ... RETURNING``
+    on the unique ``jti`` index both checks and revokes the row, so two
+    concurrent requests presenting the same token cannot both succeed.
+    It returns the owning user id, or no row if the token is unknown,
+    revoked or expired.
+
+    Args:
+        jti: ID of the refresh token
+    """
+    return (
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.revoked.is_(False),
+            RefreshToken.expires_at > datetime.utcnow(),
+        )
+        .values(revoked=True)
+        .returning(RefreshToken.user_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def revoke_refresh_token_stmt(jti: str) -> Update:
+    """Build the statement that revokes a refresh token if still live.
+
+    Args:
+        jti: ID of the refresh token
+    """
+    return (
+        update(RefreshToken)
+        .where(RefreshToken.jti == jti, RefreshToken.revoked.is_(False))
+        .values(revoked=True)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_token_version_stmt(user_id: int, token_version: Optional[int] = None) -> Update:
+    """Build the statement that bumps a user's token version.
+
+    Args:
+        user_id: ID of the user
+        token_version: If given, the update only applies while the stored
+            version still matches, which checks the caller's token and
+            revokes in one statement
+    """
+    stmt = update(User).where(User.id == user_id)
+    if token_version is not None:
+        stmt = stmt.where(User.token_version == token_version)
+    # "evaluate" applies the bump to a user already loaded in the session
+    # without a query, since commits in a unit of work do not expire it
+    return stmt.values(token_version=User.token_version + 1).execution_options(
+        synchronize_session="evaluate"
+    )
+
+
+def refresh_token_claims(refresh_token: str) -> dict:
+    """Verify a refresh token and return its claims.
+
+    Args:
+        refresh_token: Refresh token presented by the client
+
+    Returns:
+        Verified claims, including ``jti``
+
+    Raises:
+        ValueError: If the token is invalid, expired or not a refresh token
+    """
+    payload = decode_token(refresh_token)
+    if not payload or not payload.get("jti"):
+        raise ValueError("Invalid refresh token")
+    return payload
+
+
+def issue_tokens(user: User) -> tuple[dict, RefreshToken]:
+    """Create a token pair and the refresh token row to persist.
+
+    Args:
+        user: User object
+
+    Returns:
+        Tuple of (token response dict, unsaved RefreshToken record)
+    """
+    access_token = create_access_token(user.id, user.role, user.token_version)
+    jti, refresh_token = create_refresh_token(user.token_version)
+
+    token_record = RefreshToken(
+        jti=jti,
+        user_id=user.id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expires_days),
+    )
+    tokens = {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.access_token_expires_min * 60,  # Convert to seconds
+    }
+    return tokens, token_record
+
+
+def add_tokens(user: User, db: Union[Session, AsyncSession]) -> dict:
+    """Issue a token pair and stage its refresh token row (no commit).
+
+    Args:
+        user: User object
+        db: Sync or async database session inside a unit of work
+
+    Returns:
+        Dictionary with access_token, refresh_token, and expires_in
+    """
+    tokens, token_record = issue_tokens(user)
+    db.add(token_record)
+    return tokens
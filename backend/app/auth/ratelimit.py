@@ -0,0 +1,319 @@
+"""
+Token-bucket rate limiting for the credential endpoints.
+
+Each limited route checks two buckets per request: one keyed by client IP
+(taken from X-Forwarded-For behind ``settings.trusted_proxies``, see
+``app.core.proxies``) and one keyed by the submitted email, so neither a single address spraying
+many accounts nor many addresses hammering one account can burn the
+password-hashing budget. Buckets hold up to ``burst`` tokens and refill at
+``per_minute`` tokens per minute; a request spends one token or is
+rejected with 429 and the seconds until a token is available.
+
+Two stores are available:
+
+* ``MemoryBucketStore`` (default): per process, a handful of lock-sharded
+  dicts of ``(tokens, updated, full_at)`` tuples. A bucket that has refilled
+  completely is indistinguishable from a missing one, so shards drop such
+  idle buckets during periodic sweeps.
+* ``SQLiteBucketStore``: one table in a local SQLite file (WAL mode), so
+  every uvicorn worker on the host shares the same limits.
+"""
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.metrics import RATE_LIMITED_TOTAL
+from app.core.proxies import client_ip
+from app.core.settings import settings
+
+# Bucket operations per shard between idle-bucket sweeps
+SWEEP_INTERVAL_OPS = 1024
+
+
+def _spend(
+    tokens: Optional[float],
+    updated: float,
+    now: float,
+    capacity: float,
+    rate: float,
+) -> Tuple[float, float, float]:
+    """Refill a bucket, try to spend one token and report the outcome.
+
+    Args:
+        tokens: Tokens left at ``updated``, or None for a new bucket
+        updated: Time of the last update
+        now: Current time
+        capacity: Bucket size (burst)
+        rate: Tokens added per second
+
+    Returns:
+        Tuple of (tokens left, time the bucket is full again, seconds to wait
+        before retrying; 0 if the token was spent)
+    """
+    if tokens is None:
+        tokens = capacity
+    else:
+        tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        tokens -= 1
+        wait = 0.0
+    else:
+        wait = (1 - tokens) / rate
+    return tokens, now + (capacity - tokens) / rate, wait
+
+
+class _Shard:
+    """One lock and the buckets hashed to it."""
+
+    __slots__ = ("lock", "buckets", "ops")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.buckets: Dict[str, Tuple[float, float, float]] = {}
+        self.ops = 0
+
+
+class MemoryBucketStore:
+    """In-process bucket store with lock striping and idle expiry."""
+
+    # Decisions are a dict lookup and a few float operations
+    blocking = False
+
+    def __init__(self, shards: int = 16) -> None:
+        """Initialize the store.
+
+        Args:
+            shards: Number of independently locked shards (rounded up to a
+                power of two)
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        count = 1 << (shards - 1).bit_length()
+        self._shards: List[_Shard] = [_Shard() for _ in range(count)]
+        self._mask = count - 1
+        self.expired = 0
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        """Spend one token from a bucket.
+
+        Args:
+            key: Bucket key
+            capacity: Bucket size (burst)
+            rate: Tokens added per second
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        shard = self._shards[hash(key) & self._mask]
+        with shard.lock:
+            entry = shard.buckets.get(key)
+            if entry is None:
+                tokens, full_at, wait = _spend(None, now, now, capacity, rate)
+            else:
+                tokens, full_at, wait = _spend(entry[0], entry[1], now, capacity, rate)
+            shard.buckets[key] = (tokens, now, full_at)
+            shard.ops += 1
+            if shard.ops >= SWEEP_INTERVAL_OPS:
+                shard.ops = 0
+                self._sweep(shard, now)
+        return wait
+
+    def _sweep(self, shard: _Shard, now: float) -> None:
+        """Drop buckets that have refilled completely (shard lock held)."""
+        idle = [key for key, entry in shard.buckets.items() if entry[2] <= now]
+        for key in idle:
+            del shard.buckets[key]
+        self.expired += len(idle)
+
+    def clear(self) -> None:
+        """Drop every bucket."""
+        for shard in self._shards:
+            with shard.lock:
+                shard.buckets.clear()
+
+    def stats(self) -> dict:
+        """Return a snapshot of store counters."""
+        return {
+            "backend": "memory",
+            "shards": len(self._shards),
+            "buckets": sum(len(shard.buckets) for shard in self._shards),
+            "expired": self.expired,
+        }
+
+
+class SQLiteBucketStore:
+    """Bucket store in a local SQLite file shared by all worker processes.
+
+    Each decision is one short ``BEGIN IMMEDIATE`` transaction on a
+    per-thread connection; wall-clock time is used because it is shared
+    between processes.
+    """
+
+    # Decisions touch the file and may wait on another worker's lock
+    blocking = True
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000) -> None:
+        """Initialize the store; the file and table are created on first use.
+
+        Args:
+            path: SQLite database file
+            busy_timeout_ms: How long to wait for another writer
+        """
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._ops = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                "updated REAL NOT NULL, full_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, rate: float) -> float:
+        """Spend one token from a bucket.
+
+        Args:
+            key: Bucket key
+            capacity: Bucket size (burst)
+            rate: Tokens added per second
+
+        Returns:
+            0 if allowed, otherwise seconds until a token is available
+        """
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                tokens, full_at, wait = _spend(None, now, now, capacity, rate)
+            else:
+                tokens, full_at, wait = _spend(row[0], row[1], now, capacity, rate)
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, "
+                "updated = excluded.updated, full_at = excluded.full_at",
+                (key, tokens, now, full_at),
+            )
+            self._ops += 1
+            if self._ops >= SWEEP_INTERVAL_OPS:
+                self._ops = 0
+                conn.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def clear(self) -> None:
+        """Drop every bucket."""
+        self._connection().execute("DELETE FROM rate_limit_buckets")
+
+    def stats(self) -> dict:
+        """Return a snapshot of store counters."""
+        (count,) = self._connection().execute("SELECT count(*) FROM rate_limit_buckets").fetchone()
+        return {"backend": "sqlite", "path": self.path, "buckets": count}
+
+
+def build_store():
+    """Create the bucket store selected by ``settings.rate_limit_backend``.
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if settings.rate_limit_backend == "memory":
+        return MemoryBucketStore(shards=settings.rate_limit_shards)
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteBucketStore(settings.rate_limit_sqlite_path)
+    raise ValueError(f"Unsupported rate limit backend: {settings.rate_limit_backend}")
+
+
+rate_limit_store = build_store()
+
+
+class RateLimit:
+    """Dependency enforcing the per-IP and per-email buckets of one route."""
+
+    def __init__(self, scope: str) -> None:
+        """Initialize the dependency.
+
+        Args:
+            scope: Bucket namespace, e.g. "login" or "register"
+        """
+        self.scope = scope
+        self._ip_metric = RATE_LIMITED_TOTAL.labels(scope=scope, key="ip")
+        self._email_metric = RATE_LIMITED_TOTAL.labels(scope=scope, key="email")
+
+    @staticmethod
+    async def _take(key: str, burst: int, per_minute: float) -> float:
+        """Spend a token, off the event loop if the store may block."""
+        store = rate_limit_store
+        if store.blocking:
+            return await run_in_threadpool(store.take, key, burst, per_minute / 60)
+        return store.take(key, burst, per_minute / 60)
+
+    def _reject(self, wait: float, metric) -> HTTPException:
+        """Count a rejection and build its 429 response."""
+        metric.inc()
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+    async def __call__(self, request: Request) -> None:
+        """Spend a token from the caller's IP and email buckets.
+
+        The email is read from the JSON body, which FastAPI has already
+        parsed and cached for the endpoint.
+
+        Raises:
+            HTTPException: 429 with Retry-After when a bucket is empty
+        """
+        if not settings.rate_limit_enabled:
+            return
+
+        client = client_ip(request) or "unknown"
+        wait = await self._take(
+            f"{self.scope}:ip:{client}",
+            settings.rate_limit_ip_burst,
+            settings.rate_limit_ip_per_minute,
+        )
+        if wait:
+            raise self._reject(wait, self._ip_metric)
+
+        try:
+            body = await request.json()
+        except ValueError:
+            return
+        email = body.get("email") if isinstance(body, dict) else None
+        if isinstance(email, str) and email:
+            wait = await self._take(
+                f"{self.scope}:email:{email.lower()}",
+                settings.rate_limit_email_burst,
+                settings.rate_limit_email_per_minute,
+            )
+            if wait:
+                raise self._reject(wait, self._email_metric)
@@ -1,35 +1,346 @@
 """
-Password hashing utilities using bcrypt.
+Password hashing utilities using bcrypt, or argon2 when configured.
+
+Password hashing is deliberately slow, so the async variants run the work
+on a dedicated, bounded worker pool instead of the event loop or Starlette's
+shared request threadpool. Admission to the pool is gated by
+``hashing_limiter`` so overload is shed rather than queued forever.
+
+The scheme and cost come from settings (``PASSWORD_HASH_SCHEME``,
+``BCRYPT_ROUNDS``, ``ARGON2_*``). Verification accepts any supported hash,
+and ``needs_rehash`` tells whether a stored hash is behind the current
+settings so it can be upgraded after the next successful login.
 """
+import asyncio
+import functools
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
 import bcrypt
 
+try:
+    import argon2
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # optional: pip install argon2-cffi
+    argon2 = None
+
+from app.auth.admission import hashing_limiter, rehash_limiter
+from app.core.metrics import HASH_PASSWORD_SECONDS, VERIFY_PASSWORD_SECONDS
+from app.core.profiling import bind_thread, profiled, section
+from app.core.settings import settings
+
+# Bcrypt maximum password length in bytes
+BCRYPT_MAX_BYTES = 72
+
+
+HASH_SCHEMES = ("bcrypt", "argon2")
+
+ARGON2_PREFIX = b"$argon2"
+
+
+def hash_config() -> Tuple[str, tuple]:
+    """Return the configured (scheme, cost parameters) for new hashes.
+
+    Raises:
+        ValueError: If the scheme is unknown or argon2 is not installed
+    """
+    scheme = settings.password_hash_scheme
+    if scheme == "bcrypt":
+        return scheme, (settings.bcrypt_rounds,)
+    if scheme == "argon2":
+        if argon2 is None:
+            raise ValueError("PASSWORD_HASH_SCHEME=argon2 requires the argon2-cffi package")
+        return scheme, (
+            settings.argon2_time_cost,
+            settings.argon2_memory_cost_kib,
+            settings.argon2_parallelism,
+        )
+    raise ValueError(f"Unsupported password hash scheme: {scheme}")
+
+
+@functools.lru_cache(maxsize=8)
+def _argon2_hasher(time_cost: int, memory_cost: int, parallelism: int):
+    """Return an argon2id hasher for the given parameters (cached per process)."""
+    return argon2.PasswordHasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+
+
+def _hashpw(password_bytes: bytes, rounds: int = 12) -> bytes:
+    """Hash password bytes with bcrypt and a fresh salt (module-level so it can be pickled)."""
+    return bcrypt.hashpw(password_bytes[:BCRYPT_MAX_BYTES], bcrypt.gensalt(rounds=rounds))
+
+
+def _hash(password_bytes: bytes, scheme: str, cost: tuple) -> bytes:
+    """Hash password bytes with the given scheme and cost parameters.
+
+    Module-level, with explicit parameters, so process workers hash with the
+    parent's settings.
+    """
+    if scheme == "argon2":
+        return _argon2_hasher(*cost).hash(password_bytes).encode("ascii")
+    return _hashpw(password_bytes, *cost)
+
+
+def hash_password_with(password: str, scheme: str, cost: tuple) -> str:
+    """Hash a password with an explicit scheme and cost.
+
+    For callers that resolve the configuration once and hash on their own
+    workers, such as the bulk importer and calibration; picklable, so it
+    runs in process pools. ``hash_password`` uses the configured settings.
+
+    Args:
+        password: Plain text password to hash
+        scheme: "bcrypt" or "argon2"
+        cost: Cost parameters as returned by ``hash_config``
+
+    Returns:
+        Hashed password string
+    """
+    return _hash(password.encode("utf-8"), scheme, cost).decode("utf-8")
+
+
+def _checkpw(plain_bytes: bytes, hashed_bytes: bytes) -> bool:
+    """Check password bytes against a bcrypt or argon2 hash (module-level so it can be pickled)."""
+    if hashed_bytes.startswith(ARGON2_PREFIX):
+        if argon2 is None:
+            raise ValueError("Verifying argon2 hashes requires the argon2-cffi package")
+        try:
+            # Parameters are read from the hash itself
+            return argon2.PasswordHasher().verify(hashed_bytes, plain_bytes)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(plain_bytes[:BCRYPT_MAX_BYTES], hashed_bytes)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Tell whether a stored hash uses another scheme or cost than configured.
+
+    Args:
+        hashed_password: Stored password hash
+
+    Returns:
+        True if the hash should be replaced on the next successful login
+    """
+    scheme, cost = hash_config()
+    is_argon2 = hashed_password.startswith(ARGON2_PREFIX.decode("ascii"))
+    if scheme == "argon2":
+        return not is_argon2 or _argon2_hasher(*cost).check_needs_rehash(hashed_password)
+    if is_argon2:
+        return True
+    # bcrypt hashes look like $2b$12$<salt and digest>
+    parts = hashed_password.split("$")
+    return len(parts) < 4 or not parts[2].isdigit() or int(parts[2]) != cost[0]
+
+
+class HashingPool:
+    """Bounded executor dedicated to password hashing work.
+
+    The underlying executor is created lazily on first use so importing this
+    module never spawns threads or processes.
+    """
+
+    def __init__(self, max_workers: int, kind: str = "thread") -> None:
+        """Initialize the pool.
+
+        Args:
+            max_workers: Maximum number of concurrent hashing workers
+            kind: Executor type, either "thread" or "process"
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported hashing executor: {kind}")
+
+        self.max_workers = max_workers
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def _get_executor(self) -> Executor:
+        """Return the executor, creating it on first use."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="pwhash",
+                        )
+        return self._executor
+
+    def _on_done(self, _future: Future) -> None:
+        """Decrement the in-flight counter when a job finishes."""
+        with self._lock:
+            self._in_flight -= 1
 
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a function on the pool and await its result.
+
+        Args:
+            fn: Function to execute
+            args: Positional arguments for the function
+
+        Returns:
+            The function's return value
+        """
+        executor = self._get_executor()
+        if self.kind == "thread":
+            # Closures cannot be pickled for process workers
+            fn = bind_thread(fn)
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def warm(self) -> None:
+        """Start the executor and its workers ahead of the first hash (blocking)."""
+        executor = self._get_executor()
+        # One trivial job per worker; builtins pickle for process workers
+        futures = [executor.submit(len, b"") for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs submitted and not yet finished."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of jobs waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool statistics."""
+        in_flight = self._in_flight
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "in_flight": in_flight,
+            "queue_depth": max(0, in_flight - self.max_workers),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying executor if it was started."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+hashing_pool = HashingPool(
+    max_workers=settings.password_hash_workers,
+    kind=settings.password_hash_executor,
+)
+
+
+@HASH_PASSWORD_SECONDS.time()
+@profiled("security")
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt.
-    
+
     Args:
         password: Plain text password to hash
-        
+
     Returns:
         Hashed password string
     """
-    # Ensure password is bytes, truncate if necessary for bcrypt (max 72 bytes)
-    password_bytes = password.encode('utf-8')[:72]
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=12))
+    # bcrypt only looks at the first 72 bytes; _hashpw truncates
+    hashed = _hash(password.encode('utf-8'), *hash_config())
     return hashed.decode('utf-8')
 
 
+@VERIFY_PASSWORD_SECONDS.time()
+@profiled("security")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password.
-    
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    plain_bytes = plain_password.encode('utf-8')
+    hashed_bytes = hashed_password.encode('utf-8')
+    return _checkpw(plain_bytes, hashed_bytes)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop.
+
+    Args:
+        password: Plain text password to hash
+
+    Returns:
+        Hashed password string
+
+    Raises:
+        OverloadedError: If admission control sheds the request
+    """
+    password_bytes = password.encode('utf-8')
+    scheme, cost = hash_config()
+    async with hashing_limiter.slot():
+        with HASH_PASSWORD_SECONDS.time(), section("security"):
+            hashed = await hashing_pool.run(_hash, password_bytes, scheme, cost)
+    return hashed.decode('utf-8')
+
+
+async def rehash_password_async(password: str) -> Optional[str]:
+    """Hash a password as low-priority background work.
+
+    Used for hash upgrades, which can always wait for a later login: the
+    work only starts if no login is waiting for a hashing slot and the
+    separate rehash budget has a free slot, and never queues.
+
+    Args:
+        password: Plain text password to hash
+
+    Returns:
+        Hashed password string, or None if the work was skipped
+    """
+    if hashing_limiter.busy or not rehash_limiter.try_acquire():
+        return None
+    try:
+        password_bytes = password.encode('utf-8')
+        scheme, cost = hash_config()
+        with HASH_PASSWORD_SECONDS.time(), section("security"):
+            hashed = await hashing_pool.run(_hash, password_bytes, scheme, cost)
+    finally:
+        rehash_limiter.release()
+    return hashed.decode('utf-8')
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop.
+
     Args:
         plain_password: Plain text password to verify
         hashed_password: Hashed password to compare against
-        
+
     Returns:
         True if password matches, False otherwise
+
+    Raises:
+        OverloadedError: If admission control sheds the request
     """
-    # Ensure passwords are bytes, truncate plain password if necessary
-    plain_bytes = plain_password.encode('utf-8')[:72]
+    plain_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(plain_bytes, hashed_bytes)
+    async with hashing_limiter.slot():
+        with VERIFY_PASSWORD_SECONDS.time(), section("security"):
+            return await hashing_pool.run(_checkpw, plain_bytes, hashed_bytes)
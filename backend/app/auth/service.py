@@ -1,21 +1,71 @@
 """
 Authentication service functions for business logic.
+
+The async methods run their blocking ``Session`` work on the threadpool so
+the event loop is never stalled waiting for a pooled connection.
 """
-from datetime import datetime, timedelta
+import logging
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, Optional, Set
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.models import User, RefreshToken
-from app.auth.security import hash_password, verify_password
-from app.auth.tokens import create_access_token, create_refresh_token
+from app.auth import audit
+from app.auth.audit import audit_log
+from app.auth.security import (
+    hash_password_async,
+    needs_rehash,
+    rehash_password_async,
+    verify_password_async,
+)
+from app.auth.queries import (
+    add_tokens,
+    bump_token_version_stmt,
+    consume_refresh_token_stmt,
+    refresh_token_claims,
+    replace_hash_stmt,
+    revoke_refresh_token_stmt,
+)
+from app.auth.tokens import decode_token, validate_token_expiry
+from app.auth.principal import Principal, principal_cache
+from app.core.metrics import REFRESH_TOKENS_ISSUED
 from app.core.settings import settings
+from app.db import session_scope, transaction
+
+logger = logging.getLogger(__name__)
+
+# Users with a password hash upgrade in flight (touched only on the event loop)
+_upgrades_in_flight: Set[int] = set()
+
+
+@contextmanager
+def claim_hash_upgrade(user_id: int) -> Iterator[bool]:
+    """Claim the password hash upgrade of a user for the duration of the block.
+
+    Args:
+        user_id: ID of the user whose hash is upgraded
+
+    Yields:
+        False if another upgrade for this user is already in flight
+    """
+    if user_id in _upgrades_in_flight:
+        yield False
+        return
+    _upgrades_in_flight.add(user_id)
+    try:
+        yield True
+    finally:
+        _upgrades_in_flight.discard(user_id)
 
 
 class AuthService:
     """Service class for authentication operations."""
 
     @staticmethod
-    def register_user(email: str, password: str, db: Session) -> User:
+    async def register_user(email: str, password: str, db: Session) -> User:
         """Register a new user.
         
         Args:
@@ -29,20 +79,53 @@ class AuthService:
         Raises:
             ValueError: If email already exists
         """
-        hashed_pwd = hash_password(password)
+        hashed_pwd = await hash_password_async(password)
         user = User(email=email.lower(), hashed_password=hashed_pwd)
-        
+        return await run_in_threadpool(AuthService._insert_user, user, db)
+
+    @staticmethod
+    def _insert_user(user: User, db: Session) -> User:
+        """Persist a new user.
+
+        Raises:
+            ValueError: If email already exists
+        """
         try:
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            return user
+            # The INSERT returns the id and server defaults; no refresh needed
+            with transaction(db):
+                db.add(user)
         except IntegrityError:
-            db.rollback()
-            raise ValueError(f"Email {email} is already registered")
+            raise ValueError(f"Email {user.email} is already registered")
+
+        # Drop any stale entry left behind by a reused id
+        principal_cache.invalidate(user.id)
+        return user
+
+    @staticmethod
+    def change_role(user_id: int, role: str, db: Session) -> User:
+        """Change a user's role and invalidate their cached principal.
+
+        Args:
+            user_id: ID of the user to update
+            role: New role (e.g., 'user' or 'admin')
+            db: Database session
+
+        Returns:
+            Updated User object
+
+        Raises:
+            ValueError: If the user does not exist
+        """
+        with transaction(db):
+            user = db.query(User).filter(User.id == user_id).first()
+            if not user:
+                raise ValueError(f"User {user_id} not found")
+            user.role = role
+        principal_cache.invalidate(user_id)
+        return user
 
     @staticmethod
-    def authenticate_user(email: str, password: str, db: Session) -> User:
+    async def authenticate_user(email: str, password: str, db: Session) -> User:
         """Authenticate a user with email and password.
         
         Args:
@@ -56,13 +139,70 @@ class AuthService:
         Raises:
             ValueError: If credentials are invalid
         """
-        user = db.query(User).filter(User.email == email.lower()).first()
+        user = await run_in_threadpool(
+            lambda: db.query(User).filter(User.email == email.lower()).first()
+        )
         
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(password, user.hashed_password):
             raise ValueError("Invalid credentials")
         
         return user
 
+    @staticmethod
+    async def new_hash_if_stale(password: str, hashed_password: str) -> Optional[str]:
+        """Re-hash a just-verified password if its stored hash is stale.
+
+        Args:
+            password: Plain text password that matched ``hashed_password``
+            hashed_password: Stored hash
+
+        Returns:
+            Hash with the configured scheme and cost, or None if the stored
+            hash is current or hashing is busy with logins (the upgrade is
+            then retried on a later login)
+        """
+        if not settings.password_rehash_on_login or not needs_rehash(hashed_password):
+            return None
+        return await rehash_password_async(password)
+
+    @staticmethod
+    async def upgrade_password_hash(
+        user_id: int,
+        password: str,
+        hashed_password: str,
+        open_session: Callable[[], ContextManager[Session]] = session_scope,
+    ) -> None:
+        """Upgrade a stale password hash after a successful login.
+
+        Meant to run as a background task once the login response is sent,
+        so the extra hash never adds to login latency. Concurrent logins of
+        the same user run at most one upgrade. Failures are logged and
+        otherwise ignored.
+
+        Args:
+            user_id: ID of the user who just logged in
+            password: Plain text password that was just verified
+            hashed_password: Hash the password was verified against
+            open_session: Opens the session the new hash is written with;
+                the task runs after the response, when the request's own
+                session may already be closed
+        """
+        with claim_hash_upgrade(user_id) as claimed:
+            if not claimed:
+                return
+            try:
+                new_hash = await AuthService.new_hash_if_stale(password, hashed_password)
+                if new_hash is None:
+                    return
+
+                def store() -> None:
+                    with open_session() as db, transaction(db):
+                        db.execute(replace_hash_stmt(user_id, hashed_password, new_hash))
+
+                await run_in_threadpool(store)
+            except Exception:
+                logger.exception("Password hash upgrade failed for user %s", user_id)
+
     @staticmethod
     def create_tokens(user: User, db: Session) -> dict:
         """Create access and refresh tokens for a user.
@@ -74,28 +214,154 @@ class AuthService:
         Returns:
             Dictionary with access_token, refresh_token, and expires_in
         """
-        # Create access token
-        access_token = create_access_token(user.id, user.role)
-        
-        # Create refresh token
-        jti, refresh_token = create_refresh_token()
-        
-        # Store refresh token in database
-        expires_at = datetime.utcnow() + timedelta(
-            days=settings.refresh_token_expires_days
-        )
-        token_record = RefreshToken(
-            jti=jti,
-            user_id=user.id,
-            expires_at=expires_at,
-        )
-        db.add(token_record)
-        db.commit()
-        
-        # Return token information
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-            "expires_in": settings.access_token_expires_min * 60,  # Convert to seconds
-        }
+        with transaction(db):
+            tokens = add_tokens(user, db)
+        AuthService._tokens_issued(user.id)
+        return tokens
+
+    @staticmethod
+    def _tokens_issued(user_id: int) -> None:
+        """Count and audit a committed token pair."""
+        REFRESH_TOKENS_ISSUED.inc()
+        audit_log.record(audit.TOKEN_ISSUED, user_id=user_id)
+
+    @staticmethod
+    def rotate_refresh_token(refresh_token: str, db: Session) -> dict:
+        """Exchange a refresh token for a new token pair, revoking the old one.
+
+        Args:
+            refresh_token: Refresh token presented by the client
+            db: Database session
+
+        Returns:
+            Dictionary with access_token, refresh_token, and expires_in
+
+        Raises:
+            ValueError: If the refresh token is invalid, expired or already used
+        """
+        claims = refresh_token_claims(refresh_token)
+        # Revocation of the old token commits together with the new one
+        with transaction(db):
+            user_id = db.execute(
+                consume_refresh_token_stmt(claims["jti"])
+            ).scalar_one_or_none()
+            user = db.get(User, user_id) if user_id is not None else None
+            if not user or claims.get("ver", 0) != user.token_version:
+                raise ValueError("Invalid refresh token")
+            tokens = add_tokens(user, db)
+        AuthService._tokens_issued(user.id)
+        return tokens
+
+    @staticmethod
+    def revoke_refresh_token(refresh_token: str, db: Session) -> None:
+        """Revoke a refresh token (logout).
+
+        Revoking an already revoked token is a no-op.
+
+        Args:
+            refresh_token: Refresh token presented by the client
+            db: Database session
+
+        Raises:
+            ValueError: If the refresh token is invalid or expired
+        """
+        jti = refresh_token_claims(refresh_token)["jti"]
+        with transaction(db):
+            db.execute(revoke_refresh_token_stmt(jti))
+
+    @staticmethod
+    def revoke_all_sessions(user_id: int, db: Session, token_version: Optional[int] = None) -> None:
+        """Invalidate every access and refresh token issued to a user.
+
+        Bumps the user's token version with a single-row update instead of
+        touching their refresh token rows.
+
+        Args:
+            user_id: ID of the user
+            db: Database session
+            token_version: Only revoke while the stored version equals this
+                (the version of the token making the request)
+
+        Raises:
+            ValueError: If the user does not exist or the version has moved on
+        """
+        with transaction(db):
+            rowcount = db.execute(bump_token_version_stmt(user_id, token_version)).rowcount
+            if not rowcount:
+                raise ValueError(f"User {user_id} not found or sessions already revoked")
+        principal_cache.invalidate(user_id)
+
+    @staticmethod
+    def introspect_tokens(tokens: list[str], db: Session) -> list[dict]:
+        """Report validity, claims and revocation status for a batch of tokens.
+
+        Every token is verified with ``decode_token`` and
+        ``validate_token_expiry``. Revocation is then resolved with at most
+        two queries for the whole batch: one ``IN`` lookup of all refresh
+        token ``jti``s (joined to their owner's token version) and one
+        ``IN`` lookup of the token versions of all access token subjects.
+
+        Args:
+            tokens: Access and/or refresh tokens, in any mix
+            db: Database session
+
+        Returns:
+            One dict per input token, in input order, with ``active``,
+            ``token_type`` ("access", "refresh" or None if invalid),
+            ``revoked`` and ``claims`` (None if invalid)
+        """
+        # Verify each distinct token once: (token type, claims, principal)
+        verified: dict[str, Optional[tuple]] = {}
+        for token in tokens:
+            if token in verified:
+                continue
+            payload = decode_token(token)
+            if not payload or not validate_token_expiry(payload):
+                verified[token] = None
+            elif payload.get("jti"):
+                verified[token] = ("refresh", payload, None)
+            else:
+                try:
+                    verified[token] = ("access", payload, Principal.from_claims(payload))
+                except (TypeError, ValueError):
+                    verified[token] = None
+
+        jtis = {entry[1]["jti"] for entry in verified.values() if entry and entry[0] == "refresh"}
+        user_ids = {entry[2].id for entry in verified.values() if entry and entry[0] == "access"}
+
+        refresh_rows = {}
+        if jtis:
+            refresh_rows = {
+                row.jti: row
+                for row in db.execute(
+                    select(RefreshToken.jti, RefreshToken.revoked, User.token_version)
+                    .join(User, User.id == RefreshToken.user_id)
+                    .where(RefreshToken.jti.in_(jtis))
+                )
+            }
+        versions = {}
+        if user_ids:
+            versions = dict(
+                db.execute(select(User.id, User.token_version).where(User.id.in_(user_ids))).all()
+            )
+
+        results = []
+        for token in tokens:
+            entry = verified[token]
+            if entry is None:
+                results.append({"active": False, "token_type": None, "revoked": False, "claims": None})
+                continue
+            token_type, claims, principal = entry
+            if token_type == "refresh":
+                row = refresh_rows.get(claims["jti"])
+                # Unknown jtis were purged or never issued by this backend
+                revoked = row is None or row.revoked or claims.get("ver", 0) != row.token_version
+            else:
+                revoked = versions.get(principal.id) != principal.token_version
+            results.append({
+                "active": not revoked,
+                "token_type": token_type,
+                "revoked": revoked,
+                "claims": dict(claims),
+            })
+        return results
@@ -1,61 +1,395 @@
 """
 JWT token creation and validation utilities.
+
+Signing and verification go through a pluggable ``TokenCodec``. The default
+``FastHS256Codec`` signs with a pre-keyed HMAC and a constant header
+segment; ``JoseCodec`` delegates to ``python-jose``. Both produce and accept
+the same compact HS256 tokens, so they can be swapped (``JWT_CODEC``)
+without invalidating outstanding tokens.
+
+``AsymmetricCodec`` signs with EdDSA or ES256 keys from the key ring
+(``app.auth.keys``) and stamps each token with the signing key's ``kid``;
+other services verify such tokens against ``/.well-known/jwks.json``.
 """
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Protocol
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
 import uuid
 
 from jose import JWTError, jwt
 
+from app.auth.keys import KeyRing, key_ring
+from app.core.cache import TTLCache
+from app.core.metrics import DECODE_TOKEN_SECONDS
+from app.core.profiling import profiled
 from app.core.settings import settings
 
+# Verified claims keyed by SHA-256 digest of the token string. Entries never
+# outlive the token's own ``exp`` claim.
+token_cache: TTLCache[dict] = TTLCache(
+    maxsize=settings.token_cache_size,
+    ttl=settings.token_cache_max_ttl_seconds,
+)
+
+
+class TokenError(Exception):
+    """Raised when a token is malformed, badly signed or no longer valid."""
+
+
+class TokenCodec(Protocol):
+    """Signs claims into compact JWTs and verifies them back."""
+
+    def encode(self, claims: dict) -> str:
+        """Sign claims into a token."""
+
+    def decode(self, token: str) -> dict:
+        """Verify a token and return its claims.
+
+        Raises:
+            TokenError: If the token is invalid or expired
+        """
+
+
+class JoseCodec:
+    """HS256 codec backed by ``python-jose``."""
+
+    def __init__(self, secret: str) -> None:
+        """Initialize the codec.
+
+        Args:
+            secret: HMAC signing secret
+        """
+        self.secret = secret
+
+    def encode(self, claims: dict) -> str:
+        """Sign claims into a token."""
+        return jwt.encode(claims, self.secret, algorithm="HS256")
+
+    def decode(self, token: str) -> dict:
+        """Verify a token and return its claims.
+
+        Raises:
+            TokenError: If the token is invalid or expired
+        """
+        try:
+            return jwt.decode(token, self.secret, algorithms=["HS256"])
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+
+def _b64encode(data: bytes) -> bytes:
+    """Base64url-encode without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(segment: str) -> bytes:
+    """Base64url-decode a segment that may lack padding.
+
+    Raises:
+        TokenError: If the segment is not valid base64url
+    """
+    try:
+        return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise TokenError("Invalid segment encoding") from e
+
+
+def _validate_times(claims: dict) -> None:
+    """Apply python-jose's registered time claim checks (no leeway).
+
+    Raises:
+        TokenError: If a time claim is not numeric, has expired or is not
+            yet valid
+    """
+    for name in ("exp", "nbf", "iat"):
+        if name in claims:
+            value = claims[name]
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TokenError(f"{name} claim must be a number")
+    now = time.time()
+    if "exp" in claims and claims["exp"] < now:
+        raise TokenError("Signature has expired")
+    if "nbf" in claims and claims["nbf"] > now:
+        raise TokenError("The token is not yet valid (nbf)")
+
+
+def _split(token: str) -> tuple:
+    """Split a compact JWT into (signing input bytes, header, payload, signature).
+
+    Raises:
+        TokenError: If the token does not have three ASCII segments
+    """
+    try:
+        signing_input, signature = token.rsplit(".", 1)
+        header_segment, payload_segment = signing_input.split(".")
+        return signing_input.encode("ascii"), header_segment, payload_segment, signature
+    except (ValueError, UnicodeEncodeError) as e:
+        raise TokenError("Malformed token") from e
+
+
+def _load_claims(payload_segment: str) -> dict:
+    """Decode and time-check the claims of a verified token.
+
+    Raises:
+        TokenError: If the payload is not a JSON object or fails time checks
+    """
+    try:
+        claims = json.loads(_b64decode(payload_segment))
+    except ValueError as e:
+        raise TokenError("Invalid payload") from e
+    if not isinstance(claims, dict):
+        raise TokenError("Invalid payload")
+    _validate_times(claims)
+    return claims
+
+
+class FastHS256Codec:
+    """HS256 codec that avoids per-call key setup and header serialization.
+
+    The HMAC is keyed once and copied for every signature, the header
+    segment is encoded once, and claims are dumped as compact JSON. Claims
+    are validated like ``python-jose`` does: ``exp``, ``nbf`` and ``iat``
+    must be numeric, ``exp`` must not have passed and ``nbf`` must have.
+    """
+
+    # Serialized exactly as python-jose does: compact, keys sorted
+    HEADER = {"alg": "HS256", "typ": "JWT"}
+
+    def __init__(self, secret: str) -> None:
+        """Initialize the codec.
+
+        Args:
+            secret: HMAC signing secret
+        """
+        self.secret = secret
+        self._mac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+        header = json.dumps(self.HEADER, separators=(",", ":"), sort_keys=True)
+        self._header_segment = _b64encode(header.encode("utf-8"))
+        self._header_str = self._header_segment.decode("ascii")
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        """Return the HMAC-SHA256 of ``signing_input``."""
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict) -> str:
+        """Sign claims into a token.
 
-def create_access_token(user_id: int, role: str) -> str:
+        Args:
+            claims: JSON-serializable claims, timestamps as integer epochs
+
+        Returns:
+            Compact JWT string
+        """
+        payload = json.dumps(claims, separators=(",", ":")).encode("utf-8")
+        signing_input = self._header_segment + b"." + _b64encode(payload)
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> dict:
+        """Verify a token and return its claims.
+
+        Raises:
+            TokenError: If the token is invalid or expired
+        """
+        signing_bytes, header_segment, payload_segment, signature = _split(token)
+
+        if header_segment != self._header_str:
+            # Equivalent headers serialized differently by other issuers
+            try:
+                header = json.loads(_b64decode(header_segment))
+            except ValueError as e:
+                raise TokenError("Invalid header") from e
+            if not isinstance(header, dict) or header.get("alg") != "HS256":
+                raise TokenError("The specified alg value is not allowed")
+
+        if not hmac.compare_digest(self._sign(signing_bytes), _b64decode(signature)):
+            raise TokenError("Signature verification failed")
+
+        return _load_claims(payload_segment)
+
+
+class AsymmetricCodec:
+    """EdDSA/ES256 codec signing with the key ring's active key.
+
+    Tokens carry the signing key's ``kid``; verification looks the key up
+    by ``kid`` and requires the header ``alg`` to match the key, so a token
+    can never pick its own algorithm. Parsed headers are cached by their
+    encoded segment, which is identical for every token signed by one key.
+    """
+
+    # Bound on cached header segments (one per key in normal operation)
+    HEADER_CACHE_SIZE = 64
+
+    def __init__(self, secret: str, ring: KeyRing, accept_hs256: bool = False) -> None:
+        """Initialize the codec.
+
+        Args:
+            secret: HMAC secret for legacy HS256 tokens
+            ring: Key ring holding the signing and verification keys
+            accept_hs256: Also accept HS256 tokens signed with ``secret``,
+                so tokens issued before switching codecs stay valid
+        """
+        self.ring = ring
+        self._legacy = FastHS256Codec(secret) if accept_hs256 else None
+        self._headers: dict = {}
+
+    def encode(self, claims: dict) -> str:
+        """Sign claims into a token with the active key.
+
+        Raises:
+            ValueError: If the ring has no private key
+        """
+        key = self.ring.signing_key()
+        payload = json.dumps(claims, separators=(",", ":")).encode("utf-8")
+        signing_input = key.header_segment + b"." + _b64encode(payload)
+        return (signing_input + b"." + _b64encode(key.sign(signing_input))).decode("ascii")
+
+    def _header(self, header_segment: str) -> dict:
+        """Parse a header segment, caching the result.
+
+        Raises:
+            TokenError: If the header is not a JSON object
+        """
+        header = self._headers.get(header_segment)
+        if header is None:
+            try:
+                header = json.loads(_b64decode(header_segment))
+            except ValueError as e:
+                raise TokenError("Invalid header") from e
+            if not isinstance(header, dict):
+                raise TokenError("Invalid header")
+            if len(self._headers) >= self.HEADER_CACHE_SIZE:
+                self._headers.clear()
+            self._headers[header_segment] = header
+        return header
+
+    def decode(self, token: str) -> dict:
+        """Verify a token and return its claims.
+
+        Raises:
+            TokenError: If the token is invalid or expired
+        """
+        signing_bytes, header_segment, payload_segment, signature = _split(token)
+        header = self._header(header_segment)
+
+        alg = header.get("alg")
+        if alg == "HS256" and self._legacy is not None:
+            return self._legacy.decode(token)
+
+        kid = header.get("kid")
+        key = self.ring.get(kid) if isinstance(kid, str) else None
+        if key is None:
+            raise TokenError("Unknown signing key")
+        if alg != key.alg:
+            raise TokenError("The specified alg value is not allowed")
+        if not key.verify(_b64decode(signature), signing_bytes):
+            raise TokenError("Signature verification failed")
+
+        return _load_claims(payload_segment)
+
+CODECS = {
+    "fast": FastHS256Codec,
+    "jose": JoseCodec,
+    "asymmetric": AsymmetricCodec,
+}
+
+_codec: Optional[TokenCodec] = None
+_codec_config: tuple = ()
+
+
+def get_codec() -> TokenCodec:
+    """Return the configured codec, rebuilding it when the settings change.
+
+    Rebuilding clears ``token_cache``: claims verified under the old secret
+    or keys must be verified again.
+
+    Raises:
+        ValueError: If ``settings.jwt_codec`` names an unknown codec
+    """
+    global _codec, _codec_config
+    config = (
+        settings.jwt_codec,
+        settings.jwt_secret,
+        settings.jwt_keys_dir,
+        settings.jwt_signing_kid,
+        settings.jwt_accept_hs256,
+    )
+    if config != _codec_config:
+        if settings.jwt_codec not in CODECS:
+            raise ValueError(f"Unsupported JWT codec: {settings.jwt_codec}")
+        if settings.jwt_codec == "asymmetric":
+            key_ring.configure(settings.jwt_keys_dir, settings.jwt_signing_kid)
+            codec = AsymmetricCodec(settings.jwt_secret, key_ring, settings.jwt_accept_hs256)
+        else:
+            codec = CODECS[settings.jwt_codec](settings.jwt_secret)
+        _codec, _codec_config = codec, config
+        token_cache.clear()
+    return _codec
+
+
+def warm_codec() -> None:
+    """Build the codec and run one sign/verify round trip.
+
+    Loads the signing keys and any lazily imported crypto backend before the
+    first request needs them. The throwaway token is not cached.
+    """
+    codec = get_codec()
+    now = int(time.time())
+    codec.decode(codec.encode({"sub": "warmup", "type": "warmup", "iat": now, "exp": now + 60}))
+
+
+@profiled("tokens")
+def create_access_token(user_id: int, role: str, token_version: int = 0) -> str:
     """Create a JWT access token.
     
     Args:
         user_id: ID of the user
         role: Role of the user (e.g., 'user' or 'admin')
+        token_version: User's current token version
         
     Returns:
         JWT access token string
     """
-    exp = datetime.utcnow() + timedelta(minutes=settings.access_token_expires_min)
+    now = int(time.time())
     payload = {
         "sub": str(user_id),
         "role": role,
-        "exp": exp,
-        "iat": datetime.utcnow(),
+        "ver": token_version,
+        "exp": now + settings.access_token_expires_min * 60,
+        "iat": now,
     }
-    token = jwt.encode(
-        payload,
-        settings.jwt_secret,
-        algorithm="HS256",
-    )
-    return token
+    return get_codec().encode(payload)
 
 
-def create_refresh_token() -> tuple[str, str]:
+@profiled("tokens")
+def create_refresh_token(token_version: int = 0) -> tuple[str, str]:
     """Create a JWT refresh token with a unique JTI.
     
+    Args:
+        token_version: User's current token version
+        
     Returns:
         Tuple of (jti, token) where jti is the unique identifier and token is the JWT
     """
     jti = str(uuid.uuid4())
-    exp = datetime.utcnow() + timedelta(days=settings.refresh_token_expires_days)
+    now = int(time.time())
     payload = {
         "jti": jti,
-        "exp": exp,
-        "iat": datetime.utcnow(),
+        "ver": token_version,
+        "exp": now + settings.refresh_token_expires_days * 86400,
+        "iat": now,
     }
-    token = jwt.encode(
-        payload,
-        settings.jwt_secret,
-        algorithm="HS256",
-    )
-    return jti, token
+    return jti, get_codec().encode(payload)
 
 
+@DECODE_TOKEN_SECONDS.time()
+@profiled("tokens")
 def decode_token(token: str) -> Optional[dict]:
     """Decode and validate a JWT token.
     
@@ -65,16 +399,31 @@ def decode_token(token: str) -> Optional[dict]:
     Returns:
         Dictionary of claims if valid, None if invalid or expired
     """
+    # Resolved first so a settings change clears the cache before a lookup
+    codec = get_codec()
+    use_cache = settings.token_cache_enabled
+    if use_cache:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        cached = token_cache.get(key)
+        if cached is not None:
+            # nbf passed when the token was verified, unless the clock stepped back
+            if cached.get("nbf", 0) > time.time():
+                return None
+            return dict(cached)
+
     try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret,
-            algorithms=["HS256"],
-        )
-        return payload
-    except JWTError:
+        payload = codec.decode(token)
+    except TokenError:
         return None
 
+    if use_cache:
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            remaining = exp - time.time()
+            if remaining > 0:
+                token_cache.set(key, dict(payload), ttl=remaining)
+    return payload
+
 
 def validate_token_expiry(payload: dict) -> bool:
     """Validate that a token has not expired.
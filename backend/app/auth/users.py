@@ -0,0 +1,106 @@
+"""
+User listing and export queries for the admin API.
+
+Listings use keyset (seek) pagination on the primary key: each page is
+``WHERE id > :after ORDER BY id LIMIT :limit``, so deep pages cost the same
+as the first one. Email prefix search is a half-open range on the stored
+(lowercase) email, which any B-tree index on ``email`` can serve, unlike
+``LIKE`` under SQLite's case-insensitive default.
+"""
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models import User
+
+# Rows fetched per round trip while streaming an export
+EXPORT_CHUNK_SIZE = 1000
+
+# Columns returned by listings and exports (everything but the password hash)
+USER_COLUMNS = (User.id, User.email, User.role, User.created_at, User.updated_at)
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Return the smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class UserService:
+    """Service class for admin user queries."""
+
+    @staticmethod
+    def filtered_stmt(
+        role: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        email_prefix: Optional[str] = None,
+    ) -> Select:
+        """Build the filtered user query, ordered by id.
+
+        Args:
+            role: Only users with this role
+            created_after: Only users created at or after this time
+            created_before: Only users created before this time
+            email_prefix: Only users whose email starts with this (case-insensitive)
+
+        Returns:
+            SELECT of ``USER_COLUMNS`` ordered by ``User.id``
+        """
+        stmt = select(*USER_COLUMNS).order_by(User.id)
+        if role is not None:
+            stmt = stmt.where(User.role == role)
+        if created_after is not None:
+            stmt = stmt.where(User.created_at >= created_after)
+        if created_before is not None:
+            stmt = stmt.where(User.created_at < created_before)
+        if email_prefix:
+            prefix = email_prefix.lower()
+            stmt = stmt.where(User.email >= prefix, User.email < _prefix_upper_bound(prefix))
+        return stmt
+
+    @staticmethod
+    def list_users(
+        db: Session,
+        after: Optional[int] = None,
+        limit: int = 100,
+        **filters,
+    ) -> Tuple[List, Optional[int]]:
+        """Fetch one page of users.
+
+        Args:
+            db: Database session
+            after: Id of the last user on the previous page
+            limit: Page size
+            **filters: Filters accepted by ``filtered_stmt``
+
+        Returns:
+            Tuple of (rows, cursor for the next page or None on the last page)
+        """
+        stmt = UserService.filtered_stmt(**filters)
+        if after is not None:
+            stmt = stmt.where(User.id > after)
+        # One extra row tells whether another page exists
+        rows = db.execute(stmt.limit(limit + 1)).all()
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].id
+        return rows, None
+
+    @staticmethod
+    def iter_users(db: Session, chunk_size: int = EXPORT_CHUNK_SIZE, **filters) -> Iterator:
+        """Stream every matching user in id order with bounded memory.
+
+        Rows are fetched ``chunk_size`` at a time (``yield_per``), so
+        memory use does not grow with the number of users.
+
+        Args:
+            db: Database session
+            chunk_size: Rows fetched per round trip
+            **filters: Filters accepted by ``filtered_stmt``
+
+        Yields:
+            User rows
+        """
+        stmt = UserService.filtered_stmt(**filters).execution_options(yield_per=chunk_size)
+        yield from db.execute(stmt)
@@ -0,0 +1,35 @@
+"""
+Validation of new account credentials.
+
+Shared by the registration routes (both stacks) and the bulk importer, so
+an imported user meets the same rules as one who signed up.
+"""
+
+# Longest accepted email address (RFC 5321 path limit)
+MAX_EMAIL_LENGTH = 320
+
+MIN_PASSWORD_LENGTH = 8
+# Bcrypt maximum password length
+MAX_PASSWORD_LENGTH = 72
+
+
+def validate_registration(email: str, password: str) -> None:
+    """Validate registration input beyond what the request schema enforces.
+
+    Args:
+        email: Email address of the new account
+        password: Plain text password of the new account
+
+    Raises:
+        ValueError: If the email or password is unacceptable
+    """
+    # Validate email format (basic check)
+    if len(email) > MAX_EMAIL_LENGTH:
+        raise ValueError("Email is too long")
+
+    # Validate password strength and length (bcrypt limit is 72 bytes)
+    if len(password) < MIN_PASSWORD_LENGTH:
+        raise ValueError(f"Password must be at least {MIN_PASSWORD_LENGTH} characters")
+
+    if len(password) > MAX_PASSWORD_LENGTH:
+        raise ValueError(f"Password must be at most {MAX_PASSWORD_LENGTH} characters")
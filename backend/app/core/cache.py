@@ -0,0 +1,137 @@
+"""
+Bounded in-process cache with TTL expiry and LRU eviction.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries expire after a time-to-live.
+
+    Expired entries are not swept: one is dropped when a lookup finds it
+    expired, or when it is the least recently used entry and a ``set``
+    needs room. Until then it still counts towards ``len`` and ``maxsize``.
+
+    Callers that fill the cache from a slower source can guard against
+    re-caching a value that was invalidated while it was being loaded: take
+    ``generation()`` before loading and pass it to ``set``, which then
+    drops the value if any ``invalidate`` or ``clear`` happened in between.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time-to-live in seconds
+
+        Raises:
+            ValueError: If the configuration is invalid
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidate() and clear()
+        self._generation = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for a key, or None if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        """Return the invalidation generation, to pass to ``set`` after a load."""
+        return self._generation
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Optional per-entry time-to-live, capped at the default TTL
+            generation: ``generation()`` taken before the value was loaded;
+                the value is not stored if an invalidation happened since
+        """
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0:
+            return
+        expires_at = time.monotonic() + lifetime
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stale_sets += 1
+                return
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (value, expires_at)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present, and fail loads already in flight."""
+        with self._lock:
+            self._generation += 1
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Number of entries currently stored, including expired ones."""
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return a snapshot of cache counters."""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_sets": self.stale_sets,
+            }
@@ -0,0 +1,229 @@
+"""
+Prometheus metrics: metric definitions, request middleware and exposition.
+
+Metrics live in the default ``prometheus_client`` registry. When the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable is set before the app is
+imported, every worker process writes its samples to that directory and
+``render_metrics`` aggregates them, so any worker can answer a scrape.
+"""
+import os
+import time
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.routing import Match
+
+from app.core.statements import count_statements
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Request latency buckets (seconds), dense around typical bcrypt costs
+REQUEST_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Buckets for fast in-process operations (token decode, pool checkout)
+FAST_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0,
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+AUTH_OPERATION_SECONDS = Histogram(
+    "auth_operation_duration_seconds",
+    "Time spent in password hashing and token decoding",
+    ["operation"],
+    buckets=FAST_BUCKETS + (2.5, 5.0),
+)
+HASH_PASSWORD_SECONDS = AUTH_OPERATION_SECONDS.labels(operation="hash_password")
+VERIFY_PASSWORD_SECONDS = AUTH_OPERATION_SECONDS.labels(operation="verify_password")
+DECODE_TOKEN_SECONDS = AUTH_OPERATION_SECONDS.labels(operation="decode_token")
+
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed while serving a request, by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100),
+)
+DB_COMMITS_PER_REQUEST = Histogram(
+    "db_commits_per_request",
+    "Database transactions committed while serving a request, by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 10),
+)
+
+DB_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to check a connection out of the database pool",
+    buckets=FAST_BUCKETS,
+)
+
+LOGIN_TOTAL = Counter(
+    "auth_login_total",
+    "Login attempts by outcome",
+    ["result"],
+)
+LOGIN_SUCCESS = LOGIN_TOTAL.labels(result="success")
+LOGIN_FAILURE = LOGIN_TOTAL.labels(result="failure")
+LOGIN_OVERLOADED = LOGIN_TOTAL.labels(result="overloaded")
+
+RATE_LIMITED_TOTAL = Counter(
+    "auth_rate_limited_total",
+    "Requests rejected by rate limiting, by route scope and bucket key",
+    ["scope", "key"],
+)
+
+AUDIT_EVENTS_TOTAL = Counter(
+    "auth_audit_events_total",
+    "Audit events by outcome (written, dropped on a full queue, failed to write)",
+    ["result"],
+)
+
+REFRESH_TOKENS_ISSUED = Counter(
+    "auth_refresh_tokens_issued_total",
+    "Refresh tokens issued at login or rotation",
+)
+
+# Label used for requests that matched no route, to bound label cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope) -> str:
+    """Return the template of the route matching a request scope.
+
+    Args:
+        scope: ASGI HTTP scope; ``scope["app"]`` is the FastAPI application
+
+    Returns:
+        Route path template, or ``UNMATCHED_ROUTE``
+    """
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, in-flight requests and
+    SQL statements and commits per request.
+
+    Requests are labelled with the matched route template (e.g.
+    ``/api/auth/login``) rather than the raw path. Route lookups and labelled
+    metric children are memoized, since resolving them costs more than
+    recording the sample itself.
+    """
+
+    # Upper bound on memoized (method, path) lookups, so scanners hitting
+    # random paths cannot grow the cache without limit
+    MAX_CACHED_PATHS = 4096
+
+    def __init__(self, app) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app: The ASGI application to instrument
+        """
+        self.app = app
+        self._routes: dict = {}
+        self._latency: dict = {}
+        self._statements: dict = {}
+
+    def _route(self, scope) -> Tuple[str, Gauge]:
+        """Resolve the route template and in-flight gauge for a request."""
+        key = (scope["method"], scope["path"])
+        cached = self._routes.get(key)
+        if cached is None:
+            route = route_template(scope)
+            cached = (route, HTTP_REQUESTS_IN_PROGRESS.labels(method=key[0], route=route))
+            if len(self._routes) < self.MAX_CACHED_PATHS:
+                self._routes[key] = cached
+        return cached
+
+    def _latency_child(self, method: str, route: str, status_code: int) -> Histogram:
+        """Return the latency histogram child for a label set."""
+        key = (method, route, status_code)
+        child = self._latency.get(key)
+        if child is None:
+            child = HTTP_REQUEST_SECONDS.labels(method=method, route=route, status=str(status_code))
+            self._latency[key] = child
+        return child
+
+    def _statement_children(self, route: str) -> Tuple[Histogram, Histogram]:
+        """Return the statement and commit histogram children for a route."""
+        children = self._statements.get(route)
+        if children is None:
+            children = (
+                DB_STATEMENTS_PER_REQUEST.labels(route=route),
+                DB_COMMITS_PER_REQUEST.labels(route=route),
+            )
+            self._statements[route] = children
+        return children
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        route, in_progress = self._route(scope)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            with count_statements() as count:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            self._latency_child(scope["method"], route, status_code).observe(elapsed)
+            statements, commits = self._statement_children(route)
+            statements.observe(count.statements)
+            commits.observe(count.commits)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    if os.environ.get(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory."""
+    if os.environ.get(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,438 @@
+"""
+Opt-in request profiling: per-request time breakdown and sampled stacks.
+
+Every profiled request carries a ``RequestProfile`` in a context variable.
+Code in hot paths marks its work with ``section("<name>")`` and SQLAlchemy
+cursor execution is timed through engine events, which gives a breakdown
+of wall time across password hashing, tokens, SQL and serialization. A
+background ``StackSampler`` thread periodically captures the stacks of the
+threads serving profiled requests. Requests that are sampled or exceed the
+latency threshold are written to ``ProfileStore`` as a JSON summary plus a
+collapsed-stack (``.folded``) file usable with flamegraph tools.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import Engine, event
+from starlette.concurrency import run_in_threadpool
+
+from app.core.settings import settings
+
+# Breakdown categories reported for every profile
+SECTIONS = ("security", "tokens", "sqlalchemy", "serialization")
+
+# Deepest stack kept per sample
+MAX_STACK_DEPTH = 128
+
+# Modules whose leaf frames mean a worker thread is idle, not serving a request
+_IDLE_MODULES = ("threading", "queue", "selectors", "concurrent.futures.thread")
+
+_PROFILE_ID = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+
+class RequestProfile:
+    """Timing and stack samples collected for one request."""
+
+    def __init__(self, method: str, path: str, frame) -> None:
+        """Start a profile.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            frame: Frame of the coroutine serving the request, used to
+                attribute event-loop stack samples to this request
+        """
+        self.id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.frame = frame
+        self.started = time.perf_counter()
+        self.created_at = time.time()
+        self.sections: Dict[str, float] = dict.fromkeys(SECTIONS, 0.0)
+        self.stacks: Counter = Counter()
+        self.status_code = 0
+        self.duration = 0.0
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a breakdown category."""
+        self.sections[name] = self.sections.get(name, 0.0) + seconds
+
+    def summary(self) -> dict:
+        """Return the JSON-serializable profile summary."""
+        accounted = sum(self.sections.values())
+        breakdown = {name: round(seconds * 1000, 3) for name, seconds in self.sections.items()}
+        breakdown["other"] = round(max(0.0, self.duration - accounted) * 1000, 3)
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status_code,
+            "created_at": self.created_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "breakdown_ms": breakdown,
+            "samples": sum(self.stacks.values()),
+        }
+
+    def collapsed(self) -> str:
+        """Return the stack samples in collapsed-stack format."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+# Worker threads most recently entered by each profiled request's code
+_thread_owner: Dict[int, RequestProfile] = {}
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Return the profile of the request being served, if any."""
+    return _current.get()
+
+
+def _claim_thread(profile: RequestProfile) -> None:
+    """Attribute this worker thread's samples to ``profile``.
+
+    Event-loop threads are skipped: their samples are attributed through
+    the request's coroutine frame instead, since the loop interleaves
+    many requests.
+    """
+    if asyncio._get_running_loop() is None:
+        _thread_owner[threading.get_ident()] = profile
+
+
+def bind_thread(fn: Callable) -> Callable:
+    """Wrap ``fn`` so samples of the thread running it go to the current profile.
+
+    For work handed to executors that do not propagate context variables.
+    Returns ``fn`` unchanged when no profile is active.
+
+    Args:
+        fn: Function about to be submitted to a worker thread
+
+    Returns:
+        Wrapped or original function
+    """
+    profile = _current.get()
+    if profile is None:
+        return fn
+
+    @wraps(fn)
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        _thread_owner[ident] = profile
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _thread_owner.pop(ident, None)
+    return run
+
+
+class section:
+    """Context manager adding the elapsed time to a breakdown category.
+
+    Costs a single context variable lookup when no profile is active.
+    """
+
+    __slots__ = ("name", "profile", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profile: Optional[RequestProfile] = None
+
+    def __enter__(self) -> "section":
+        profile = _current.get()
+        if profile is not None:
+            self.profile = profile
+            _claim_thread(profile)
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.profile is not None:
+            self.profile.add(self.name, time.perf_counter() - self.started)
+
+
+def profiled(name: str) -> Callable:
+    """Decorator timing a synchronous function under a breakdown category.
+
+    Args:
+        name: Breakdown category
+
+    Returns:
+        Decorator
+    """
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current.get()
+    if profile is not None:
+        _claim_thread(profile)
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current.get()
+    started = conn.info.get("profiling_started")
+    if profile is not None and started:
+        profile.add("sqlalchemy", time.perf_counter() - started.pop())
+
+
+def install_sqlalchemy_timing() -> None:
+    """Time cursor execution of every engine under the "sqlalchemy" category."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _frame_label(frame) -> str:
+    """Render a frame as ``module:function``."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """Background thread sampling the stacks of threads serving profiled requests.
+
+    Event-loop samples are attributed to the request whose coroutine frame
+    is on the stack; worker-thread samples go to the request that last ran
+    instrumented code on that thread. The thread sleeps while no profile is
+    active.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active: Dict[int, RequestProfile] = {}
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, profile: RequestProfile) -> None:
+        """Begin sampling for a profile."""
+        with self._lock:
+            self._active[id(profile.frame)] = profile
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, profile: RequestProfile) -> None:
+        """Stop sampling for a profile."""
+        with self._lock:
+            self._active.pop(id(profile.frame), None)
+            for ident, owner in list(_thread_owner.items()):
+                if owner is profile:
+                    _thread_owner.pop(ident, None)
+            if not self._active:
+                self._wake.clear()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                if self._active:
+                    self._sample(own_ident)
+
+    def _sample(self, own_ident: int) -> None:
+        """Record one sample of every relevant thread (lock held)."""
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels: List[str] = []
+            owner = None
+            leaf_module = frame.f_globals.get("__name__", "")
+            while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                if owner is None:
+                    owner = self._active.get(id(frame))
+                    if owner is not None and owner.frame is not frame:
+                        owner = None
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if owner is None:
+                if leaf_module in _IDLE_MODULES:
+                    continue
+                owner = _thread_owner.get(ident)
+                if owner is None or id(owner.frame) not in self._active:
+                    continue
+            labels.reverse()
+            owner.stacks[tuple(labels)] += 1
+
+
+class ProfileStore:
+    """Directory of saved profiles, pruned to the most recent ones."""
+
+    def __init__(self, directory: str, max_profiles: int) -> None:
+        """Initialize the store.
+
+        Args:
+            directory: Directory the profiles are written to
+            max_profiles: Number of most recent profiles kept
+        """
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def save(self, profile: RequestProfile) -> None:
+        """Write a profile's summary and collapsed stacks, then prune."""
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, profile.id)
+        with open(base + ".folded", "w", encoding="utf-8") as folded:
+            folded.write(profile.collapsed())
+        # Summary last: a profile is listed only once both files exist
+        with open(base + ".json", "w", encoding="utf-8") as summary:
+            json.dump(profile.summary(), summary)
+        self._prune()
+
+    def _ids(self) -> List[str]:
+        """Return stored profile ids, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        ids = [name[:-5] for name in names if name.endswith(".json")]
+        return sorted(
+            (pid for pid in ids if _PROFILE_ID.match(pid)),
+            key=lambda pid: int(pid.split("-")[0]),
+            reverse=True,
+        )
+
+    def _prune(self) -> None:
+        for pid in self._ids()[self.max_profiles:]:
+            for suffix in (".json", ".folded"):
+                try:
+                    os.remove(os.path.join(self.directory, pid + suffix))
+                except FileNotFoundError:
+                    pass
+
+    def list(self, limit: int = 50) -> List[dict]:
+        """Return summaries of the most recent profiles, newest first."""
+        summaries = []
+        for pid in self._ids()[:limit]:
+            try:
+                with open(os.path.join(self.directory, pid + ".json"), encoding="utf-8") as f:
+                    summaries.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        """Return a profile summary with its collapsed stacks.
+
+        Args:
+            profile_id: Profile id as listed by ``list``
+
+        Returns:
+            Summary plus a ``collapsed`` field, or None if not found
+        """
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        base = os.path.join(self.directory, profile_id)
+        try:
+            with open(base + ".json", encoding="utf-8") as f:
+                summary = json.load(f)
+            with open(base + ".folded", encoding="utf-8") as f:
+                summary["collapsed"] = f.read()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return summary
+
+
+class ProfiledJSONResponse(JSONResponse):
+    """JSONResponse timing body rendering under the "serialization" category."""
+
+    def render(self, content) -> bytes:
+        with section("serialization"):
+            return super().render(content)
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware profiling sampled and slow requests.
+
+    A random ``sample_rate`` share of requests is always saved. With a
+    ``slow_threshold`` every request is profiled and saved only if it takes
+    at least that long.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        sampler: StackSampler,
+        sample_rate: float = 0.0,
+        slow_threshold: Optional[float] = None,
+    ) -> None:
+        """Wrap an ASGI application.
+
+        Args:
+            app: The ASGI application to profile
+            store: Where kept profiles are written
+            sampler: Stack sampler shared by all requests
+            sample_rate: Fraction of requests always kept (0 to 1)
+            slow_threshold: Seconds after which a request is kept, or None
+        """
+        self.app = app
+        self.store = store
+        self.sampler = sampler
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled and self.slow_threshold is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], sys._getframe())
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+            await send(message)
+
+        token = _current.set(profile)
+        self.sampler.start(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.duration = time.perf_counter() - profile.started
+            self.sampler.stop(profile)
+            _current.reset(token)
+
+        slow = self.slow_threshold is not None and profile.duration >= self.slow_threshold
+        if sampled or slow:
+            await run_in_threadpool(self.store.save, profile)
+
+
+profile_store = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles)
+stack_sampler = StackSampler(settings.profiling_interval_ms / 1000)
@@ -0,0 +1,87 @@
+"""
+Client address of a request, behind trusted reverse proxies.
+
+Behind a load balancer every request arrives from the balancer's address,
+so keying rate limits on the socket peer would put all clients in one
+bucket. When the peer is listed in ``settings.trusted_proxies`` (addresses
+or CIDR networks, comma-separated), ``client_ip`` walks ``X-Forwarded-For``
+from the right, skipping trusted hops, and returns the first address that
+is not a trusted proxy. Entries left of it were written by the client and
+are never trusted. With no trusted proxies configured the header is
+ignored, so clients cannot pick their own address.
+"""
+import ipaddress
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+from fastapi import Request
+
+from app.core.settings import settings
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@lru_cache(maxsize=8)
+def _parse_networks(value: str) -> Tuple[Network, ...]:
+    """Parse the comma-separated trusted proxies setting.
+
+    Raises:
+        ValueError: If an entry is not an IP address or network
+    """
+    return tuple(
+        ipaddress.ip_network(entry.strip(), strict=False)
+        for entry in value.split(",")
+        if entry.strip()
+    )
+
+
+def trusted_networks() -> Tuple[Network, ...]:
+    """Return the networks of ``settings.trusted_proxies``.
+
+    Raises:
+        ValueError: If an entry is not an IP address or network
+    """
+    return _parse_networks(settings.trusted_proxies)
+
+
+def is_trusted_proxy(address: str) -> bool:
+    """Whether ``address`` is one of the configured trusted proxies."""
+    networks = trusted_networks()
+    if not networks:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def _forwarded_for(request: Request) -> List[str]:
+    """Addresses of every X-Forwarded-For header, left to right."""
+    return [
+        hop.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for hop in header.split(",")
+        if hop.strip()
+    ]
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """Return the client address of a request, if known.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        The nearest untrusted address in the forwarding chain, the socket
+        peer when it is not a trusted proxy, or None without a peer
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or not is_trusted_proxy(peer):
+        return peer
+    address = peer
+    for hop in reversed(_forwarded_for(request)):
+        address = hop
+        if not is_trusted_proxy(hop):
+            break
+    return address
@@ -2,6 +2,8 @@
 Settings and configuration loader for the application.
 Uses Pydantic Settings to load configuration from environment variables.
 """
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -12,9 +14,133 @@ class Settings(BaseSettings):
     jwt_secret: str = "your-secret-key-change-in-production"
     access_token_expires_min: int = 15
     refresh_token_expires_days: int = 7
+    # Token signing implementation: "fast" (pre-keyed HMAC), "jose" or
+    # "asymmetric" (EdDSA/ES256 keys from jwt_keys_dir)
+    jwt_codec: str = "fast"
+
+    # Asymmetric signing keys: <kid>.pem files, re-checked for rotation
+    jwt_keys_dir: str = "./keys"
+    jwt_signing_kid: str = ""
+    jwt_keys_reload_seconds: float = 10.0
+    jwt_accept_hs256: bool = True
+    jwks_max_age_seconds: int = 300
+
+    # Refresh token purge job (interval 0 disables the in-process janitor)
+    refresh_token_purge_interval_seconds: int = 0
+    refresh_token_purge_batch_size: int = 1000
+    refresh_token_purge_pause_seconds: float = 0.05
+
+    # Verified-token cache (entries are also bounded by each token's exp)
+    token_cache_enabled: bool = True
+    token_cache_size: int = 10000
+    token_cache_max_ttl_seconds: float = 900.0
+
+    # Build principals from token claims alone, skipping the users-table check.
+    # Off by default: in stateless mode logged-out, deleted and demoted users'
+    # access tokens keep passing role checks until they expire
+    auth_stateless_principal: bool = False
+
+    # Principal cache for the DB-backed (default) identity check. Entries
+    # are dropped on logout-all and role changes only in the worker that
+    # made the change; other workers keep serving theirs for up to the TTL
+    principal_cache_enabled: bool = True
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: float = 5.0
+
+    # Batch token introspection for gateways (empty key disables the endpoint)
+    introspection_api_key: str = ""
+    introspection_max_tokens: int = 500
 
     # Database Configuration
     database_url: str = "sqlite:///./app.db"
+    # Serve auth routes from the async stack (AsyncSession + async handlers)
+    database_async: bool = False
+    # Defaults to DATABASE_URL with the async driver (aiosqlite, asyncpg)
+    async_database_url: str = ""
+    # Comma-separated read replica URLs for lag-tolerant reads such as the admin
+    # listings (sync stack); credentials and revocation state use the primary
+    database_replica_urls: str = ""
+    # Seconds a replica is skipped after a connection or query error
+    replica_ejection_seconds: float = 30.0
+
+    # Connection pool (unset values use per-backend defaults, see app.db.engine)
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_pre_ping: Optional[bool] = None
+    db_pool_recycle: Optional[int] = None
+    db_pool_timeout: float = 30.0
+
+    # SQLite pragmas applied to every new connection
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -64000  # negative means KiB, i.e. 64 MiB
+    sqlite_mmap_size: int = 268435456  # 256 MiB
+
+    # Password Hashing
+    password_hash_workers: int = 4
+    password_hash_executor: str = "thread"  # "thread" or "process"
+    # Scheme and cost for new hashes (CLI to pick a cost: python -m app.auth.calibrate)
+    password_hash_scheme: str = "bcrypt"  # "bcrypt" or "argon2" (needs argon2-cffi)
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kib: int = 65536
+    argon2_parallelism: int = 4
+    # Upgrade stale hashes (other scheme or cost) after a successful login.
+    # Upgrades are low priority: at most this many run at once, and none
+    # start while logins are waiting for the hashing pool
+    password_rehash_on_login: bool = True
+    password_rehash_max_concurrency: int = 1
+
+    # Hashing Admission Control
+    hash_max_concurrency: int = 8
+    hash_max_queue: int = 64
+    hash_queue_timeout_seconds: float = 2.0
+    hash_retry_after_seconds: int = 1
+
+    # Reverse proxies (addresses or CIDR networks, comma-separated) whose
+    # X-Forwarded-For header names the client; empty uses the socket peer
+    trusted_proxies: str = ""
+
+    # Rate limiting for login and register: token buckets per client IP and
+    # per email. "sqlite" shares buckets between worker processes on one host
+    rate_limit_enabled: bool = True
+    rate_limit_backend: str = "memory"  # "memory" or "sqlite"
+    rate_limit_sqlite_path: str = "./ratelimit.db"
+    rate_limit_shards: int = 16
+    rate_limit_ip_burst: int = 20
+    rate_limit_ip_per_minute: float = 20.0
+    rate_limit_email_burst: int = 5
+    rate_limit_email_per_minute: float = 5.0
+
+    # Audit log of logins, registrations and token issuance. Events are queued
+    # and inserted in batches by a background writer; producers wait up to the
+    # enqueue timeout when the queue is full, then the event is dropped
+    audit_enabled: bool = True
+    audit_batch_size: int = 500
+    audit_flush_interval_seconds: float = 1.0
+    audit_queue_size: int = 10000
+    audit_enqueue_timeout_seconds: float = 1.0
+    audit_shutdown_timeout_seconds: float = 10.0
+
+    # Prometheus metrics (middleware plus the /metrics endpoint)
+    metrics_enabled: bool = True
+
+    # Request profiling (opt-in). Profiles are kept for a random sample of
+    # requests and for every request slower than the threshold (0 disables it)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0
+    profiling_slow_threshold_ms: float = 1000.0
+    profiling_interval_ms: float = 5.0
+    profiling_dir: str = "./profiles"
+    profiling_max_profiles: int = 100
+
+    # Startup. Tables are created at startup unless an Alembic or schema stamp
+    # shows the schema is current; warm-up opens pool connections and primes
+    # the token codec, signing keys and hashing pool before /ready reports ready
+    db_create_schema: bool = True
+    warmup_enabled: bool = True
+    warmup_db_connections: int = 2
 
     # Application
     environment: str = "development"
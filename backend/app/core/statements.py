@@ -0,0 +1,105 @@
+"""
+SQL statement counting per request (or any other scope).
+
+``count_statements()`` opens a counting scope in a context variable; every
+cursor execution on any engine and every session commit in that context is
+tallied into it. Transaction control statements (``BEGIN``, ``SAVEPOINT``,
+``RELEASE`` ...) are not counted as statements, and commits are counted per
+``Session``, so the totals are the same whether a session owns its
+transaction or runs inside a savepoint (as under the test harness).
+Context variables follow the request into threadpool workers, so the sync
+and async stacks are counted alike. Scopes nest: a statement counts toward
+every open scope. The metrics middleware opens one scope per request and
+exports the totals, and tests use it to pin each endpoint's statement
+budget.
+"""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+# Leading keywords of transaction control statements
+TRANSACTION_CONTROL = frozenset({"BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "END"})
+
+
+class StatementCount:
+    """Statements and commits seen in one counting scope."""
+
+    __slots__ = ("statements", "commits", "by_verb", "sql", "parent")
+
+    def __init__(self, keep_sql: bool = False, parent: Optional["StatementCount"] = None) -> None:
+        """Start an empty count.
+
+        Args:
+            keep_sql: Also keep the SQL text of every statement (for tests)
+            parent: Enclosing scope that also receives every count
+        """
+        self.parent = parent
+        self.statements = 0
+        self.commits = 0
+        self.by_verb: Counter = Counter()
+        self.sql: Optional[List[str]] = [] if keep_sql else None
+
+    def __repr__(self) -> str:
+        """Summary used in assertion messages."""
+        detail = f", sql={self.sql!r}" if self.sql is not None else ""
+        return f"<StatementCount(statements={self.statements}, commits={self.commits}{detail})>"
+
+
+_current: ContextVar[Optional[StatementCount]] = ContextVar("statement_count", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    count = _current.get()
+    if count is None:
+        return
+    verb = statement.lstrip().split(None, 1)[0].upper()
+    if verb in TRANSACTION_CONTROL:
+        return
+    while count is not None:
+        count.statements += 1
+        count.by_verb[verb] += 1
+        if count.sql is not None:
+            count.sql.append(statement)
+        count = count.parent
+
+
+def _after_commit(session) -> None:
+    count = _current.get()
+    while count is not None:
+        count.commits += 1
+        count = count.parent
+
+
+_installed = False
+
+
+def install_statement_counting() -> None:
+    """Count statements of every engine and commits of every session (idempotent)."""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        _installed = True
+
+
+@contextmanager
+def count_statements(keep_sql: bool = False) -> Iterator[StatementCount]:
+    """Count the SQL statements and commits issued inside the block.
+
+    Args:
+        keep_sql: Also keep the SQL text of every statement
+
+    Yields:
+        The running StatementCount
+    """
+    install_statement_counting()
+    count = StatementCount(keep_sql, parent=_current.get())
+    token = _current.set(count)
+    try:
+        yield count
+    finally:
+        _current.reset(token)
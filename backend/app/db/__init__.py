@@ -1,4 +1,36 @@
 """Database package initialization."""
-from app.db.database import engine, SessionLocal, Base, init_db, get_db
+from app.db.database import (
+    get_engine,
+    SessionLocal,
+    Base,
+    init_db,
+    get_db,
+    session_scope,
+    get_session_scope,
+    get_async_engine,
+    AsyncSessionLocal,
+    get_async_db,
+    get_async_session_scope,
+    transaction,
+    async_transaction,
+)
+from app.db.routing import replica_router, get_read_db
+
+__all__ = [
+    "get_engine",
+    "SessionLocal",
+    "Base",
+    "init_db",
+    "get_db",
+    "session_scope",
+    "get_session_scope",
+    "get_async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
+    "get_async_session_scope",
+    "transaction",
+    "async_transaction",
+    "replica_router",
+    "get_read_db",
+]
 
-__all__ = ["engine", "SessionLocal", "Base", "init_db", "get_db"]
@@ -2,37 +2,163 @@
 Database configuration and session management.
 """
 from sqlalchemy import create_engine, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from typing import Generator
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncContextManager, AsyncGenerator, AsyncIterator, Callable, ContextManager, Generator, Iterator, Optional
 
 from app.core.settings import settings
+from app.db.engine import engine_options, install_sqlite_pragmas
+from app.db.schema import ensure_schema
 
+# Async drivers substituted for the sync ones in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
-# Create database engine
-engine: Engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=False,
-)
 
-# Create session factory
-SessionLocal = sessionmaker(
+def to_async_url(url: str) -> str:
+    """Convert a sync database URL into its async-driver equivalent.
+
+    URLs that already name a driver (``dialect+driver://``) are returned
+    unchanged.
+
+    Args:
+        url: Database URL as used by the sync engine
+
+    Returns:
+        Database URL for ``create_async_engine``
+    """
+    scheme, sep, rest = url.partition("://")
+    if "+" in scheme or scheme not in ASYNC_DRIVERS:
+        return url
+    return f"{ASYNC_DRIVERS[scheme]}{sep}{rest}"
+
+
+_engine_lock = threading.Lock()
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+
+
+def get_engine() -> Engine:
+    """Return the database engine, creating it on first use.
+
+    Building the engine (and loading its dialect and driver) is deferred so
+    importing the app stays cheap; the first session, ``init_db`` or the
+    startup warm-up creates it.
+
+    Returns:
+        Engine for ``settings.database_url`` (pool settings and SQLite
+        pragmas from Settings)
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    settings.database_url,
+                    **engine_options(settings.database_url),
+                )
+                install_sqlite_pragmas(engine)
+                _engine = engine
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the async-stack engine, creating it on first use.
+
+    Returns:
+        Engine for ``settings.async_database_url``, or ``DATABASE_URL`` with
+        its async driver
+    """
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                url = settings.async_database_url or to_async_url(settings.database_url)
+                engine = create_async_engine(url, **engine_options(url, is_async=True))
+                install_sqlite_pragmas(engine.sync_engine)
+                _async_engine = engine
+    return _async_engine
+
+
+def __getattr__(name: str):
+    """Build ``engine`` and ``async_engine`` when first accessed."""
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySessionmaker(sessionmaker):
+    """``sessionmaker`` that binds to its engine when the first session opens."""
+
+    def __init__(self, get_bind: Callable[[], Engine], **kw) -> None:
+        """Initialize the factory.
+
+        Args:
+            get_bind: Returns the engine to bind sessions to
+            kw: ``sessionmaker`` options
+        """
+        super().__init__(**kw)
+        self._get_bind = get_bind
+
+    def __call__(self, **local_kw) -> Session:
+        if self.kw.get("bind") is None:
+            self.configure(bind=self._get_bind())
+        return super().__call__(**local_kw)
+
+
+class LazyAsyncSessionmaker(async_sessionmaker):
+    """``async_sessionmaker`` that binds to its engine when the first session opens."""
+
+    def __init__(self, get_bind: Callable[[], AsyncEngine], **kw) -> None:
+        """Initialize the factory.
+
+        Args:
+            get_bind: Returns the async engine to bind sessions to
+            kw: ``async_sessionmaker`` options
+        """
+        super().__init__(**kw)
+        self._get_bind = get_bind
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=self._get_bind())
+        return super().__call__(**local_kw)
+
+
+# Create session factories (engines are created by the first session)
+SessionLocal = LazySessionmaker(
+    get_engine,
     autocommit=False,
     autoflush=False,
-    bind=engine,
+)
+
+AsyncSessionLocal = LazyAsyncSessionmaker(
+    get_async_engine,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
 # Create declarative base for models
 Base = declarative_base()
 
 
-def init_db() -> None:
+def init_db() -> bool:
     """Initialize the database by creating all tables.
-    
-    This function creates all tables defined in the SQLAlchemy models.
-    In a production environment, use Alembic migrations instead.
+
+    Table creation is skipped when a migration or schema stamp shows the
+    schema is current (see ``app.db.schema``). In a production environment,
+    use Alembic migrations instead.
+
+    Returns:
+        True if tables were created, False if the stamp check skipped it
     """
-    Base.metadata.create_all(bind=engine)
+    return ensure_schema(get_engine(), Base.metadata)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -46,3 +172,96 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Open a database session for the length of a block.
+
+    Yields:
+        A new session, closed when the block exits
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_session_scope() -> Callable[[], ContextManager[Session]]:
+    """Session dependency for handlers that query the database only sometimes.
+
+    Unlike ``get_db``, nothing is opened while the dependency resolves; the
+    handler enters the returned scope on the paths that need a session.
+
+    Returns:
+        ``session_scope``
+    """
+    return session_scope
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database session dependency for FastAPI.
+
+    Yields an ``AsyncSession`` and ensures it's closed after use. Used by
+    the async route handlers when ``settings.database_async`` is enabled.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_session_scope() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Async-stack counterpart of ``get_session_scope``.
+
+    Returns:
+        ``AsyncSessionLocal``; ``async with`` its result to open a session
+    """
+    return AsyncSessionLocal
+
+
+@contextmanager
+def transaction(db: Session) -> Iterator[Session]:
+    """Run a block as one unit of work on a session.
+
+    Commits when the block succeeds and rolls back when it raises. The
+    commit does not expire loaded attributes, so ids and columns of rows
+    written in the block (filled in by ``INSERT ... RETURNING``) stay
+    readable without another SELECT.
+
+    Args:
+        db: Database session
+
+    Yields:
+        The same session
+    """
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+@asynccontextmanager
+async def async_transaction(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Async-stack counterpart of ``transaction``.
+
+    ``AsyncSessionLocal`` never expires on commit, so this only adds the
+    commit-or-rollback handling.
+
+    Args:
+        db: Async database session
+
+    Yields:
+        The same session
+    """
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
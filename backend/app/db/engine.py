@@ -0,0 +1,236 @@
+"""
+Engine factory: connection pool settings, SQLite pragmas, pool warm-up and
+pool statistics.
+"""
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.core.metrics import DB_CHECKOUT_SECONDS
+from app.core.settings import settings
+
+# Pool defaults per backend, used when the matching setting is left unset.
+# SQLite allows one writer at a time, so a small pool avoids lock contention.
+POOL_DEFAULTS = {
+    "sqlite": {"pool_size": 5, "max_overflow": 10, "pool_pre_ping": False, "pool_recycle": -1},
+    "default": {"pool_size": 10, "max_overflow": 20, "pool_pre_ping": True, "pool_recycle": 1800},
+}
+
+
+class PoolWaitStats:
+    """Thread-safe accumulator for connection checkout wait times."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record one checkout that took ``seconds``."""
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            if seconds > self.max_wait:
+                self.max_wait = seconds
+
+    def snapshot(self) -> dict:
+        """Return the counters as a dictionary."""
+        with self._lock:
+            mean = self.total_wait / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.total_wait,
+                "wait_seconds_mean": mean,
+                "wait_seconds_max": self.max_wait,
+            }
+
+
+class _WaitTimingMixin:
+    """Times each checkout inside the pool (waiting plus any new connect)."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.wait_stats = PoolWaitStats()
+        super().__init__(*args, **kwargs)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.wait_stats.record(elapsed)
+            DB_CHECKOUT_SECONDS.observe(elapsed)
+
+
+class TimedQueuePool(_WaitTimingMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class TimedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+
+def _is_sqlite_memory(url) -> bool:
+    """Whether a SQLite URL points to an in-memory database."""
+    return url.database in (None, "", ":memory:") or "mode=memory" in str(url)
+
+
+def engine_options(database_url: str, is_async: bool = False) -> dict:
+    """Build ``create_engine`` keyword arguments for a database URL.
+
+    Pool settings come from ``Settings`` when set, otherwise from the
+    per-backend defaults in ``POOL_DEFAULTS``. In-memory SQLite keeps
+    SQLAlchemy's own single-connection pool.
+
+    Args:
+        database_url: Database URL the engine will connect to
+        is_async: Whether the options are for ``create_async_engine``
+
+    Returns:
+        Keyword arguments for the engine factory
+    """
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    options: dict = {"echo": False}
+
+    if is_sqlite and not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+    if is_sqlite and _is_sqlite_memory(url):
+        return options
+
+    defaults = POOL_DEFAULTS["sqlite" if is_sqlite else "default"]
+
+    def pick(name: str, value: Optional[object]):
+        return defaults[name] if value is None else value
+
+    options.update(
+        poolclass=TimedAsyncQueuePool if is_async else TimedQueuePool,
+        pool_size=pick("pool_size", settings.db_pool_size),
+        max_overflow=pick("max_overflow", settings.db_max_overflow),
+        pool_pre_ping=pick("pool_pre_ping", settings.db_pool_pre_ping),
+        pool_recycle=pick("pool_recycle", settings.db_pool_recycle),
+        pool_timeout=settings.db_pool_timeout,
+    )
+    return options
+
+
+def sqlite_pragmas() -> dict:
+    """Return the PRAGMA statements applied to every new SQLite connection."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": settings.sqlite_cache_size,
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": "MEMORY",
+    }
+
+
+def install_sqlite_pragmas(engine: Engine) -> None:
+    """Apply ``sqlite_pragmas()`` on each new connection of a SQLite engine.
+
+    Does nothing for other backends. For async engines pass
+    ``async_engine.sync_engine``.
+
+    Args:
+        engine: Sync engine (or the sync facade of an async engine)
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _warm_count(pool: Pool, connections: int) -> int:
+    """Connections worth opening: at most what the pool keeps idle."""
+    size = getattr(pool, "size", None)
+    return min(connections, size()) if callable(size) else min(connections, 1)
+
+
+def warm_pool(engine: Engine, connections: int) -> int:
+    """Open pooled connections ahead of the first requests.
+
+    The connections are checked out together, so each one is a new
+    connection (running the connect hooks, e.g. SQLite pragmas), and are
+    then returned to the pool idle.
+
+    Args:
+        engine: Sync engine
+        connections: Connections to open; capped at the pool size
+
+    Returns:
+        Number of connections opened
+    """
+    held = []
+    try:
+        for _ in range(_warm_count(engine.pool, connections)):
+            conn = engine.connect()
+            held.append(conn)
+            conn.exec_driver_sql("SELECT 1")
+    finally:
+        for conn in held:
+            conn.close()
+    return len(held)
+
+
+async def warm_async_pool(engine: AsyncEngine, connections: int) -> int:
+    """Async-engine counterpart of ``warm_pool``.
+
+    Args:
+        engine: Async engine
+        connections: Connections to open; capped at the pool size
+
+    Returns:
+        Number of connections opened
+    """
+    held = []
+    try:
+        for _ in range(_warm_count(engine.sync_engine.pool, connections)):
+            conn = await engine.connect()
+            held.append(conn)
+            await conn.exec_driver_sql("SELECT 1")
+    finally:
+        for conn in held:
+            await conn.close()
+    return len(held)
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Return connection pool statistics for an engine.
+
+    Args:
+        engine: Sync engine (or the sync facade of an async engine)
+
+    Returns:
+        Pool class, size, checked-in/out and overflow counts, and checkout
+        wait times when the pool records them
+    """
+    pool: Pool = engine.pool
+    stats: dict = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    if "overflow" in stats:
+        # QueuePool counts overflow from -pool_size; report only real overflow
+        stats["overflow"] = max(0, stats["overflow"])
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(wait_stats.snapshot())
+    return stats
@@ -0,0 +1,180 @@
+"""
+Read/write session routing to read replicas.
+
+Writes always use the primary session from ``get_db``. Read-only lookups
+can go through ``get_read_db`` (or ``replica_router.read_session``), which
+picks a replica round-robin, skips replicas that recently failed, and
+falls back to the primary when no replica is usable.
+
+Replicas are only for reads that may be a little stale, such as the admin
+listings. Credentials, token versions and revocation state are always read
+on the primary (login, the principal check and introspection), since a
+lagging replica would accept a revoked token or embed an outdated token
+version in a new one.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Generator, Iterator, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.settings import settings
+from app.db.database import get_db
+from app.db.engine import engine_options, install_sqlite_pragmas
+
+
+class Replica:
+    """A read replica engine with its health state."""
+
+    def __init__(self, url: str) -> None:
+        """Create the engine for a replica URL.
+
+        Args:
+            url: Database URL of the replica
+        """
+        self.url = url
+        self.engine: Engine = create_engine(url, **engine_options(url))
+        install_sqlite_pragmas(self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ejected_until = 0.0
+        self.reads = 0
+        self.failures = 0
+
+    def is_healthy(self, now: float) -> bool:
+        """Whether the replica is currently eligible for reads."""
+        return self.ejected_until <= now
+
+    def stats(self) -> dict:
+        """Return health and usage counters (credentials masked)."""
+        return {
+            "url": make_url(self.url).render_as_string(hide_password=True),
+            "healthy": self.is_healthy(time.monotonic()),
+            "reads": self.reads,
+            "failures": self.failures,
+        }
+
+
+class ReplicaRouter:
+    """Round-robin read routing with health-based ejection."""
+
+    def __init__(
+        self,
+        replica_urls: Optional[List[str]] = None,
+        ejection_seconds: float = 30.0,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            replica_urls: Database URLs of the read replicas
+            ejection_seconds: How long a failing replica is skipped
+        """
+        self._lock = threading.Lock()
+        self._next = 0
+        self.replicas: List[Replica] = []
+        self.ejection_seconds = ejection_seconds
+        self.primary_reads = 0
+        self.configure(replica_urls or [])
+
+    def configure(self, replica_urls: List[str]) -> None:
+        """Replace the replica set, disposing engines of the old one.
+
+        Args:
+            replica_urls: Database URLs of the read replicas
+        """
+        replicas = [Replica(url) for url in replica_urls]
+        for replica in replicas:
+            self._watch(replica)
+        with self._lock:
+            old, self.replicas = self.replicas, replicas
+            self._next = 0
+        for replica in old:
+            replica.engine.dispose()
+
+    def _watch(self, replica: Replica) -> None:
+        """Eject a replica whenever its driver reports an error."""
+        @event.listens_for(replica.engine, "handle_error")
+        def _on_error(context) -> None:
+            if isinstance(context.sqlalchemy_exception, DBAPIError) or context.is_disconnect:
+                self.eject(replica)
+
+    def eject(self, replica: Replica) -> None:
+        """Take a replica out of rotation for ``ejection_seconds``."""
+        with self._lock:
+            replica.failures += 1
+            replica.ejected_until = time.monotonic() + self.ejection_seconds
+
+    def pick(self) -> Optional[Replica]:
+        """Choose the replica for the next read.
+
+        Returns:
+            A healthy replica, or None if the read must go to the primary
+        """
+        if not self.replicas:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            count = len(self.replicas)
+            for offset in range(count):
+                replica = self.replicas[(self._next + offset) % count]
+                if replica.is_healthy(now):
+                    self._next = (self._next + offset + 1) % count
+                    replica.reads += 1
+                    return replica
+        return None
+
+    @contextmanager
+    def read_session(self, primary: Session) -> Iterator[Session]:
+        """Provide a session for read-only work.
+
+        Args:
+            primary: The request's primary session, used as the fallback
+
+        Yields:
+            A replica session, or ``primary`` itself
+        """
+        replica = self.pick()
+        if replica is None:
+            with self._lock:
+                self.primary_reads += 1
+            yield primary
+            return
+
+        session = replica.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def stats(self) -> dict:
+        """Return routing counters and per-replica health."""
+        return {
+            "primary_reads": self.primary_reads,
+            "replicas": [replica.stats() for replica in self.replicas],
+        }
+
+
+def _replica_urls_from_settings() -> List[str]:
+    """Parse the comma-separated replica URLs setting."""
+    return [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+
+
+replica_router = ReplicaRouter(
+    replica_urls=_replica_urls_from_settings(),
+    ejection_seconds=settings.replica_ejection_seconds,
+)
+
+
+def get_read_db(db: Session = Depends(get_db)) -> Generator[Session, None, None]:
+    """Database session dependency for read-only lookups.
+
+    Yields a replica session when replicas are configured and healthy,
+    otherwise the primary session from ``get_db``.
+    """
+    with replica_router.read_session(db) as read_db:
+        yield read_db
@@ -0,0 +1,192 @@
+"""
+Startup schema check: create tables only when the schema may be out of date.
+
+``create_all`` checks every table with its own query on each boot (one
+round trip per table on a server database). Instead, ``ensure_schema``
+reads the ``schema_stamp`` row written by the last ``create_all`` and skips
+table creation when it matches the fingerprint of the current models, or
+when an Alembic ``alembic_version`` stamp shows migrations own the schema.
+Otherwise it runs ``create_all`` and records the new fingerprint. The
+fingerprint covers table, column, index and foreign key definitions, so
+adding a model or column triggers one ``create_all`` on the next boot.
+
+``create_all`` only creates missing tables, so an existing database would
+keep its old columns and indexes. ``upgrade_schema`` runs after it and
+brings existing tables up to the models: columns that can be added in place
+(nullable, or with a server default, such as ``users.token_version``) are
+added with ``ALTER TABLE ... ADD COLUMN`` and missing indexes (such as the
+``refresh_tokens`` purge indexes) are created. Both steps are idempotent.
+
+The stamp is written only after ``missing_schema`` confirms that every
+table, column and index of the models exists in the database. Anything
+still missing (a NOT NULL column without a default needs a migration)
+raises ``SchemaError`` and fails startup, so the check runs again on the
+next boot instead of being skipped for good.
+"""
+import hashlib
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Column, Connection, DateTime, Engine, MetaData, String, Table, delete, insert, inspect
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
+
+ALEMBIC_TABLE = "alembic_version"
+STAMP_TABLE = "schema_stamp"
+
+# Kept out of the models' metadata so it is not part of its own fingerprint
+_stamp_metadata = MetaData()
+schema_stamp = Table(
+    STAMP_TABLE,
+    _stamp_metadata,
+    Column("fingerprint", String(64), primary_key=True),
+    Column("created_at", DateTime, nullable=False),
+)
+
+
+def schema_fingerprint(metadata: MetaData) -> str:
+    """Return a digest of the table definitions in ``metadata``.
+
+    Args:
+        metadata: Metadata of the models
+
+    Returns:
+        Hex SHA-256 of the tables, columns, indexes and foreign keys
+    """
+    digest = hashlib.sha256()
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts = [f"table {table.name}"]
+        for column in table.columns:
+            parts.append(
+                f"column {column.name} {column.type!r} "
+                f"nullable={column.nullable} pk={column.primary_key}"
+            )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(column.name for column in index.columns)
+            parts.append(f"index {index.name} ({columns}) unique={index.unique}")
+        for fk in sorted(table.foreign_keys, key=lambda f: f.target_fullname):
+            parts.append(f"fk {fk.parent.name} -> {fk.target_fullname}")
+        digest.update("\n".join(parts).encode("utf-8"))
+        digest.update(b"\n\n")
+    return digest.hexdigest()
+
+
+class SchemaError(RuntimeError):
+    """Raised when the database does not match the models after an upgrade."""
+
+
+def _stamped_fingerprint(engine: Engine) -> Optional[str]:
+    """Return the recorded fingerprint, or None if nothing is recorded."""
+    try:
+        with engine.connect() as conn:
+            return conn.exec_driver_sql(f"SELECT fingerprint FROM {STAMP_TABLE}").scalar()
+    except DBAPIError:
+        # No stamp table yet
+        return None
+
+
+def upgrade_schema(conn: Connection, metadata: MetaData) -> List[str]:
+    """Add missing columns and indexes to existing tables.
+
+    Only columns that existing rows can take without a backfill are added:
+    nullable ones and ones with a server default. Other missing columns are
+    left for a migration.
+
+    Args:
+        conn: Connection inside the schema transaction
+        metadata: Metadata of the models
+
+    Returns:
+        Descriptions of the columns and indexes that were added
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    applied = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            if not column.nullable and column.server_default is None:
+                continue
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+            applied.append(f"column {table.name}.{column.name}")
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            if index.name not in indexes:
+                index.create(bind=conn)
+                applied.append(f"index {index.name}")
+    return applied
+
+
+def missing_schema(conn: Connection, metadata: MetaData) -> List[str]:
+    """List the tables, columns and indexes of the models the database lacks.
+
+    Args:
+        conn: Connection to the database to check
+        metadata: Metadata of the models
+
+    Returns:
+        Descriptions of what is missing, empty when the schema matches
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            missing.append(f"table {table.name}")
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(
+            f"column {table.name}.{column.name}" for column in table.columns if column.name not in columns
+        )
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing.extend(
+            f"index {index.name}" for index in table.indexes if index.name not in indexes
+        )
+    return missing
+
+
+def ensure_schema(engine: Engine, metadata: MetaData) -> bool:
+    """Create missing tables unless a stamp shows the schema is current.
+
+    A current schema costs one SELECT; only a missing or stale stamp leads
+    to listing the tables, running ``create_all`` and ``upgrade_schema``,
+    and verifying the result before the new stamp is written.
+
+    Args:
+        engine: Engine of the database to check
+        metadata: Metadata of the models
+
+    Returns:
+        True if ``create_all`` ran, False if it was skipped
+
+    Raises:
+        SchemaError: If columns or indexes are still missing afterwards
+    """
+    fingerprint = schema_fingerprint(metadata)
+    if _stamped_fingerprint(engine) == fingerprint:
+        return False
+
+    with engine.begin() as conn:
+        if ALEMBIC_TABLE in inspect(conn).get_table_names():
+            if conn.exec_driver_sql(f"SELECT 1 FROM {ALEMBIC_TABLE} LIMIT 1").first():
+                return False
+        metadata.create_all(bind=conn)
+        upgrade_schema(conn, metadata)
+        missing = missing_schema(conn, metadata)
+        if missing:
+            raise SchemaError(
+                "Database schema does not match the models; apply a migration for: "
+                + ", ".join(missing)
+            )
+        _stamp_metadata.create_all(bind=conn)
+        conn.execute(delete(schema_stamp))
+        conn.execute(
+            insert(schema_stamp).values(fingerprint=fingerprint, created_at=datetime.utcnow())
+        )
+    return True
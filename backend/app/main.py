@@ -1,12 +1,55 @@
 """
 FastAPI application entrypoint for Backend Foundation & Authentication.
 """
-from fastapi import FastAPI
+import asyncio
+import logging
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.settings import settings
-from app.db import init_db
-from app.api import auth, admin
+from app.core.metrics import MetricsMiddleware, mark_worker_dead, render_metrics
+from app.core.proxies import trusted_networks
+from app.core.profiling import (
+    ProfiledJSONResponse,
+    ProfilingMiddleware,
+    install_sqlalchemy_timing,
+    profile_store,
+    stack_sampler,
+)
+from app.db import init_db, get_async_engine, get_engine, SessionLocal
+from app.db.engine import warm_async_pool, warm_pool
+from app.api import auth, admin, introspection, wellknown
+from app.auth.audit import audit_log
+from app.auth.keys import key_ring
+from app.auth.security import hashing_pool
+from app.auth.tokens import get_codec, warm_codec
+from app.auth.janitor import run_periodic_purge
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up() -> None:
+    """Prepare connections and caches before the app reports ready.
+
+    Opens pool connections on the engine the auth routes use, primes the
+    token codec and signing keys, and starts the hashing workers, so the
+    first requests do not pay for them. Failures are logged, not raised:
+    warm-up only moves work ahead of traffic.
+    """
+    started = asyncio.get_running_loop().time()
+    try:
+        if settings.database_async:
+            await warm_async_pool(get_async_engine(), settings.warmup_db_connections)
+        else:
+            await asyncio.to_thread(warm_pool, get_engine(), settings.warmup_db_connections)
+        await asyncio.to_thread(warm_codec)
+        await asyncio.to_thread(hashing_pool.warm)
+    except Exception:
+        logger.exception("Warm-up failed; serving without it")
+        return
+    logger.info("Warm-up finished in %.0f ms", (asyncio.get_running_loop().time() - started) * 1000)
 
 
 def create_app() -> FastAPI:
@@ -15,6 +58,9 @@ def create_app() -> FastAPI:
         title="Innovation Portal Backend",
         description="Backend API with authentication and authorization",
         version="1.0.0",
+        default_response_class=(
+            ProfiledJSONResponse if settings.profiling_enabled else JSONResponse
+        ),
     )
 
     # Add CORS middleware
@@ -26,15 +72,78 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Include routers
-    app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    # Sampled and slow-request profiling
+    if settings.profiling_enabled:
+        install_sqlalchemy_timing()
+        threshold_ms = settings.profiling_slow_threshold_ms
+        app.add_middleware(
+            ProfilingMiddleware,
+            store=profile_store,
+            sampler=stack_sampler,
+            sample_rate=settings.profiling_sample_rate,
+            slow_threshold=threshold_ms / 1000 if threshold_ms > 0 else None,
+        )
+
+    # Per-route latency and in-flight metrics (outermost, so CORS is timed too)
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    # Include routers (the async stack is only imported when enabled)
+    if settings.database_async:
+        from app.api import auth_async
+
+        auth_router = auth_async.router
+    else:
+        auth_router = auth.router
+    app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
+    app.include_router(introspection.router, prefix="/api/auth", tags=["auth"])
     app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+    app.include_router(wellknown.router, prefix="/.well-known", tags=["well-known"])
+
+    # Not ready until startup and warm-up have finished
+    app.state.ready = False
+
+    async def warm_up_then_ready() -> None:
+        await warm_up()
+        app.state.ready = True
 
     # Startup event
     @app.on_event("startup")
-    def startup_event():
-        """Initialize database on startup."""
-        init_db()
+    async def startup_event():
+        """Initialize database and background jobs on startup."""
+        if settings.db_create_schema:
+            init_db()
+        # A malformed TRUSTED_PROXIES fails startup instead of every request
+        trusted_networks()
+        # An unknown JWT_CODEC fails startup
+        get_codec()
+        if settings.jwt_codec == "asymmetric":
+            # Load the signing keys now so a bad key directory fails startup
+            key_ring.refresh(max_age=0)
+            key_ring.signing_key()
+        app.state.purge_task = None
+        if settings.refresh_token_purge_interval_seconds > 0:
+            app.state.purge_task = asyncio.create_task(
+                run_periodic_purge(SessionLocal, settings.refresh_token_purge_interval_seconds)
+            )
+        # Warm up in the background: /health answers at once, /ready after
+        app.state.warmup_task = None
+        if settings.warmup_enabled:
+            app.state.warmup_task = asyncio.create_task(warm_up_then_ready())
+        else:
+            app.state.ready = True
+
+    # Shutdown event
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Stop background jobs, drain the audit log and release the hashing workers."""
+        for name in ("purge_task", "warmup_task"):
+            task = getattr(app.state, name, None)
+            if task is not None:
+                task.cancel()
+        await asyncio.to_thread(audit_log.close, settings.audit_shutdown_timeout_seconds)
+        hashing_pool.shutdown(wait=False)
+        mark_worker_dead()
 
     # Health check endpoint
     @app.get("/health")
@@ -42,6 +151,21 @@ def create_app() -> FastAPI:
         """Basic health check endpoint."""
         return {"status": "ok"}
 
+    # Readiness endpoint
+    @app.get("/ready")
+    def readiness_check():
+        """Report ready once startup and warm-up have finished (503 before)."""
+        if not app.state.ready:
+            return JSONResponse(status_code=503, content={"status": "starting"})
+        return {"status": "ready"}
+
+    if settings.metrics_enabled:
+        @app.get("/metrics", include_in_schema=False)
+        def metrics() -> Response:
+            """Prometheus scrape endpoint."""
+            body, content_type = render_metrics()
+            return Response(content=body, media_type=content_type)
+
     return app
 
 
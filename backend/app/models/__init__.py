@@ -2,5 +2,6 @@
 from app.db import Base
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
+from app.models.audit_event import AuditEvent
 
-__all__ = ["Base", "User", "RefreshToken"]
+__all__ = ["Base", "User", "RefreshToken", "AuditEvent"]
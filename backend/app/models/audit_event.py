@@ -0,0 +1,31 @@
+"""
+AuditEvent model for the authentication audit log.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Index
+
+from app.db import Base
+
+
+class AuditEvent(Base):
+    """Append-only record of a login, failed login, registration or token issuance."""
+
+    __tablename__ = "audit_events"
+
+    id = Column(Integer, primary_key=True)
+    event = Column(String(32), nullable=False)
+    # No foreign key: failed logins may name unknown users, and events outlive accounts
+    user_id = Column(Integer, nullable=True)
+    email = Column(String(320), nullable=True)
+    ip = Column(String(45), nullable=True)
+    # Set when the event happened, not when the batch was written
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination filtered by user or event type
+        Index("ix_audit_events_user_id", "user_id", "id"),
+        Index("ix_audit_events_event", "event", "id"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of AuditEvent."""
+        return f"<AuditEvent(id={self.id}, event={self.event}, user_id={self.user_id})>"
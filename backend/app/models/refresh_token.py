@@ -1,7 +1,7 @@
 """
 RefreshToken model for managing refresh token state.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, func
 
 from app.db import Base
 
@@ -16,7 +16,17 @@ class RefreshToken(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     revoked = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        # Partial index so the purge job finds revoked rows without a scan
+        Index(
+            "ix_refresh_tokens_revoked",
+            "id",
+            sqlite_where=revoked.is_(True),
+            postgresql_where=revoked.is_(True),
+        ),
+    )
 
     def __repr__(self) -> str:
         """String representation of RefreshToken."""
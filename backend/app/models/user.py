@@ -15,6 +15,8 @@ class User(Base):
     email = Column(String(320), unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     role = Column(String(32), nullable=False, default="user")
+    # Embedded in issued tokens; bumping it invalidates all of them at once
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -3,6 +3,7 @@ Pydantic schemas for user-related requests and responses.
 """
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
 
 
 class UserRegisterRequest(BaseModel):
@@ -19,7 +20,7 @@ class UserResponse(BaseModel):
     email: str = Field(..., description="User email")
     role: str = Field(..., description="User role (user or admin)")
     created_at: datetime = Field(..., description="Creation timestamp")
-    updated_at: datetime = Field(..., description="Last update timestamp")
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp (None if never updated)")
 
     class Config:
         """Pydantic config."""
@@ -40,3 +41,59 @@ class TokenResponse(BaseModel):
     refresh_token: str = Field(..., description="JWT refresh token")
     token_type: str = Field(default="bearer", description="Token type")
     expires_in: int = Field(..., description="Access token expiry in seconds")
+
+
+class RefreshTokenRequest(BaseModel):
+    """Request schema for refresh token rotation and logout."""
+
+    refresh_token: str = Field(..., description="JWT refresh token")
+
+
+class IntrospectionRequest(BaseModel):
+    """Request schema for batch token introspection."""
+
+    tokens: List[str] = Field(..., min_length=1, description="Access and/or refresh tokens")
+
+
+class TokenIntrospection(BaseModel):
+    """Introspection result for one token."""
+
+    active: bool = Field(..., description="Token is valid, unexpired and not revoked")
+    token_type: Optional[str] = Field(None, description="access or refresh (None if invalid)")
+    revoked: bool = Field(..., description="Token was revoked or its sessions were logged out")
+    claims: Optional[dict] = Field(None, description="Verified claims (None if invalid)")
+
+
+class IntrospectionResponse(BaseModel):
+    """Response schema for batch token introspection, in request order."""
+
+    results: List[TokenIntrospection] = Field(..., description="One result per token")
+
+
+class UserListResponse(BaseModel):
+    """Response schema for a page of users."""
+
+    users: List[UserResponse] = Field(..., description="Users ordered by id")
+    next_after: Optional[int] = Field(None, description="Cursor for the next page (None on the last page)")
+
+
+class AuditEventResponse(BaseModel):
+    """Response schema for one audit event."""
+
+    id: int = Field(..., description="Event ID (write order)")
+    event: str = Field(..., description="login, login_failed, register or token_issued")
+    user_id: Optional[int] = Field(None, description="Subject user ID (None if unknown)")
+    email: Optional[str] = Field(None, description="Email named by the request")
+    ip: Optional[str] = Field(None, description="Client address")
+    created_at: datetime = Field(..., description="When the event happened")
+
+    class Config:
+        """Pydantic config."""
+        from_attributes = True
+
+
+class AuditEventListResponse(BaseModel):
+    """Response schema for a page of audit events."""
+
+    events: List[AuditEventResponse] = Field(..., description="Events ordered by id")
+    next_after: Optional[int] = Field(None, description="Cursor for the next page (None on the last page)")
@@ -0,0 +1,145 @@
+"""
+Compare the sync and async database stacks under high concurrency.
+
+Builds one app per stack against its own temporary SQLite file and fires
+N concurrent requests at it through an in-process ASGI client:
+
+* ``login-miss``: login for an unknown email, a pure read (one SELECT, no
+  bcrypt work)
+* ``refresh``: refresh token rotation, an UPDATE plus an INSERT
+
+Sync handlers run on the threadpool (40 threads by default), so their
+concurrency is capped; async handlers are only bounded by the event loop
+and the database.
+
+Usage:
+    python -m benchmarks.bench_async_db [--concurrency N]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.service import AuthService
+from app.core.settings import settings
+from app.db import Base, get_async_db, get_db
+from app.db.engine import engine_options, install_sqlite_pragmas
+from app.main import create_app
+from app.models import User
+
+
+def build_app(database_async: bool, database_file: str):
+    """Create an app for one stack, bound to its own database file."""
+    original = settings.database_async
+    settings.database_async = database_async
+    try:
+        app = create_app()
+    finally:
+        settings.database_async = original
+
+    sync_url = f"sqlite:///{database_file}"
+    sync_engine = create_engine(sync_url, **engine_options(sync_url))
+    install_sqlite_pragmas(sync_engine)
+    Base.metadata.create_all(bind=sync_engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+
+    if database_async:
+        async_url = f"sqlite+aiosqlite:///{database_file}"
+        async_engine = create_async_engine(async_url, **engine_options(async_url, is_async=True))
+        install_sqlite_pragmas(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+    else:
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+
+    return app, SessionLocal
+
+
+def seed_refresh_tokens(SessionLocal, count: int) -> list:
+    """Create one user and ``count`` refresh tokens for it."""
+    db = SessionLocal()
+    try:
+        user = User(email="bench@example.com", hashed_password="unused")
+        db.add(user)
+        db.commit()
+        return [AuthService.create_tokens(user, db)["refresh_token"] for _ in range(count)]
+    finally:
+        db.close()
+
+
+async def fire(client: httpx.AsyncClient, requests: list) -> tuple:
+    """Send all requests concurrently, returning (elapsed, latencies, errors)."""
+    async def one(path: str, body: dict) -> tuple:
+        started = time.perf_counter()
+        response = await client.post(path, json=body)
+        return time.perf_counter() - started, response.status_code
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*[one(path, body) for path, body in requests])
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, code in results if code >= 500)
+    return elapsed, latencies, errors
+
+
+def report(label: str, elapsed: float, latencies: list, errors: int) -> None:
+    """Print one result line."""
+    total = len(latencies)
+    p50 = latencies[total // 2] * 1000
+    p99 = latencies[min(total - 1, int(total * 0.99))] * 1000
+    print(
+        f"{label:<20} {total / elapsed:9.1f} req/s  p50 {p50:8.1f} ms  "
+        f"p99 {p99:8.1f} ms  5xx {errors}"
+    )
+
+
+async def run(concurrency: int) -> None:
+    """Run every scenario on both stacks."""
+    workdir = tempfile.mkdtemp(prefix="bench_async_db_")
+    for database_async in (False, True):
+        stack = "async" if database_async else "sync"
+        app, SessionLocal = build_app(database_async, os.path.join(workdir, f"{stack}.db"))
+        refresh_tokens = seed_refresh_tokens(SessionLocal, concurrency)
+
+        # Count unhandled app errors (e.g. "database is locked") as 500s
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            misses = [
+                ("/api/auth/login", {"email": f"missing{i}@example.com", "password": "irrelevant123"})
+                for i in range(concurrency)
+            ]
+            report(f"{stack} login-miss", *await fire(client, misses))
+
+            refreshes = [("/api/auth/refresh", {"refresh_token": token}) for token in refresh_tokens]
+            report(f"{stack} refresh", *await fire(client, refreshes))
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"concurrency={args.concurrency}")
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Load test for refresh token rotation under concurrent clients.
+
+Each simulated client holds its own refresh token and rotates it in a loop
+through ``POST /api/auth/refresh`` using an in-process ASGI client against
+a temporary SQLite database. A second phase has many clients race the same
+refresh token to check that exactly one of them wins.
+
+Usage:
+    python -m benchmarks.bench_refresh [--clients N] [--rotations N]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.service import AuthService
+from app.db import Base, get_db
+from app.db.engine import engine_options, install_sqlite_pragmas
+from app.main import app
+from app.models import User
+
+
+async def rotate_chain(client: httpx.AsyncClient, refresh_token: str, rotations: int) -> list:
+    """Rotate one client's refresh token repeatedly, returning per-call latencies."""
+    latencies = []
+    for _ in range(rotations):
+        started = time.perf_counter()
+        response = await client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+        refresh_token = response.json()["refresh_token"]
+    return latencies
+
+
+async def race_same_token(client: httpx.AsyncClient, refresh_token: str, racers: int) -> int:
+    """Present one refresh token from many clients at once, returning the win count."""
+    responses = await asyncio.gather(
+        *[client.post("/api/auth/refresh", json={"refresh_token": refresh_token}) for _ in range(racers)]
+    )
+    return sum(1 for response in responses if response.status_code == 200)
+
+
+async def run(clients: int, rotations: int) -> None:
+    """Run both phases and print a summary."""
+    workdir = tempfile.mkdtemp(prefix="bench_refresh_")
+    url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    engine = create_engine(url, **engine_options(url))
+    install_sqlite_pragmas(engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    # Seed users and their first refresh tokens directly (no bcrypt needed)
+    seed = SessionLocal()
+    initial_tokens = []
+    for i in range(clients + 1):
+        user = User(email=f"bench{i}@example.com", hashed_password="unused")
+        seed.add(user)
+        seed.commit()
+        initial_tokens.append(AuthService.create_tokens(user, seed)["refresh_token"])
+    seed.close()
+
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            started = time.perf_counter()
+            results = await asyncio.gather(
+                *[rotate_chain(client, token, rotations) for token in initial_tokens[:clients]]
+            )
+            elapsed = time.perf_counter() - started
+
+            winners = await race_same_token(client, initial_tokens[clients], racers=clients)
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    latencies = sorted(latency for chain in results for latency in chain)
+    total = len(latencies)
+    print(f"clients={clients} rotations/client={rotations} total={total}")
+    print(f"throughput: {total / elapsed:8.1f} refresh/s")
+    print(f"p50:        {latencies[total // 2] * 1000:8.2f} ms")
+    print(f"p99:        {latencies[min(total - 1, int(total * 0.99))] * 1000:8.2f} ms")
+    print(f"same-token race: {winners} of {clients} requests succeeded (expected 1)")
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--rotations", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.rotations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Measure worker start-up: time to first request and time to ready.
+
+Each boot runs in a fresh interpreter against a temporary SQLite file. The
+first boot finds an empty database (tables are created), later boots reuse
+it, as a restarted or newly scaled worker would.
+
+* ``phases``: imports ``app.main``, runs the startup hooks, waits for the
+  warm-up and serves one request through an in-process ASGI client, timing
+  each step
+* ``server``: starts uvicorn and polls until the first request is answered,
+  then until ``/ready`` returns 200, timed from process launch
+
+``--importtime`` instead lists the slowest modules imported by
+``app.main`` (from ``python -X importtime``).
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [--mode phases|server|both]
+    python -m benchmarks.bench_startup --importtime [--top N]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A login for an unknown email: one SELECT, no password hashing
+FIRST_REQUEST = ("/api/auth/login", {"email": "nobody@example.com", "password": "not-a-password"})
+
+PHASES_SCRIPT = """
+import asyncio, json, time
+import httpx
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def main():
+    await app.router.startup()
+    started_up = time.perf_counter()
+    task = getattr(app.state, "warmup_task", None)
+    if task is not None:
+        await task
+    warmed = time.perf_counter()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post({path!r}, json={body!r})
+    served = time.perf_counter()
+    await app.router.shutdown()
+    print(json.dumps({{
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (started_up - imported) * 1000,
+        "warmup_ms": (warmed - started_up) * 1000,
+        "first_request_ms": (served - warmed) * 1000,
+        "total_ms": (served - started) * 1000,
+    }}))
+
+asyncio.run(main())
+""".format(path=FIRST_REQUEST[0], body=FIRST_REQUEST[1])
+
+
+def _environment(database_file: str) -> dict:
+    """Child process environment pointing the app at ``database_file``."""
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{database_file}"
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    return env
+
+
+def boot_phases(database_file: str) -> dict:
+    """Boot the app in a fresh interpreter and return its phase timings."""
+    output = subprocess.run(
+        [sys.executable, "-c", PHASES_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=_environment(database_file),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot_server(database_file: str, timeout: float = 60.0) -> dict:
+    """Start uvicorn and time the first answered request and readiness.
+
+    Returns:
+        Milliseconds from launch to the first response and to ``/ready``
+        returning 200 (equal to the first response on apps without it)
+    """
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=_environment(database_file),
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=5.0) as client:
+            first_ms, _ = _poll(lambda: client.post(FIRST_REQUEST[0], json=FIRST_REQUEST[1]), started, timeout)
+            ready_ms, status = _poll(
+                lambda: client.get("/ready"),
+                started,
+                timeout,
+                done=lambda response: response.status_code in (200, 404),
+            )
+    finally:
+        process.terminate()
+        process.wait()
+    return {"first_request_ms": first_ms, "ready_ms": first_ms if status == 404 else ready_ms}
+
+
+def _poll(send, started: float, timeout: float, done=None) -> tuple:
+    """Repeat ``send`` until it gets a response ``done`` accepts.
+
+    Returns:
+        Tuple of (milliseconds since ``started``, status code)
+
+    Raises:
+        TimeoutError: If no accepted response arrives within ``timeout``
+    """
+    while time.perf_counter() - started < timeout:
+        try:
+            response = send()
+        except httpx.TransportError:
+            time.sleep(0.005)
+            continue
+        if done is None or done(response):
+            return (time.perf_counter() - started) * 1000, response.status_code
+        time.sleep(0.005)
+    raise TimeoutError(f"no answer from the server within {timeout:.0f}s")
+
+
+def summarize(label: str, runs: list) -> None:
+    """Print the first boot and the median of the later boots."""
+    print(f"{label}")
+    keys = list(runs[0])
+    for key in keys:
+        first = runs[0][key]
+        later = [run[key] for run in runs[1:]]
+        median = f"{statistics.median(later):9.1f}" if later else f"{'-':>9}"
+        print(f"  {key:<18} empty db {first:9.1f} ms   existing db (median) {median} ms")
+
+
+def import_profile(top: int) -> None:
+    """Print the slowest imports of ``app.main`` by cumulative time."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if self_us.isdigit():
+            rows.append((int(cumulative_us), int(self_us), name))
+    total = next((cumulative for cumulative, _, name in rows if name == "app.main"), 0)
+    print(f"import app.main: {total / 1000:.1f} ms\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="boots per mode (first on an empty database)")
+    parser.add_argument("--mode", choices=["phases", "server", "both"], default="both")
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports instead")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.importtime:
+        import_profile(args.top)
+        return
+
+    modes = ["phases", "server"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        boot = boot_phases if mode == "phases" else boot_server
+        with tempfile.TemporaryDirectory() as directory:
+            database_file = os.path.join(directory, "startup.db")
+            runs = [boot(database_file) for _ in range(args.runs)]
+        summarize(mode, runs)
+
+
+if __name__ == "__main__":
+    main()
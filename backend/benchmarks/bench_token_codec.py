@@ -0,0 +1,77 @@
+"""
+Throughput benchmark for the JWT codecs.
+
+Encodes and decodes access-token-shaped claims with the ``python-jose``
+codec, the pre-keyed ``FastHS256Codec`` and the ``AsymmetricCodec`` (with
+a throwaway key in a temporary directory, ``--alg`` EdDSA or ES256), and
+also times the public ``create_access_token`` / ``decode_token`` helpers
+with each codec selected (verified-token cache disabled).
+
+Usage:
+    python -m benchmarks.bench_token_codec [--iterations N] [--alg EdDSA|ES256]
+"""
+import argparse
+import tempfile
+import time
+import timeit
+
+from app.auth.keys import SUPPORTED_ALGORITHMS, generate_key
+from app.auth.tokens import (
+    CODECS,
+    create_access_token,
+    decode_token,
+    get_codec,
+    token_cache,
+)
+from app.core.settings import settings
+
+
+def tokens_per_second(fn, iterations: int) -> float:
+    """Return calls per second of ``fn`` after a short warm-up."""
+    for _ in range(min(iterations, 1000)):
+        fn()
+    return iterations / timeit.timeit(fn, number=iterations)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50000)
+    parser.add_argument("--alg", choices=SUPPORTED_ALGORITHMS, default="EdDSA")
+    args = parser.parse_args()
+
+    now = int(time.time())
+    claims = {"sub": "42", "role": "user", "ver": 0, "exp": now + 900, "iat": now}
+    rows = {}
+    original = (settings.jwt_codec, settings.jwt_keys_dir, settings.token_cache_enabled)
+    keys_dir = tempfile.TemporaryDirectory()
+    try:
+        generate_key(keys_dir.name, args.alg, kid="bench")
+        settings.jwt_keys_dir = keys_dir.name
+        settings.token_cache_enabled = False
+        for name in CODECS:
+            settings.jwt_codec = name
+            codec = get_codec()
+            token = codec.encode(claims)
+            rows[name] = (
+                tokens_per_second(lambda: codec.encode(claims), args.iterations),
+                tokens_per_second(lambda: codec.decode(token), args.iterations),
+                tokens_per_second(lambda: create_access_token(42, "user"), args.iterations),
+                tokens_per_second(lambda: decode_token(token), args.iterations),
+            )
+    finally:
+        settings.jwt_codec, settings.jwt_keys_dir, settings.token_cache_enabled = original
+        get_codec()
+        keys_dir.cleanup()
+        token_cache.clear()
+
+    print(f"{'codec':<10} {'encode/s':>12} {'decode/s':>12} {'create/s':>12} {'decode_token/s':>15}")
+    for name, (encode, decode, create, helper) in rows.items():
+        print(f"{name:<10} {encode:12.0f} {decode:12.0f} {create:12.0f} {helper:15.0f}")
+    jose, fast = rows["jose"], rows["fast"]
+    print(f"fast/jose  {fast[0] / jose[0]:11.1f}x {fast[1] / jose[1]:11.1f}x "
+          f"{fast[2] / jose[2]:11.1f}x {fast[3] / jose[3]:14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
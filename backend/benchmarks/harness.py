@@ -0,0 +1,148 @@
+"""
+Timing, statistics and baseline comparison for the benchmark suite.
+"""
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import sqlalchemy
+
+
+@dataclass
+class Result:
+    """Latency statistics for one benchmark."""
+
+    name: str
+    ops: int
+    wall_seconds: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    ops_per_sec: float
+
+    @classmethod
+    def from_latencies(cls, name: str, latencies: List[float], wall_seconds: float) -> "Result":
+        """Summarize per-operation latencies.
+
+        Args:
+            name: Benchmark name
+            latencies: Per-operation latencies in seconds
+            wall_seconds: Wall time for all operations (less than their sum
+                when they ran concurrently)
+
+        Returns:
+            Result with percentiles in milliseconds
+        """
+        ordered = sorted(latencies)
+
+        def percentile(fraction: float) -> float:
+            index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+            return ordered[index] * 1000
+
+        return cls(
+            name=name,
+            ops=len(ordered),
+            wall_seconds=round(wall_seconds, 6),
+            mean_ms=round(statistics.fmean(ordered) * 1000, 6),
+            p50_ms=round(percentile(0.50), 6),
+            p95_ms=round(percentile(0.95), 6),
+            p99_ms=round(percentile(0.99), 6),
+            ops_per_sec=round(len(ordered) / wall_seconds, 3) if wall_seconds else 0.0,
+        )
+
+
+def time_calls(fn: Callable[[], object], iterations: int, warmup: int = 0) -> tuple:
+    """Call ``fn`` repeatedly and time each call.
+
+    Args:
+        fn: Zero-argument callable to time
+        iterations: Number of timed calls
+        warmup: Number of untimed calls made first
+
+    Returns:
+        Tuple of (per-call latencies in seconds, total wall seconds)
+    """
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - call_started)
+    return latencies, time.perf_counter() - started
+
+
+def environment() -> dict:
+    """Describe the interpreter and platform the results were taken on."""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def write_results(path: str, results: List[Result], meta: dict) -> None:
+    """Write results as JSON.
+
+    Args:
+        path: Output file path
+        results: Benchmark results
+        meta: Run metadata (environment, options)
+    """
+    payload = {"meta": meta, "results": {r.name: asdict(r) for r in results}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Optional[Dict[str, dict]]:
+    """Load the ``results`` mapping of a results file, or None if missing."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return None
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, dict],
+    metric: str,
+    threshold_percent: float,
+) -> List[dict]:
+    """Compare results with a baseline.
+
+    Args:
+        results: Current results
+        baseline: Baseline results keyed by benchmark name
+        metric: Latency field compared (e.g. ``p50_ms``)
+        threshold_percent: Allowed slowdown before a benchmark regresses
+
+    Returns:
+        One row per benchmark present in both, with the relative change
+        and whether it regressed
+    """
+    rows = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if not reference or not reference.get(metric):
+            continue
+        current = getattr(result, metric)
+        change = (current - reference[metric]) / reference[metric] * 100
+        rows.append({
+            "name": result.name,
+            "baseline": reference[metric],
+            "current": current,
+            "change_percent": round(change, 2),
+            "regressed": change > threshold_percent,
+        })
+    return rows
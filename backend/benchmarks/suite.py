@@ -0,0 +1,348 @@
+"""
+Benchmark suite for the authentication hot paths, with regression checks.
+
+Benchmarks:
+
+* ``hash_password[rounds=N]`` / ``verify_password[rounds=N]``: bcrypt at
+  several cost factors
+* ``create_access_token``, ``decode_token[cold]`` (verified-token cache
+  off) and ``decode_token[warm]``
+* ``get_current_user``: header parsing, decode and the users-table check
+  through the principal cache (one query on the first call), called
+  directly against the database
+* ``http_login[c=N]`` and ``http_admin_status[c=N]``: full request paths
+  through an in-process ASGI client with N concurrent clients
+
+Everything runs in one process against an in-memory SQLite database
+(``memdb`` VFS, shared by all pooled connections). Results are written as
+JSON and compared against a stored baseline; the run fails when any
+benchmark's latency metric is slower than the baseline by more than the
+threshold. Baselines are machine-specific: refresh them with
+``--update-baseline`` on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite [--quick] [--only bcrypt,tokens,...] [--output FILE]
+        [--baseline FILE] [--threshold PERCENT] [--metric p50_ms]
+        [--update-baseline]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from typing import Callable, List
+
+import bcrypt
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.deps import get_current_user
+from app.auth.security import BCRYPT_MAX_BYTES, hash_password, verify_password
+from app.auth.tokens import create_access_token, decode_token, token_cache
+from app.core.settings import settings
+from app.db import Base, SessionLocal
+from app.db.engine import engine_options, install_sqlite_pragmas
+from app.main import create_app
+from app.models import User
+
+from benchmarks.harness import (
+    Result,
+    compare,
+    environment,
+    load_results,
+    time_calls,
+    write_results,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+PASSWORD = "benchmark-password-123"
+
+# (iterations, quick iterations) per benchmark family
+ITERATIONS = {
+    "bcrypt": (10, 3),
+    "tokens": (20000, 2000),
+    "current_user": (5000, 500),
+    "http": (2000, 200),
+}
+
+
+def _count(family: str, quick: bool) -> int:
+    full, reduced = ITERATIONS[family]
+    return reduced if quick else full
+
+
+def bench_bcrypt(quick: bool) -> List[Result]:
+    """Hash and verify at several bcrypt cost factors."""
+    results = []
+    password_bytes = PASSWORD.encode("utf-8")[:BCRYPT_MAX_BYTES]
+    iterations = _count("bcrypt", quick)
+    for rounds in (4, 8, 10, 12):
+        latencies, wall = time_calls(
+            lambda: bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds)),
+            iterations,
+        )
+        results.append(Result.from_latencies(f"hash_password[rounds={rounds}]", latencies, wall))
+
+        hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+        latencies, wall = time_calls(lambda: verify_password(PASSWORD, hashed), iterations)
+        results.append(Result.from_latencies(f"verify_password[rounds={rounds}]", latencies, wall))
+
+    # The production cost factor, through the public helper
+    latencies, wall = time_calls(lambda: hash_password(PASSWORD), iterations)
+    results.append(Result.from_latencies("hash_password[default]", latencies, wall))
+    return results
+
+
+def bench_tokens(quick: bool) -> List[Result]:
+    """Access token creation and decoding with and without the cache."""
+    iterations = _count("tokens", quick)
+    results = []
+
+    latencies, wall = time_calls(
+        lambda: create_access_token(user_id=1, role="user"), iterations, warmup=100
+    )
+    results.append(Result.from_latencies("create_access_token", latencies, wall))
+
+    token = create_access_token(user_id=1, role="user")
+    original = settings.token_cache_enabled
+    try:
+        for label, enabled in (("cold", False), ("warm", True)):
+            settings.token_cache_enabled = enabled
+            token_cache.clear()
+            latencies, wall = time_calls(lambda: decode_token(token), iterations, warmup=100)
+            results.append(Result.from_latencies(f"decode_token[{label}]", latencies, wall))
+    finally:
+        settings.token_cache_enabled = original
+        token_cache.clear()
+    return results
+
+
+class BenchDatabase:
+    """In-memory SQLite database shared by every pooled connection."""
+
+    def __init__(self) -> None:
+        """Create the schema in a fresh in-memory database."""
+        url = f"sqlite:///file:/bench-{uuid.uuid4().hex}?vfs=memdb&uri=true"
+        self.engine = create_engine(url, **engine_options(url))
+        install_sqlite_pragmas(self.engine)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        # Keep one connection open: the memdb database lives as long as it does
+        self._keepalive = self.engine.connect()
+        Base.metadata.create_all(bind=self.engine)
+
+    def seed_users(self, count: int, role: str = "user", rounds: int = 4) -> List[User]:
+        """Insert users sharing one cheap bcrypt hash of ``PASSWORD``."""
+        hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=rounds))
+        db = self.SessionLocal()
+        try:
+            users = [
+                User(email=f"{role}{i}@bench.example.com", hashed_password=hashed.decode("utf-8"), role=role)
+                for i in range(count)
+            ]
+            db.add_all(users)
+            db.commit()
+            for user in users:
+                db.refresh(user)
+            db.expunge_all()
+            return users
+        finally:
+            db.close()
+
+    @contextmanager
+    def serving(self):
+        """Bind the application's ``SessionLocal`` to this database.
+
+        Rebinding, rather than ``dependency_overrides``, keeps the request
+        path identical to production: FastAPI re-resolves overridden
+        dependencies on every request.
+        """
+        original = SessionLocal.kw["bind"]
+        rate_limit_enabled = settings.rate_limit_enabled
+        rehash_on_login = settings.password_rehash_on_login
+        SessionLocal.configure(bind=self.engine)
+        # The benchmark replays a few accounts far beyond the login limits
+        settings.rate_limit_enabled = False
+        # Seeded hashes are deliberately cheap; upgrading them to the
+        # configured cost would time bcrypt (see bench_bcrypt), not the path
+        settings.password_rehash_on_login = False
+        try:
+            yield
+        finally:
+            SessionLocal.configure(bind=original)
+            settings.rate_limit_enabled = rate_limit_enabled
+            settings.password_rehash_on_login = rehash_on_login
+
+    def close(self) -> None:
+        """Release the database."""
+        self._keepalive.close()
+        self.engine.dispose()
+
+
+def bench_current_user(quick: bool) -> List[Result]:
+    """``get_current_user`` called directly with a real session."""
+    database = BenchDatabase()
+    try:
+        user = database.seed_users(1)[0]
+        header = f"Bearer {create_access_token(user.id, user.role, user.token_version)}"
+        db = database.SessionLocal()
+        try:
+            latencies, wall = time_calls(
+                lambda: get_current_user(authorization=header, open_session=lambda: nullcontext(db)),
+                _count("current_user", quick),
+                warmup=50,
+            )
+        finally:
+            db.close()
+        return [Result.from_latencies("get_current_user", latencies, wall)]
+    finally:
+        database.close()
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    request: Callable[[httpx.AsyncClient, int], object],
+    total: int,
+    concurrency: int,
+) -> tuple:
+    """Send ``total`` requests from ``concurrency`` concurrent clients.
+
+    Returns:
+        Tuple of (latencies, wall seconds)
+
+    Raises:
+        RuntimeError: If any request fails, so broken paths are not timed
+    """
+    latencies: List[float] = []
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for index in counter:
+            started = time.perf_counter()
+            response = await request(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{response.request.url} returned {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, time.perf_counter() - started
+
+
+async def _login(client: httpx.AsyncClient, users: List[User], index: int):
+    user = users[index % len(users)]
+    return await client.post("/api/auth/login", json={"email": user.email, "password": PASSWORD})
+
+
+async def _admin_status(client: httpx.AsyncClient, headers: dict):
+    return await client.get("/api/admin/status", headers=headers)
+
+
+async def _bench_http(quick: bool, concurrency: int) -> List[Result]:
+    database = BenchDatabase()
+    try:
+        users = database.seed_users(concurrency)
+        admin = database.seed_users(1, role="admin")[0]
+        admin_headers = {"Authorization": f"Bearer {create_access_token(admin.id, 'admin')}"}
+        scenarios = (
+            ("http_login", lambda client, index: _login(client, users, index)),
+            ("http_admin_status", lambda client, index: _admin_status(client, admin_headers)),
+        )
+
+        transport = httpx.ASGITransport(app=create_app())
+        total = _count("http", quick)
+        results = []
+        with database.serving():
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for name, request in scenarios:
+                    await _drive(client, request, min(total, 50), concurrency)  # warm up
+                    latencies, wall = await _drive(client, request, total, concurrency)
+                    results.append(Result.from_latencies(f"{name}[c={concurrency}]", latencies, wall))
+        return results
+    finally:
+        database.close()
+
+
+def bench_http(quick: bool, concurrency: int = 16) -> List[Result]:
+    """Full login and admin status request paths under concurrency."""
+    return asyncio.run(_bench_http(quick, concurrency))
+
+
+BENCHMARKS = {
+    "bcrypt": bench_bcrypt,
+    "tokens": bench_tokens,
+    "current_user": bench_current_user,
+    "http": bench_http,
+}
+
+
+def run(quick: bool, families: List[str]) -> List[Result]:
+    """Run the selected benchmark families.
+
+    Args:
+        quick: Use reduced iteration counts
+        families: Names from ``BENCHMARKS`` to run
+
+    Returns:
+        Benchmark results
+    """
+    results = []
+    for family in families:
+        results.extend(BENCHMARKS[family](quick))
+    return results
+
+
+def main() -> int:
+    """Run the suite, write results and compare with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="reduced iteration counts")
+    parser.add_argument(
+        "--only",
+        default=",".join(BENCHMARKS),
+        help=f"comma-separated families to run ({', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=25.0, help="allowed slowdown in percent")
+    parser.add_argument("--metric", default="p50_ms", choices=["mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    families = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(families) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark families: {', '.join(sorted(unknown))}")
+
+    results = run(args.quick, families)
+    meta = {"environment": environment(), "quick": args.quick}
+    write_results(args.output, results, meta)
+
+    print(f"{'benchmark':<32} {'ops/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    for r in results:
+        print(f"{r.name:<32} {r.ops_per_sec:12.1f} {r.p50_ms:10.3f} {r.p95_ms:10.3f} {r.p99_ms:10.3f}")
+    print(f"results written to {args.output}")
+
+    if args.update_baseline:
+        write_results(args.baseline, results, meta)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"no baseline at {args.baseline}; skipping comparison")
+        return 0
+
+    rows = compare(results, baseline, args.metric, args.threshold)
+    regressions = [row for row in rows if row["regressed"]]
+    print(f"\n{args.metric} vs baseline (threshold +{args.threshold:.0f}%):")
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"{row['name']:<32} {row['baseline']:10.3f} -> {row['current']:10.3f} "
+              f"({row['change_percent']:+7.1f}%) {flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,111 @@
 """
 Pytest configuration and fixtures for testing.
+
+The schema is created once per session in an in-memory SQLite database
+shared through ``StaticPool``. Each test runs inside a transaction on one
+connection that is rolled back afterwards; commits made by the app become
+savepoints, so no test sees another test's rows and nothing is dropped or
+recreated between tests. Under pytest-xdist (``pytest -n auto``) every
+worker process has its own in-memory database.
 """
+import os
+from contextlib import contextmanager
+
+# Test settings profile, applied before the app reads its settings;
+# variables already set in the environment take precedence
+TEST_SETTINGS = {
+    # Minimum bcrypt cost: real hashes in about 1 ms instead of about 250 ms
+    "BCRYPT_ROUNDS": "4",
+    # Audit events are written only when a test (or teardown) flushes, so the
+    # writer thread never shares the test connection with a request
+    "AUDIT_FLUSH_INTERVAL_SECONDS": "3600",
+}
+for name, value in TEST_SETTINGS.items():
+    os.environ.setdefault(name, value)
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
-from app.db import Base, get_db
+from app.db import Base, get_db, get_session_scope
 from app.main import app
 from app.models import User
+from app.auth.audit import audit_log
+from app.auth.principal import principal_cache
+from app.auth.ratelimit import rate_limit_store
+from app.auth.tokens import token_cache
 
 
-# Create test database
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
-
+# One in-memory database per test process, shared by every thread
 engine = create_engine(
-    SQLALCHEMY_TEST_DATABASE_URL,
+    "sqlite://",
     connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
 )
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(engine, "connect")
+def _disable_driver_transactions(dbapi_connection, connection_record) -> None:
+    """Let SQLAlchemy emit BEGIN itself, which pysqlite needs for savepoints."""
+    dbapi_connection.isolation_level = None
 
-@pytest.fixture(scope="function")
-def db():
-    """Create a fresh test database for each test."""
+
+@event.listens_for(engine, "begin")
+def _begin(conn) -> None:
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def schema():
+    """Create the tables once per test session."""
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def connection(schema):
+    """A connection whose transaction is rolled back after the test."""
+    conn = engine.connect()
+    transaction = conn.begin()
+    yield conn
+    transaction.rollback()
+    conn.close()
+
+
+@pytest.fixture
+def session_factory(connection):
+    """Session factory whose commits become savepoints of the test transaction."""
+    return sessionmaker(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture(scope="function")
+def db(session_factory):
+    """Database session for a test, rolled back when the test ends."""
+    # Audit events from the app under test go to the test transaction
+    audit_log.configure(session_factory)
+    db = session_factory()
     yield db
+    audit_log.flush()
     db.close()
-    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Keep cached principals, tokens and rate limits from leaking between tests."""
+    principal_cache.clear()
+    token_cache.clear()
+    rate_limit_store.clear()
+    yield
+    principal_cache.clear()
+    token_cache.clear()
+    rate_limit_store.clear()
 
 
 @pytest.fixture(scope="function")
@@ -41,7 +117,12 @@ def client(db: Session):
         finally:
             pass
 
+    @contextmanager
+    def override_session_scope():
+        yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_scope] = lambda: override_session_scope
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -0,0 +1,49 @@
+"""
+Integration tests for the authentication audit log.
+"""
+from fastapi.testclient import TestClient
+
+from app.auth.audit import audit_log
+from app.auth.tokens import create_access_token
+from app.models import User
+
+
+def test_auth_events_are_listed_for_admins(client: TestClient, test_admin_user: User) -> None:
+    """Test that registration, logins and token issuance are audited.
+
+    Given: A registration, a successful login and a failed login
+    When: The queue is flushed and GET /api/admin/audit is paged through
+    Then: Every event is listed once, in order, with the client address
+    """
+    email, password = "audited@example.com", "securepassword123"
+    client.post("/api/auth/register", json={"email": email, "password": password})
+    client.post("/api/auth/login", json={"email": email, "password": password})
+    client.post("/api/auth/login", json={"email": email, "password": "wrongpassword123"})
+    assert audit_log.flush()
+
+    headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin')}"}
+    events, after = [], None
+    while True:
+        params = {"limit": 2} if after is None else {"limit": 2, "after": after}
+        response = client.get("/api/admin/audit", params=params, headers=headers)
+        assert response.status_code == 200
+        events += response.json()["events"]
+        after = response.json()["next_after"]
+        if after is None:
+            break
+
+    assert [event["event"] for event in events] == ["register", "token_issued", "login", "login_failed"]
+    user_id = events[0]["user_id"]
+    assert [event["user_id"] for event in events] == [user_id, user_id, user_id, None]
+    assert all(event["ip"] == "testclient" for event in events if event["event"] != "token_issued")
+    assert events[3]["email"] == email
+
+    response = client.get("/api/admin/audit", params={"event": "login_failed"}, headers=headers)
+    assert [event["email"] for event in response.json()["events"]] == [email]
+
+
+def test_audit_requires_admin(client: TestClient, test_user: User) -> None:
+    """Test that non-admins cannot read the audit log."""
+    headers = {"Authorization": f"Bearer {create_access_token(test_user.id, 'user')}"}
+    response = client.get("/api/admin/audit", headers=headers)
+    assert response.status_code == 403
@@ -0,0 +1,52 @@
+"""
+Integration tests for load shedding on password-hashing endpoints.
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import security
+from app.auth.admission import AdmissionLimiter
+
+
+@pytest.fixture
+def saturated_limiter(monkeypatch: pytest.MonkeyPatch) -> AdmissionLimiter:
+    """Replace the hashing limiter with one whose only slot is taken."""
+    limiter = AdmissionLimiter(max_concurrent=1, max_queue=0, queue_timeout=0.1, retry_after=5)
+    asyncio.run(limiter.acquire())
+    monkeypatch.setattr(security, "hashing_limiter", limiter)
+    return limiter
+
+
+def test_register_shed_when_overloaded(client: TestClient, saturated_limiter: AdmissionLimiter) -> None:
+    """Test that registration fails fast when hashing capacity is exhausted.
+
+    Given: Hashing admission control with no free slots or queue capacity
+    When: POST /api/auth/register is called
+    Then: HTTP 503 is returned with a Retry-After header
+    """
+    response = client.post(
+        "/api/auth/register",
+        json={"email": "busy@example.com", "password": "securepassword123"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert saturated_limiter.shed == 1
+
+
+def test_login_shed_when_overloaded(client: TestClient, saturated_limiter: AdmissionLimiter, test_user) -> None:
+    """Test that login fails fast when hashing capacity is exhausted.
+
+    Given: An existing user and a saturated hashing limiter
+    When: POST /api/auth/login is called
+    Then: HTTP 503 is returned with a Retry-After header
+    """
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "securepassword123"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,128 @@
+"""
+Integration tests for the auth routes on the async database stack.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.audit import audit_log
+from app.core.statements import count_statements
+from app.core.settings import settings
+from app.db import Base, get_async_db, get_async_session_scope
+from app.main import create_app
+from app.models import User
+
+CREDENTIALS = {"email": "async@example.com", "password": "securepassword123"}
+
+
+@pytest.fixture
+def async_client(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """Create a test client for an app serving the async auth router."""
+    database_file = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{database_file}")
+    Base.metadata.create_all(bind=sync_engine)
+    # Audit events are written through a sync session on the same file
+    monkeypatch.setattr(audit_log, "session_factory", sessionmaker(bind=sync_engine))
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_file}")
+    SessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with SessionLocal() as db:
+            yield db
+
+    monkeypatch.setattr(settings, "database_async", True)
+    app = create_app()
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_scope] = lambda: SessionLocal
+    yield TestClient(app)
+    audit_log.flush()
+    sync_engine.dispose()
+
+
+def test_async_register_and_login(async_client: TestClient) -> None:
+    """Test registration and login through the async stack.
+
+    Given: The app configured with DATABASE_ASYNC enabled
+    When: A user registers, then logs in
+    Then: HTTP 201 and a token pair are returned
+    """
+    response = async_client.post("/api/auth/register", json=CREDENTIALS)
+    assert response.status_code == 201
+
+    duplicate = async_client.post("/api/auth/register", json=CREDENTIALS)
+    assert duplicate.status_code == 400
+    assert "already registered" in duplicate.json()["detail"].lower()
+
+    response = async_client.post("/api/auth/login", json=CREDENTIALS)
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+    wrong = async_client.post("/api/auth/login", json={**CREDENTIALS, "password": "wrongpassword123"})
+    assert wrong.status_code == 401
+
+
+def test_async_refresh_logout_and_logout_all(async_client: TestClient) -> None:
+    """Test token rotation and revocation through the async stack."""
+    async_client.post("/api/auth/register", json=CREDENTIALS)
+    tokens = async_client.post("/api/auth/login", json=CREDENTIALS).json()
+
+    rotated = async_client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert rotated.status_code == 200
+    reused = async_client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+
+    new_tokens = rotated.json()
+    response = async_client.post("/api/auth/logout", json={"refresh_token": new_tokens["refresh_token"]})
+    assert response.status_code == 200
+
+    headers = {"Authorization": f"Bearer {new_tokens['access_token']}"}
+    assert async_client.post("/api/auth/logout-all", headers=headers).status_code == 200
+    assert async_client.post("/api/auth/logout-all", headers=headers).status_code == 401
+
+
+def test_async_statement_budget(async_client: TestClient) -> None:
+    """Test that the async stack matches the sync statement budgets.
+
+    Given: The async auth router
+    When: A user registers, logs in and logs out everywhere
+    Then: Each request runs its budgeted statements in one transaction
+    """
+    with count_statements() as register:
+        async_client.post("/api/auth/register", json=CREDENTIALS)
+    with count_statements() as login:
+        tokens = async_client.post("/api/auth/login", json=CREDENTIALS).json()
+    with count_statements() as logout_all:
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert async_client.post("/api/auth/logout-all", headers=headers).status_code == 200
+
+    assert (register.statements, register.commits) == (1, 1)
+    assert (login.statements, login.commits) == (2, 1)
+    assert (logout_all.statements, logout_all.commits) == (1, 1)
+
+
+def test_async_login_upgrades_stale_hash(
+    async_client: TestClient, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the background hash upgrade writes through its own session.
+
+    Given: A user registered while BCRYPT_ROUNDS=4
+    When: The cost is raised to 5 and the user logs in
+    Then: The stored hash uses cost 5 once the response has been sent
+    """
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    async_client.post("/api/auth/register", json=CREDENTIALS)
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+
+    response = async_client.post("/api/auth/login", json=CREDENTIALS)
+
+    assert response.status_code == 200
+    engine = create_engine(f"sqlite:///{tmp_path / 'async.db'}")
+    with engine.connect() as conn:
+        stored = conn.execute(
+            select(User.hashed_password).where(User.email == CREDENTIALS["email"])
+        ).scalar_one()
+    engine.dispose()
+    assert stored.startswith("$2b$05$")
@@ -0,0 +1,87 @@
+"""
+Integration tests for batch token introspection.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.settings import settings
+from app.core.statements import count_statements
+
+CREDENTIALS = {"email": "gateway@example.com", "password": "securepassword123"}
+KEY = "test-introspection-key"
+
+
+@pytest.fixture(autouse=True)
+def introspection_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Enable introspection with a known key."""
+    monkeypatch.setattr(settings, "introspection_api_key", KEY)
+
+
+def _introspect(client: TestClient, tokens: list, key: str = KEY):
+    return client.post(
+        "/api/auth/introspect",
+        json={"tokens": tokens},
+        headers={"X-Introspection-Key": key},
+    )
+
+
+def test_batch_reports_validity_and_revocation(client: TestClient) -> None:
+    """Test per-token results for a mixed batch.
+
+    Given: A revoked refresh token, a live token pair and a garbage token
+    When: They are introspected in one request
+    Then: Each result reflects the token's type and status, in order
+    """
+    client.post("/api/auth/register", json=CREDENTIALS)
+    first = client.post("/api/auth/login", json=CREDENTIALS).json()
+    client.post("/api/auth/logout", json={"refresh_token": first["refresh_token"]})
+    second = client.post("/api/auth/login", json=CREDENTIALS).json()
+
+    response = _introspect(
+        client,
+        [second["access_token"], first["refresh_token"], second["refresh_token"], "garbage"],
+    )
+
+    assert response.status_code == 200
+    access, revoked, live, invalid = response.json()["results"]
+    assert (access["active"], access["token_type"], access["claims"]["role"]) == (True, "access", "user")
+    assert (revoked["active"], revoked["revoked"], revoked["token_type"]) == (False, True, "refresh")
+    assert (live["active"], live["token_type"]) == (True, "refresh")
+    assert invalid == {"active": False, "token_type": None, "revoked": False, "claims": None}
+
+    # Logging out everywhere revokes the access token as well
+    headers = {"Authorization": f"Bearer {second['access_token']}"}
+    client.post("/api/auth/logout-all", headers=headers)
+    results = _introspect(client, [second["access_token"], second["refresh_token"]]).json()["results"]
+    assert [result["revoked"] for result in results] == [True, True]
+
+
+def test_batch_uses_one_query_per_token_type(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that revocation lookups do not scale with the batch size.
+
+    Given: Ten token pairs
+    When: All twenty tokens are introspected
+    Then: The database sees exactly one refresh-token and one users query
+    """
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    client.post("/api/auth/register", json=CREDENTIALS)
+    tokens = []
+    for _ in range(10):
+        pair = client.post("/api/auth/login", json=CREDENTIALS).json()
+        tokens += [pair["access_token"], pair["refresh_token"]]
+
+    with count_statements() as count:
+        results = _introspect(client, tokens).json()["results"]
+
+    assert all(result["active"] for result in results)
+    assert count.statements == 2
+
+
+@pytest.mark.parametrize(
+    "key, tokens, expected",
+    [("wrong-key", ["t"], 401), (KEY, ["t"] * 501, 413), (KEY, [], 422)],
+    ids=["bad-key", "too-many", "empty"],
+)
+def test_rejected_requests(client: TestClient, key: str, tokens: list, expected: int) -> None:
+    """Test authentication and batch size limits."""
+    assert _introspect(client, tokens, key=key).status_code == expected
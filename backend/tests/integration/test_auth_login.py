@@ -1,12 +1,16 @@
 """
 Integration tests for user login endpoint.
 """
+import asyncio
+from contextlib import nullcontext
+
 import pytest
 from fastapi.testclient import TestClient
 from jose import jwt
 
 from app.core.settings import settings
-from app.auth.security import hash_password
+from app.auth.security import hash_password, verify_password
+from app.auth.service import AuthService
 from app.models import User
 from sqlalchemy.orm import Session
 
@@ -125,3 +129,88 @@ def test_login_token_contains_user_claims(client: TestClient, db: Session) -> No
     assert decoded["role"] == "user"
     assert "exp" in decoded  # expiration
     assert "iat" in decoded  # issued at
+
+
+def test_login_upgrades_stale_hash(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a hash below the configured cost is replaced after login.
+
+    Given: A user whose password was hashed with BCRYPT_ROUNDS=4
+    When: The cost is raised to 5 and the user logs in
+    Then: The stored hash uses cost 5 and still verifies the password
+    """
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    user = User(email="rehash@example.com", hashed_password=hash_password("securepassword123"))
+    db.add(user)
+    db.commit()
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "rehash@example.com", "password": "securepassword123"},
+    )
+
+    assert response.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
+    assert verify_password("securepassword123", user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_logins_upgrade_hash_once(db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a burst of logins for one user runs a single hash upgrade.
+
+    Given: A user with a stale hash
+    When: Three upgrades for that user are started concurrently
+    Then: Only one of them re-hashes the password
+    """
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    user = User(email="burst@example.com", hashed_password=hash_password("securepassword123"))
+    db.add(user)
+    db.commit()
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+    rehashes = []
+
+    async def counting_rehash(password: str):
+        rehashes.append(password)
+        await asyncio.sleep(0.01)
+        return None
+
+    monkeypatch.setattr("app.auth.service.rehash_password_async", counting_rehash)
+
+    await asyncio.gather(*[
+        AuthService.upgrade_password_hash(
+            user.id, "securepassword123", user.hashed_password, lambda: nullcontext(db)
+        )
+        for _ in range(3)
+    ])
+
+    assert len(rehashes) == 1
+
+
+def test_login_rate_limited_per_email(client: TestClient) -> None:
+    """Test that repeated logins for one account are throttled.
+
+    Given: An email that has used up its login burst
+    When: POST /api/auth/login is called again for that email
+    Then: HTTP 429 is returned with a Retry-After header, while another
+        email from the same client is still served
+    """
+    for _ in range(settings.rate_limit_email_burst):
+        response = client.post(
+            "/api/auth/login",
+            json={"email": "victim@example.com", "password": "wrongpassword123"},
+        )
+        assert response.status_code == 401
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "victim@example.com", "password": "wrongpassword123"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "other@example.com", "password": "wrongpassword123"},
+    )
+    assert response.status_code == 401
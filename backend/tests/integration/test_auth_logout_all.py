@@ -0,0 +1,74 @@
+"""
+Integration tests for per-user token versioning ("log out everywhere").
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.auth.service import AuthService
+from app.auth.tokens import create_access_token
+from app.models import User
+
+CREDENTIALS = {"email": "sessions@example.com", "password": "securepassword123"}
+
+
+@pytest.fixture
+def tokens(client: TestClient) -> dict:
+    """Register and log in a user, returning the issued tokens."""
+    client.post("/api/auth/register", json=CREDENTIALS)
+    return client.post("/api/auth/login", json=CREDENTIALS).json()
+
+
+def test_logout_all_invalidates_outstanding_tokens(client: TestClient, db: Session, tokens: dict) -> None:
+    """Test that one version bump revokes access and refresh tokens.
+
+    Given: A logged in user holding an access and a refresh token
+    When: POST /api/auth/logout-all is called
+    Then: The old access token and refresh token are both rejected
+    """
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post("/api/auth/logout-all", headers=headers)
+
+    assert response.status_code == 200
+    assert db.query(User).filter(User.email == CREDENTIALS["email"]).one().token_version == 1
+
+    response = client.post("/api/auth/logout-all", headers=headers)
+    assert response.status_code == 401
+    assert "revoked" in response.json()["detail"].lower()
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_login_after_logout_all_issues_current_version(client: TestClient, tokens: dict) -> None:
+    """Test that tokens issued after the bump are accepted."""
+    client.post("/api/auth/logout-all", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    fresh = client.post("/api/auth/login", json=CREDENTIALS).json()
+    response = client.post("/api/auth/refresh", json={"refresh_token": fresh["refresh_token"]})
+
+    assert response.status_code == 200
+
+
+def test_cached_principal_checks_token_version(client: TestClient, db: Session, test_admin_user: User) -> None:
+    """Test that revocation applies on the cached-principal path.
+
+    Given: The default (stateful) principal mode with the admin's principal cached
+    When: The admin's sessions are revoked
+    Then: The old token is rejected and the cache is repopulated once
+    """
+    headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin', 0)}"}
+    assert client.get("/api/admin/status", headers=headers).status_code == 200
+
+    AuthService.revoke_all_sessions(test_admin_user.id, db)
+
+    assert client.get("/api/admin/status", headers=headers).status_code == 401
+    new_headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin', 1)}"}
+    assert client.get("/api/admin/status", headers=new_headers).status_code == 200
+
+
+def test_revoke_all_sessions_unknown_user(db: Session) -> None:
+    """Test that revoking sessions of a missing user fails."""
+    with pytest.raises(ValueError):
+        AuthService.revoke_all_sessions(999, db)
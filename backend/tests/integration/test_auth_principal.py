@@ -0,0 +1,183 @@
+"""
+Integration tests for the stateless principal fast path.
+"""
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.auth import deps
+from app.auth.principal import principal_cache
+from app.auth.service import AuthService
+from app.auth.tokens import create_access_token
+from app.core.settings import settings
+from app.models import User
+
+
+def test_admin_status_issues_no_queries(
+    client: TestClient, db: Session, test_admin_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that role checks in stateless mode do not touch the database.
+
+    Given: An admin token and stateless principal mode
+    When: GET /api/admin/status is called
+    Then: HTTP 200 is returned and no SQL statement is executed
+    """
+    monkeypatch.setattr(settings, "auth_stateless_principal", True)
+    token = create_access_token(user_id=test_admin_user.id, role="admin")
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.get(
+            "/api/admin/status",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_strict_mode_rejects_unknown_user(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that stateful mode still checks the users table.
+
+    Given: A validly signed admin token for a user id that does not exist
+    When: GET /api/admin/status is called with stateless mode disabled
+    Then: HTTP 401 is returned
+    """
+    monkeypatch.setattr(settings, "auth_stateless_principal", False)
+    token = create_access_token(user_id=999, role="admin")
+
+    response = client.get(
+        "/api/admin/status",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 401
+    assert "user not found" in response.json()["detail"].lower()
+
+
+def test_strict_mode_uses_database_role(client: TestClient, monkeypatch: pytest.MonkeyPatch, test_user: User) -> None:
+    """Test that stateful mode authorizes against the stored role.
+
+    Given: A token claiming admin for a user whose stored role is user
+    When: GET /api/admin/status is called with stateless mode disabled
+    Then: HTTP 403 is returned
+    """
+    monkeypatch.setattr(settings, "auth_stateless_principal", False)
+    token = create_access_token(user_id=test_user.id, role="admin")
+
+    response = client.get(
+        "/api/admin/status",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 403
+
+
+def test_strict_mode_caches_principal(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch, test_admin_user: User) -> None:
+    """Test that repeated requests are served from the principal cache.
+
+    Given: Stateful mode with the principal cache enabled
+    When: GET /api/admin/status is called twice with the same token
+    Then: Only the first request queries the users table
+    """
+    monkeypatch.setattr(settings, "auth_stateless_principal", False)
+    token = create_access_token(user_id=test_admin_user.id, role="admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        assert client.get("/api/admin/status", headers=headers).status_code == 200
+        first = len(statements)
+        assert client.get("/api/admin/status", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert first == 1
+    assert len(statements) == first
+    assert principal_cache.stats()["hits"] >= 1
+
+
+def test_role_change_invalidates_cached_principal(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch, test_admin_user: User) -> None:
+    """Test that a role change takes effect despite a cached principal.
+
+    Given: A cached admin principal
+    When: The user's role is changed to user through AuthService
+    Then: The next admin request is rejected with HTTP 403
+    """
+    monkeypatch.setattr(settings, "auth_stateless_principal", False)
+    token = create_access_token(user_id=test_admin_user.id, role="admin")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/admin/status", headers=headers).status_code == 200
+
+    AuthService.change_role(test_admin_user.id, "user", db)
+
+    assert client.get("/api/admin/status", headers=headers).status_code == 403
+
+
+def test_role_change_during_load_is_not_cached(client: TestClient, db: Session, monkeypatch: pytest.MonkeyPatch, test_admin_user: User) -> None:
+    """Test that a principal invalidated while it was loading is not cached.
+
+    Given: A principal cache miss whose users lookup races with a role change
+    When: The racing request finishes and the admin route is called again
+    Then: The stale admin principal was not cached and the next request gets 403
+    """
+    load_user = deps._load_user
+
+    def load_then_demote(principal, session):
+        user = load_user(principal, session)
+        # Row as read before the concurrent change commits
+        snapshot = SimpleNamespace(id=user.id, role=user.role, token_version=user.token_version, email=user.email)
+        AuthService.change_role(user.id, "user", db)
+        return snapshot
+
+    monkeypatch.setattr(deps, "_load_user", load_then_demote)
+    headers = {"Authorization": f"Bearer {create_access_token(user_id=test_admin_user.id, role='admin')}"}
+
+    assert client.get("/api/admin/status", headers=headers).status_code == 200
+    assert principal_cache.get(test_admin_user.id) is None
+
+    monkeypatch.setattr(deps, "_load_user", load_user)
+    assert client.get("/api/admin/status", headers=headers).status_code == 403
+
+
+def test_current_user_is_served_from_principal_cache(db: Session, monkeypatch: pytest.MonkeyPatch, test_user: User) -> None:
+    """Test that get_current_user checks the users table once per cached principal.
+
+    Given: Stateless principal mode, which get_current_user must ignore
+    When: get_current_user is called twice with the same token
+    Then: Only the first call opens a session, and a revoked token is rejected
+    """
+    monkeypatch.setattr(settings, "auth_stateless_principal", True)
+    header = f"Bearer {create_access_token(test_user.id, test_user.role, 0)}"
+    opened = []
+
+    def open_session():
+        opened.append(1)
+        return nullcontext(db)
+
+    assert deps.get_current_user(authorization=header, open_session=open_session).id == test_user.id
+    assert deps.get_current_user(authorization=header, open_session=open_session).email == test_user.email
+    assert len(opened) == 1
+
+    AuthService.revoke_all_sessions(test_user.id, db)
+    with pytest.raises(HTTPException) as excinfo:
+        deps.get_current_user(authorization=header, open_session=open_session)
+    assert excinfo.value.status_code == 401
@@ -0,0 +1,82 @@
+"""
+Integration tests for refresh token rotation and logout.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import RefreshToken
+
+
+@pytest.fixture
+def tokens(client: TestClient) -> dict:
+    """Register and log in a user, returning the issued tokens."""
+    credentials = {"email": "refresh@example.com", "password": "securepassword123"}
+    client.post("/api/auth/register", json=credentials)
+    response = client.post("/api/auth/login", json=credentials)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_refresh_rotates_tokens(client: TestClient, db: Session, tokens: dict) -> None:
+    """Test that a refresh token is exchanged for a new pair.
+
+    Given: A valid refresh token from login
+    When: POST /api/auth/refresh is called
+    Then: A new token pair is returned and the old refresh token is revoked
+    """
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refresh_token"] != tokens["refresh_token"]
+    assert data["token_type"] == "bearer"
+
+    rows = db.query(RefreshToken).order_by(RefreshToken.id).all()
+    assert [row.revoked for row in rows] == [True, False]
+
+
+def test_refresh_token_cannot_be_reused(client: TestClient, tokens: dict) -> None:
+    """Test that a rotated refresh token cannot be spent twice.
+
+    Given: A refresh token that was already rotated
+    When: POST /api/auth/refresh is called with it again
+    Then: HTTP 401 is returned
+    """
+    body = {"refresh_token": tokens["refresh_token"]}
+    assert client.post("/api/auth/refresh", json=body).status_code == 200
+
+    response = client.post("/api/auth/refresh", json=body)
+
+    assert response.status_code == 401
+    assert "invalid refresh token" in response.json()["detail"].lower()
+
+
+def test_refresh_rejects_access_token(client: TestClient, tokens: dict) -> None:
+    """Test that an access token cannot be used as a refresh token."""
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["access_token"]})
+
+    assert response.status_code == 401
+
+
+def test_logout_revokes_refresh_token(client: TestClient, tokens: dict) -> None:
+    """Test that logout revokes the refresh token.
+
+    Given: A valid refresh token
+    When: POST /api/auth/logout is called
+    Then: HTTP 200 is returned and the token can no longer be refreshed
+    """
+    body = {"refresh_token": tokens["refresh_token"]}
+
+    response = client.post("/api/auth/logout", json=body)
+
+    assert response.status_code == 200
+    assert response.json() == {"message": "logged out"}
+    assert client.post("/api/auth/refresh", json=body).status_code == 401
+
+
+def test_logout_with_invalid_token(client: TestClient) -> None:
+    """Test that logout rejects a malformed refresh token."""
+    response = client.post("/api/auth/logout", json={"refresh_token": "invalid.token.here"})
+
+    assert response.status_code == 401
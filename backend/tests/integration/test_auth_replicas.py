@@ -0,0 +1,84 @@
+"""
+Integration tests for read routing with a lagging read replica.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.auth.service import AuthService
+from app.auth.tokens import create_access_token
+from app.db import Base, replica_router
+from app.models import User
+
+CREDENTIALS = {"email": "replica@example.com", "password": "securepassword123"}
+
+
+@pytest.fixture
+def replica_engine(tmp_path):
+    """Engine of a replica file that has the schema but none of the primary's rows."""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def lagging_replica(replica_engine):
+    """Route reads to the replica for the duration of a test."""
+    replica_router.configure([str(replica_engine.url)])
+    yield replica_router.replicas[0]
+    replica_router.configure([])
+
+
+def test_login_authenticates_on_primary(client: TestClient, lagging_replica) -> None:
+    """Test that login never trusts a replica for credentials.
+
+    Given: A replica that has not caught up with a new registration
+    When: The user logs in
+    Then: Login succeeds and the replica is not read
+    """
+    client.post("/api/auth/register", json=CREDENTIALS)
+
+    response = client.post("/api/auth/login", json=CREDENTIALS)
+
+    assert response.status_code == 200
+    assert lagging_replica.reads == 0
+
+
+def test_revocation_is_not_hidden_by_replica_lag(
+    client: TestClient, db: Session, test_admin_user: User, replica_engine, lagging_replica
+) -> None:
+    """Test that logout-all takes effect while replicas still hold the old version.
+
+    Given: A replica still holding the admin's row from before logout-all
+    When: The admin's old access token is used on a role-protected route
+    Then: HTTP 401 is returned and the replica is not read
+    """
+    with replica_engine.begin() as conn:
+        conn.execute(insert(User.__table__).values(
+            id=test_admin_user.id,
+            email=test_admin_user.email,
+            hashed_password=test_admin_user.hashed_password,
+            role="admin",
+            token_version=0,
+        ))
+    headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin', 0)}"}
+
+    AuthService.revoke_all_sessions(test_admin_user.id, db)
+    response = client.get("/api/admin/status", headers=headers)
+
+    assert response.status_code == 401
+    assert lagging_replica.reads == 0
+
+
+def test_admin_listing_reads_replica(client: TestClient, test_admin_user: User, lagging_replica) -> None:
+    """Test that reads that tolerate lag are still served by replicas."""
+    headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin')}"}
+
+    response = client.get("/api/admin/users", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["users"] == []
+    assert lagging_replica.reads == 1
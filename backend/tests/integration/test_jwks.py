@@ -0,0 +1,76 @@
+"""
+Integration tests for asymmetric tokens and the JWKS endpoint.
+"""
+import base64
+import json
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from fastapi.testclient import TestClient
+
+from app.auth.keys import generate_key, key_ring
+from app.core.settings import settings
+
+CREDENTIALS = {"email": "jwks@example.com", "password": "securepassword123"}
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+@pytest.fixture
+def asymmetric_keys(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """Sign tokens with an Ed25519 key from a temporary key directory."""
+    generate_key(str(tmp_path), "EdDSA", kid="k1")
+    monkeypatch.setattr(settings, "jwt_codec", "asymmetric")
+    monkeypatch.setattr(settings, "jwt_keys_dir", str(tmp_path))
+    key_ring.configure(str(tmp_path))
+    yield tmp_path
+    monkeypatch.undo()
+    key_ring.configure(settings.jwt_keys_dir, settings.jwt_signing_kid)
+
+
+def test_tokens_verify_against_published_jwks(client: TestClient, asymmetric_keys) -> None:
+    """Test that another service can verify access tokens from the JWKS alone.
+
+    Given: The asymmetric codec and a registered user
+    When: The user logs in and the JWKS is fetched
+    Then: The access token's signature verifies with the published key and
+        the token authenticates against this backend too
+    """
+    client.post("/api/auth/register", json=CREDENTIALS)
+    access_token = client.post("/api/auth/login", json=CREDENTIALS).json()["access_token"]
+
+    jwks = client.get("/.well-known/jwks.json").json()
+    header_segment, payload_segment, signature = access_token.split(".")
+    header = json.loads(_b64decode(header_segment))
+    jwk = next(key for key in jwks["keys"] if key["kid"] == header["kid"])
+    public_key = ed25519.Ed25519PublicKey.from_public_bytes(_b64decode(jwk["x"]))
+    public_key.verify(_b64decode(signature), f"{header_segment}.{payload_segment}".encode("ascii"))
+
+    assert header["alg"] == jwk["alg"] == "EdDSA"
+    response = client.post("/api/auth/logout-all", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+
+
+def test_jwks_is_cacheable(client: TestClient, asymmetric_keys) -> None:
+    """Test ETag revalidation and that a new key changes the ETag.
+
+    Given: A fetched JWKS and its ETag
+    When: It is revalidated before and after adding a key
+    Then: The first revalidation is 304, the second returns both keys
+    """
+    response = client.get("/.well-known/jwks.json")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == f"public, max-age={settings.jwks_max_age_seconds}"
+
+    for if_none_match in (etag, f'"other", W/{etag}', "*"):
+        revalidated = client.get("/.well-known/jwks.json", headers={"If-None-Match": if_none_match})
+        assert revalidated.status_code == 304
+
+    generate_key(str(asymmetric_keys), "ES256", kid="k2")
+    key_ring.refresh(max_age=0)
+    response = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert [key["kid"] for key in response.json()["keys"]] == ["k1", "k2"]
@@ -0,0 +1,63 @@
+"""
+Integration tests for the Prometheus metrics endpoint.
+"""
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+CREDENTIALS = {"email": "metrics@example.com", "password": "securepassword123"}
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_login_outcomes_are_counted(client: TestClient) -> None:
+    """Test login counters, refresh issue counts and auth timings.
+
+    Given: A registered user
+    When: The user logs in once successfully and once with a wrong password
+    Then: Success, failure and refresh-token counters each grow by one, and
+        the per-route statement histogram records the login queries
+    """
+    client.post("/api/auth/register", json=CREDENTIALS)
+    before = {
+        "success": _sample("auth_login_total", result="success"),
+        "failure": _sample("auth_login_total", result="failure"),
+        "issued": _sample("auth_refresh_tokens_issued_total"),
+        "verify": _sample("auth_operation_duration_seconds_count", operation="verify_password"),
+        "statements": _sample("db_statements_per_request_sum", route="/api/auth/login"),
+    }
+
+    client.post("/api/auth/login", json=CREDENTIALS)
+    client.post("/api/auth/login", json={**CREDENTIALS, "password": "wrongpassword123"})
+
+    assert _sample("auth_login_total", result="success") == before["success"] + 1
+    assert _sample("auth_login_total", result="failure") == before["failure"] + 1
+    assert _sample("auth_refresh_tokens_issued_total") == before["issued"] + 1
+    assert (
+        _sample("auth_operation_duration_seconds_count", operation="verify_password")
+        == before["verify"] + 2
+    )
+    # SELECT + INSERT for the success, SELECT for the failure
+    assert _sample("db_statements_per_request_sum", route="/api/auth/login") == before["statements"] + 3
+
+
+def test_requests_are_labelled_by_route_template(client: TestClient) -> None:
+    """Test that latency is recorded per route template, not raw path.
+
+    Given: The running app
+    When: A known route and an unknown path are requested
+    Then: /metrics exposes histograms for the route and the "unmatched" bucket
+    """
+    client.get("/health")
+    client.get("/no/such/path/12345")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "/no/such/path/12345" not in body
+    assert "http_requests_in_progress" in body
@@ -0,0 +1,91 @@
+"""
+Integration tests for request profiling and the admin profile endpoints.
+"""
+from contextlib import nullcontext
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.auth.tokens import create_access_token
+from app.core.profiling import profile_store
+from app.core.settings import settings
+from app.db import get_db, get_session_scope
+from app.main import create_app
+from app.models import User
+
+CREDENTIALS = {"email": "profiled@example.com", "password": "securepassword123"}
+
+
+@pytest.fixture
+def make_client(db: Session, tmp_path, monkeypatch):
+    """Build a client for an app created with profiling enabled."""
+    monkeypatch.setattr(settings, "profiling_enabled", True)
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+
+    def factory(sample_rate: float, slow_threshold_ms: float) -> TestClient:
+        monkeypatch.setattr(settings, "profiling_sample_rate", sample_rate)
+        monkeypatch.setattr(settings, "profiling_slow_threshold_ms", slow_threshold_ms)
+        app = create_app()
+        app.dependency_overrides[get_db] = lambda: db
+        app.dependency_overrides[get_session_scope] = lambda: lambda: nullcontext(db)
+        return TestClient(app)
+
+    return factory
+
+
+def _admin_headers(admin: User) -> dict:
+    token = create_access_token(user_id=admin.id, role="admin")
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_slow_login_profile_is_listed_and_fetched(
+    make_client, test_admin_user: User, monkeypatch
+) -> None:
+    """Test that a request over the threshold is saved with its breakdown.
+
+    Given: Profiling with a threshold below the cost of a bcrypt login
+    When: A user logs in and an admin lists and fetches profiles
+    Then: The login profile shows hashing time and bcrypt stack samples
+    """
+    # The test profile hashes at minimum cost; this test needs a slow hash
+    monkeypatch.setattr(settings, "bcrypt_rounds", 12)
+    client = make_client(sample_rate=0.0, slow_threshold_ms=50)
+    client.post("/api/auth/register", json=CREDENTIALS)
+    client.post("/api/auth/login", json=CREDENTIALS)
+    headers = _admin_headers(test_admin_user)
+
+    listing = client.get("/api/admin/profiles", headers=headers).json()["profiles"]
+
+    assert [p["path"] for p in listing] == ["/api/auth/login", "/api/auth/register"]
+    login = listing[0]
+    assert login["status"] == 200
+    assert login["breakdown_ms"]["security"] > 0
+    assert login["breakdown_ms"]["sqlalchemy"] > 0
+    assert login["breakdown_ms"]["tokens"] > 0
+
+    profile = client.get(f"/api/admin/profiles/{login['id']}", headers=headers).json()
+    assert "app.auth.security:_checkpw" in profile["collapsed"]
+
+
+def test_fast_requests_are_not_kept(make_client, test_admin_user: User) -> None:
+    """Test that requests under the threshold leave no profile behind."""
+    client = make_client(sample_rate=0.0, slow_threshold_ms=60000)
+    headers = _admin_headers(test_admin_user)
+
+    client.get("/health")
+
+    assert client.get("/api/admin/profiles", headers=headers).json() == {"profiles": []}
+    response = client.get("/api/admin/profiles/123-deadbeef", headers=headers)
+    assert response.status_code == 404
+
+
+def test_profiles_require_admin(make_client, test_user: User) -> None:
+    """Test that non-admin callers cannot read profiles."""
+    client = make_client(sample_rate=1.0, slow_threshold_ms=0)
+    token = create_access_token(user_id=test_user.id, role="user")
+
+    response = client.get("/api/admin/profiles", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 403
@@ -0,0 +1,72 @@
+"""
+Integration tests for startup warm-up and the readiness endpoint.
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import tokens
+from app.auth.keys import key_ring
+from app.core.settings import settings
+from app.main import create_app
+
+
+@pytest.fixture
+def startup_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run the startup hooks without touching the configured database."""
+    monkeypatch.setattr(settings, "db_create_schema", False)
+    monkeypatch.setattr(settings, "warmup_db_connections", 0)
+
+
+def test_not_ready_before_startup() -> None:
+    """Test that /ready fails until startup has run, while /health passes."""
+    client = TestClient(create_app())
+
+    assert client.get("/health").status_code == 200
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "starting"}
+
+
+def test_ready_after_warm_up(startup_settings, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that readiness flips once the warm-up has primed the codec.
+
+    Given: An app whose startup hooks run
+    When: /ready is polled
+    Then: It returns 200 after a sign/verify round trip has been made
+    """
+    warmed = []
+    warm_codec = tokens.warm_codec
+    monkeypatch.setattr("app.main.warm_codec", lambda: warmed.append(warm_codec()))
+
+    with TestClient(create_app()) as client:
+        deadline = time.monotonic() + 5
+        response = client.get("/ready")
+        while response.status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            response = client.get("/ready")
+
+    assert response.json() == {"status": "ready"}
+    assert warmed == [None]
+
+
+def test_warm_up_can_be_disabled(startup_settings, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that without warm-up the app is ready as soon as startup ends."""
+    monkeypatch.setattr(settings, "warmup_enabled", False)
+
+    with TestClient(create_app()) as client:
+        assert client.get("/ready").status_code == 200
+
+
+def test_symmetric_codec_skips_key_ring(startup_settings, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that startup only loads signing keys for the asymmetric codec."""
+    monkeypatch.setattr(settings, "warmup_enabled", False)
+    monkeypatch.setattr(settings, "jwt_codec", "fast")
+    loads = []
+    monkeypatch.setattr(key_ring, "refresh", lambda max_age=None: loads.append(max_age))
+
+    with TestClient(create_app()) as client:
+        assert client.get("/ready").status_code == 200
+
+    assert loads == []
@@ -0,0 +1,56 @@
+"""
+Integration tests for the refresh token purge job.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.auth.janitor import purge_refresh_tokens
+from app.models import RefreshToken, User
+
+
+def _add_token(db: Session, user: User, jti: str, expires_in: timedelta, revoked: bool = False) -> None:
+    """Insert a refresh token row."""
+    db.add(
+        RefreshToken(
+            jti=jti,
+            user_id=user.id,
+            revoked=revoked,
+            expires_at=datetime.utcnow() + expires_in,
+        )
+    )
+    db.commit()
+
+
+def test_purge_deletes_expired_and_revoked_rows(db: Session, test_user: User) -> None:
+    """Test that only live refresh tokens survive a purge.
+
+    Given: Three expired, two revoked and one live refresh token
+    When: The purge runs with a batch size of two
+    Then: Five rows are deleted across batches and the live token remains
+    """
+    for i in range(3):
+        _add_token(db, test_user, f"expired-{i}", timedelta(days=-1))
+    for i in range(2):
+        _add_token(db, test_user, f"revoked-{i}", timedelta(days=1), revoked=True)
+    _add_token(db, test_user, "live", timedelta(days=1))
+
+    result = purge_refresh_tokens(db, batch_size=2, pause_seconds=0)
+
+    assert result.expired == 3
+    assert result.revoked == 2
+    assert result.rows_purged == 5
+    assert result.batches == 3
+    assert result.duration_seconds >= 0
+    assert [row.jti for row in db.query(RefreshToken).all()] == ["live"]
+
+
+def test_purge_with_nothing_to_delete(db: Session, test_user: User) -> None:
+    """Test that a purge over live tokens deletes nothing."""
+    _add_token(db, test_user, "live", timedelta(days=1))
+
+    result = purge_refresh_tokens(db, batch_size=10, pause_seconds=0)
+
+    assert result.rows_purged == 0
+    assert result.batches == 0
+    assert db.query(RefreshToken).count() == 1
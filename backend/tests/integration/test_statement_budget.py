@@ -0,0 +1,102 @@
+"""
+Statement budgets for the auth endpoints.
+
+Each endpoint is pinned to the SQL statements and commits it may issue, so
+an extra refresh, lookup or flush shows up as a test failure.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.tokens import create_access_token
+from app.core.settings import settings
+from app.core.statements import count_statements
+from app.models import User
+
+CREDENTIALS = {"email": "budget@example.com", "password": "securepassword123"}
+
+
+def _register(client: TestClient, tokens: dict):
+    return client.post("/api/auth/register", json={**CREDENTIALS, "email": "new@example.com"})
+
+
+def _login(client: TestClient, tokens: dict):
+    return client.post("/api/auth/login", json=CREDENTIALS)
+
+
+def _failed_login(client: TestClient, tokens: dict):
+    return client.post("/api/auth/login", json={**CREDENTIALS, "password": "wrongpassword123"})
+
+
+def _refresh(client: TestClient, tokens: dict):
+    return client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+
+def _logout(client: TestClient, tokens: dict):
+    return client.post("/api/auth/logout", json={"refresh_token": tokens["refresh_token"]})
+
+
+def _logout_all(client: TestClient, tokens: dict):
+    return client.post("/api/auth/logout-all", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+
+@pytest.mark.parametrize(
+    "request_fn,status_code,statements,commits",
+    [
+        # INSERT ... RETURNING id, created_at; no refresh SELECT
+        (_register, 201, 1, 1),
+        # SELECT user, INSERT refresh token
+        (_login, 200, 2, 1),
+        (_failed_login, 401, 1, 0),
+        # UPDATE ... RETURNING user_id, SELECT user, INSERT refresh token
+        (_refresh, 200, 3, 1),
+        (_logout, 200, 1, 1),
+        # Conditional UPDATE checks the token version and revokes at once
+        (_logout_all, 200, 1, 1),
+    ],
+    ids=["register", "login", "failed_login", "refresh", "logout", "logout_all"],
+)
+def test_endpoint_statement_budget(client: TestClient, request_fn, status_code: int, statements: int, commits: int) -> None:
+    """Test that each endpoint stays within its statement budget.
+
+    Given: A registered user holding a token pair
+    When: The endpoint is called
+    Then: It issues exactly the budgeted statements in at most one transaction
+    """
+    client.post("/api/auth/register", json=CREDENTIALS)
+    tokens = client.post("/api/auth/login", json=CREDENTIALS).json()
+
+    with count_statements(keep_sql=True) as count:
+        response = request_fn(client, tokens)
+
+    assert response.status_code == status_code
+    assert (count.statements, count.commits) == (statements, commits), count
+
+
+def test_stateless_admin_check_runs_no_sql(
+    client: TestClient, test_admin_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a role check from token claims never touches the database."""
+    monkeypatch.setattr(settings, "auth_stateless_principal", True)
+    headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin')}"}
+
+    with count_statements() as count:
+        assert client.get("/api/admin/status", headers=headers).status_code == 200
+
+    assert count.statements == 0
+
+
+def test_cached_admin_check_runs_no_sql(client: TestClient, test_admin_user: User) -> None:
+    """Test that the default users-table check costs nothing on a principal cache hit.
+
+    Given: The default stateful principal mode and an admin token
+    When: GET /api/admin/status is called twice
+    Then: The first call runs one SELECT and the second none
+    """
+    headers = {"Authorization": f"Bearer {create_access_token(test_admin_user.id, 'admin')}"}
+
+    with count_statements() as first:
+        assert client.get("/api/admin/status", headers=headers).status_code == 200
+    with count_statements() as second:
+        assert client.get("/api/admin/status", headers=headers).status_code == 200
+
+    assert (first.statements, second.statements) == (1, 0)
@@ -0,0 +1,62 @@
+"""
+Integration tests for the bulk user import.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy.orm import Session
+
+from app.auth.importer import UserImporter, read_rows
+from app.auth.security import verify_password
+from app.models import User
+
+
+def test_import_reports_rejected_rows_without_aborting(db: Session, session_factory, test_user: User, tmp_path) -> None:
+    """Test a CSV import with existing, repeated and invalid emails.
+
+    Given: A file with two new users, an already registered email, an email
+        repeated in the file and a row with a short password
+    When: It is imported with small batches on a process pool
+    Then: The new users are inserted with working hashes and every other row
+        is reported with its line number
+    """
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "email,password,role\n"
+        "new1@example.com,password-one,\n"
+        "TEST@example.com,password-two,\n"
+        "new2@example.com,password-three,admin\n"
+        "new1@example.com,password-four,\n"
+        "bad@example.com,short,\n",
+        encoding="utf-8",
+    )
+    rejected = []
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        importer = UserImporter(
+            session_factory,
+            executor,
+            batch_size=2,
+            on_reject=lambda line, email, reason: rejected.append((line, email)),
+        )
+        result = importer.run(read_rows(str(path)))
+
+    assert (result.rows, result.imported, result.duplicates, result.invalid) == (5, 2, 2, 1)
+    assert sorted(rejected) == [(3, "test@example.com"), (5, "new1@example.com"), (6, "bad@example.com")]
+    new2 = db.query(User).filter(User.email == "new2@example.com").one()
+    assert new2.role == "admin"
+    assert verify_password("password-three", new2.hashed_password)
+
+
+def test_read_rows_jsonl(tmp_path) -> None:
+    """Test that JSON Lines input is streamed with line numbers."""
+    path = tmp_path / "users.jsonl"
+    path.write_text(
+        json.dumps({"email": "a@example.com", "password": "password-a"}) + "\n\nnot json\n",
+        encoding="utf-8",
+    )
+
+    assert list(read_rows(str(path))) == [
+        (1, {"email": "a@example.com", "password": "password-a"}),
+        (3, {}),
+    ]
@@ -0,0 +1,93 @@
+"""
+Unit tests for hashing admission control.
+"""
+import asyncio
+
+import pytest
+
+from app.auth.admission import AdmissionLimiter, OverloadedError
+
+
+@pytest.mark.asyncio
+async def test_admits_up_to_max_concurrent() -> None:
+    """Test that free slots are granted immediately."""
+    limiter = AdmissionLimiter(max_concurrent=2, max_queue=0, queue_timeout=0.1)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert limiter.active == 2
+    assert limiter.admitted == 2
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_is_full() -> None:
+    """Test that requests beyond slots and queue fail fast.
+
+    Given: A limiter with one slot in use and no queue capacity
+    When: Another request tries to acquire
+    Then: OverloadedError is raised with the Retry-After hint
+    """
+    limiter = AdmissionLimiter(max_concurrent=1, max_queue=0, queue_timeout=1.0, retry_after=3)
+    await limiter.acquire()
+
+    with pytest.raises(OverloadedError) as exc_info:
+        await limiter.acquire()
+
+    assert exc_info.value.retry_after == 3
+    assert limiter.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_sheds_after_queue_timeout() -> None:
+    """Test that queued requests are shed once the queue timeout elapses."""
+    limiter = AdmissionLimiter(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    await limiter.acquire()
+
+    with pytest.raises(OverloadedError):
+        await limiter.acquire()
+
+    assert limiter.queued == 1
+    assert limiter.shed == 1
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_release_hands_slot_to_waiter() -> None:
+    """Test that a released slot goes to the oldest waiter.
+
+    Given: A full limiter with one queued request
+    When: The holder releases its slot
+    Then: The waiter is admitted and the active count is unchanged
+    """
+    limiter = AdmissionLimiter(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+    await limiter.acquire()
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+
+    limiter.release()
+    await waiter
+
+    assert limiter.active == 1
+    assert limiter.admitted == 2
+    assert limiter.waiting == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_try_acquire_never_waits() -> None:
+    """Test that try_acquire takes a free slot or fails at once."""
+    limiter = AdmissionLimiter(max_concurrent=1, max_queue=0, queue_timeout=1.0)
+
+    assert limiter.try_acquire() is True
+    assert limiter.busy
+    assert limiter.try_acquire() is False
+    assert limiter.shed == 1
+
+    limiter.release()
+    assert not limiter.busy
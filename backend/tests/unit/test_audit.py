@@ -0,0 +1,112 @@
+"""
+Unit tests for the batched audit log writer.
+"""
+import threading
+import time
+
+from app.auth.audit import LOGIN, AuditLog
+
+
+class RecordingSession:
+    """Session stand-in that records each inserted batch."""
+
+    def __init__(self, batches: list, gate: threading.Event) -> None:
+        self.batches = batches
+        self.gate = gate
+
+    def execute(self, stmt, rows) -> None:
+        self.gate.wait(5)
+        self.batches.append(list(rows))
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def make_log(**options):
+    """Build an AuditLog over a RecordingSession; returns (log, batches, gate)."""
+    batches: list = []
+    gate = threading.Event()
+    gate.set()
+    log = AuditLog(lambda: RecordingSession(batches, gate), **options)
+    return log, batches, gate
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_full_batch_is_written_in_one_insert() -> None:
+    """Test the size threshold.
+
+    Given: A batch size of 3 and a long flush interval
+    When: 7 events are recorded
+    Then: Two full batches are written right away and the remainder waits
+    """
+    log, batches, _ = make_log(batch_size=3, flush_interval=60)
+    for user_id in range(7):
+        log.record(LOGIN, user_id=user_id)
+
+    assert wait_for(lambda: len(batches) == 2)
+    assert [len(batch) for batch in batches] == [3, 3]
+    assert log.stats()["queued"] == 1
+    log.close()
+
+
+def test_partial_batch_is_written_after_interval() -> None:
+    """Test the time threshold."""
+    log, batches, _ = make_log(batch_size=100, flush_interval=0.05)
+    log.record(LOGIN, user_id=1, email="Alice@Example.com", ip="10.0.0.1")
+
+    assert wait_for(lambda: len(batches) == 1)
+    assert batches[0][0]["email"] == "alice@example.com"
+    assert batches[0][0]["ip"] == "10.0.0.1"
+    log.close()
+
+
+def test_full_queue_waits_then_drops() -> None:
+    """Test backpressure while the writer is stuck.
+
+    Given: A writer blocked on its first batch and a queue of 2 events
+    When: More events are recorded than fit
+    Then: Producers wait out the enqueue timeout, excess events are dropped
+        and counted, and the queued ones are written once the writer resumes
+    """
+    log, batches, gate = make_log(batch_size=1, flush_interval=60, max_queue=2, enqueue_timeout=0.05)
+    gate.clear()
+    log.record(LOGIN, user_id=0)
+    assert wait_for(lambda: log.stats()["queued"] == 0)  # taken by the writer
+
+    started = time.monotonic()
+    for user_id in range(1, 5):
+        log.record(LOGIN, user_id=user_id)
+
+    assert time.monotonic() - started >= 0.1
+    assert log.stats()["dropped"] == 2
+    gate.set()
+    assert log.flush()
+    assert [batch[0]["user_id"] for batch in batches] == [0, 1, 2]
+    log.close()
+
+
+def test_close_drains_queue() -> None:
+    """Test that shutdown writes every queued event."""
+    log, batches, _ = make_log(batch_size=100, flush_interval=60)
+    for user_id in range(5):
+        log.record(LOGIN, user_id=user_id)
+
+    log.close()
+
+    assert sum(len(batch) for batch in batches) == 5
+    assert log.stats()["queued"] == 0
+    assert log.stats()["written"] == 5
@@ -0,0 +1,99 @@
+"""
+Unit tests for the TTL/LRU cache.
+"""
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list:
+    """Replace the cache clock with a controllable one."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_and_miss_counters() -> None:
+    """Test that lookups are counted as hits or misses."""
+    cache: TTLCache[str] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", "alpha")
+
+    assert cache.get("a") == "alpha"
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entry is evicted when full.
+
+    Given: A full cache of two entries where "a" was read most recently
+    When: A third entry is stored
+    Then: "b" is evicted and "a" survives
+    """
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_entries_expire(clock: list) -> None:
+    """Test that entries are never served past their TTL."""
+    cache: TTLCache[int] = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+
+    clock[0] += 10
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    clock[0] += 30
+    assert cache.get("a") is None
+    assert cache.expirations == 2
+
+
+def test_per_entry_ttl_is_capped(clock: list) -> None:
+    """Test that a per-entry TTL cannot outlive the cache default."""
+    cache: TTLCache[int] = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1, ttl=3600)
+
+    clock[0] += 31
+    assert cache.get("a") is None
+
+
+def test_invalidate() -> None:
+    """Test that invalidation drops the entry and is counted."""
+    cache: TTLCache[int] = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+
+    assert cache.get("a") is None
+    assert cache.invalidations == 1
+
+
+def test_set_after_invalidation_is_dropped() -> None:
+    """Test that a value loaded before an invalidation is not cached.
+
+    Given: A generation taken before loading a value
+    When: The key is invalidated before the loaded value is stored
+    Then: The value is dropped, while a load started afterwards is stored
+    """
+    cache: TTLCache[str] = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+    assert cache.stats()["stale_sets"] == 1
+
+    cache.set("a", "fresh", generation=cache.generation())
+    assert cache.get("a") == "fresh"
@@ -0,0 +1,122 @@
+"""
+Unit tests for the engine factory, SQLite pragmas, pool warm-up and
+statistics, and the lazily bound session factory.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.settings import settings
+from app.db.engine import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    engine_options,
+    install_sqlite_pragmas,
+    pool_stats,
+    warm_pool,
+)
+from app.db.database import LazySessionmaker
+
+
+def test_sqlite_file_defaults() -> None:
+    """Test that file-backed SQLite gets a small timed queue pool."""
+    options = engine_options("sqlite:///./app.db")
+
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 5
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {"check_same_thread": False}
+
+
+def test_sqlite_memory_keeps_default_pool() -> None:
+    """Test that in-memory SQLite is left on SQLAlchemy's own pool."""
+    options = engine_options("sqlite://")
+
+    assert "poolclass" not in options
+    assert "pool_size" not in options
+
+
+def test_server_backend_defaults_and_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test per-backend defaults and explicit settings for server databases."""
+    options = engine_options("postgresql+asyncpg://user@db/app", is_async=True)
+    assert options["poolclass"] is TimedAsyncQueuePool
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 1800
+    assert "connect_args" not in options
+
+    monkeypatch.setattr(settings, "db_pool_size", 42)
+    monkeypatch.setattr(settings, "db_pool_pre_ping", False)
+    options = engine_options("postgresql://user@db/app")
+    assert options["pool_size"] == 42
+    assert options["pool_pre_ping"] is False
+
+
+def test_pragmas_applied_on_connect(tmp_path) -> None:
+    """Test that every new SQLite connection gets the configured pragmas.
+
+    Given: A file-backed SQLite engine with pragmas installed
+    When: A connection is opened
+    Then: WAL journaling, NORMAL sync and the busy timeout are in effect
+    """
+    url = f"sqlite:///{tmp_path / 'pragmas.db'}"
+    engine = create_engine(url, **engine_options(url))
+    install_sqlite_pragmas(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+
+    engine.dispose()
+
+
+def test_pool_stats(tmp_path) -> None:
+    """Test that pool statistics report checkouts and wait times."""
+    url = f"sqlite:///{tmp_path / 'stats.db'}"
+    engine = create_engine(url, **engine_options(url))
+
+    with engine.connect():
+        stats = pool_stats(engine)
+        assert stats["checkedout"] == 1
+
+    stats = pool_stats(engine)
+    assert stats["pool"] == "TimedQueuePool"
+    assert stats["checkedout"] == 0
+    assert stats["overflow"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["wait_seconds_max"] >= 0
+    engine.dispose()
+
+
+def test_warm_pool_leaves_connections_idle(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that warm-up opens distinct connections and returns them.
+
+    Given: A file-backed SQLite engine with a pool of two
+    When: Three connections are warmed
+    Then: Two (the pool size) are opened and left checked in
+    """
+    monkeypatch.setattr(settings, "db_pool_size", 2)
+    url = f"sqlite:///{tmp_path / 'warm.db'}"
+    engine = create_engine(url, **engine_options(url))
+
+    assert warm_pool(engine, 3) == 2
+
+    stats = pool_stats(engine)
+    assert stats["checkedin"] == 2
+    assert stats["checkedout"] == 0
+    engine.dispose()
+
+
+def test_lazy_sessionmaker_binds_on_first_session() -> None:
+    """Test that the engine is only requested when a session is opened."""
+    engines = []
+
+    def get_bind():
+        engines.append(create_engine("sqlite://"))
+        return engines[-1]
+
+    factory = LazySessionmaker(get_bind, autoflush=False)
+    assert engines == []
+
+    with factory() as first, factory() as second:
+        assert first.get_bind() is second.get_bind() is engines[0]
+    assert len(engines) == 1
@@ -0,0 +1,93 @@
+"""
+Unit tests for the asymmetric signing key ring and codec.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from app.auth.keys import KeyRing, generate_key, retire_key
+from app.auth.tokens import AsymmetricCodec, FastHS256Codec, TokenError, _b64encode
+
+
+def _claims(**overrides) -> dict:
+    now = int(time.time())
+    claims = {"sub": "1", "role": "user", "ver": 0, "exp": now + 60, "iat": now}
+    claims.update(overrides)
+    return claims
+
+
+def _ring(directory) -> KeyRing:
+    # reload_seconds=0: every call re-checks the directory
+    return KeyRing(str(directory), reload_seconds=0)
+
+
+@pytest.mark.parametrize("alg", ["EdDSA", "ES256"])
+def test_asymmetric_round_trip(tmp_path, alg: str) -> None:
+    """Test signing and verifying with each supported algorithm.
+
+    Given: A key ring with one private key
+    When: Claims are encoded and decoded
+    Then: The claims round-trip and the token carries the key's kid and alg
+    """
+    generate_key(str(tmp_path), alg, kid="k1")
+    codec = AsymmetricCodec("secret", _ring(tmp_path))
+
+    token = codec.encode(_claims())
+
+    assert codec.decode(token) == _claims()
+    assert codec._header(token.split(".")[0]) == {"alg": alg, "kid": "k1", "typ": "JWT"}
+
+
+def test_rotation_without_restart(tmp_path) -> None:
+    """Test that new keys are picked up and retired keys still verify.
+
+    Given: Tokens signed with key "2024-01"
+    When: Key "2024-02" is added and "2024-01" is reduced to its public half
+    Then: New tokens use "2024-02" and old tokens still verify
+    """
+    generate_key(str(tmp_path), "EdDSA", kid="2024-01")
+    codec = AsymmetricCodec("secret", _ring(tmp_path))
+    old_token = codec.encode(_claims())
+
+    generate_key(str(tmp_path), "ES256", kid="2024-02")
+    retire_key(os.path.join(tmp_path, "2024-01.pem"))
+    new_token = codec.encode(_claims())
+
+    assert codec._header(new_token.split(".")[0])["kid"] == "2024-02"
+    assert codec.decode(old_token)["sub"] == "1"
+    assert codec.decode(new_token)["sub"] == "1"
+    assert [key["kid"] for key in json.loads(codec.ring.jwks()[0])["keys"]] == ["2024-01", "2024-02"]
+
+
+@pytest.mark.parametrize("accept_hs256", [True, False])
+def test_legacy_hs256_tokens(tmp_path, accept_hs256: bool) -> None:
+    """Test that HS256 tokens are accepted only when enabled."""
+    generate_key(str(tmp_path), "EdDSA", kid="k1")
+    codec = AsymmetricCodec("secret", _ring(tmp_path), accept_hs256=accept_hs256)
+    token = FastHS256Codec("secret").encode(_claims())
+
+    if accept_hs256:
+        assert codec.decode(token) == _claims()
+    else:
+        with pytest.raises(TokenError):
+            codec.decode(token)
+
+
+def test_rejects_unknown_kid_and_alg_mismatch(tmp_path) -> None:
+    """Test that a token cannot choose an unknown key or a different alg.
+
+    Given: A token re-headed with an unknown kid, and one claiming ES256
+        for an Ed25519 key
+    When: Both are decoded
+    Then: Both are rejected
+    """
+    generate_key(str(tmp_path), "EdDSA", kid="k1")
+    codec = AsymmetricCodec("secret", _ring(tmp_path))
+    _, payload, signature = codec.encode(_claims()).split(".")
+
+    for header in (b'{"alg":"EdDSA","kid":"k9","typ":"JWT"}', b'{"alg":"ES256","kid":"k1","typ":"JWT"}'):
+        forged = ".".join([_b64encode(header).decode("ascii"), payload, signature])
+        with pytest.raises(TokenError):
+            codec.decode(forged)
@@ -0,0 +1,28 @@
+"""
+Unit tests for building principals from token claims.
+"""
+import pytest
+
+from app.auth.principal import Principal
+
+
+def test_from_claims() -> None:
+    """Test that subject, role and version claims are mapped."""
+    principal = Principal.from_claims({"sub": "42", "role": "admin", "ver": 3})
+
+    assert principal == Principal(id=42, role="admin", token_version=3)
+
+
+def test_from_claims_defaults_token_version() -> None:
+    """Test that tokens without a version claim map to version 0."""
+    assert Principal.from_claims({"sub": "1", "role": "user"}).token_version == 0
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"role": "user"}, {"sub": "1"}, {"sub": "abc", "role": "user"}],
+)
+def test_from_claims_rejects_bad_claims(payload: dict) -> None:
+    """Test that missing or malformed claims are rejected."""
+    with pytest.raises(ValueError):
+        Principal.from_claims(payload)
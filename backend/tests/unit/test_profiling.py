@@ -0,0 +1,56 @@
+"""
+Unit tests for profile storage and breakdown sections.
+"""
+import sys
+
+from app.core.profiling import ProfileStore, RequestProfile, _current, section
+
+
+def _profile(path: str = "/x") -> RequestProfile:
+    return RequestProfile("GET", path, sys._getframe())
+
+
+def test_section_records_only_inside_a_profile() -> None:
+    """Test that sections add time to the active profile and are no-ops otherwise."""
+    with section("tokens"):
+        pass
+
+    profile = _profile()
+    token = _current.set(profile)
+    try:
+        with section("tokens"):
+            sum(range(1000))
+    finally:
+        _current.reset(token)
+
+    assert profile.sections["tokens"] > 0
+    assert profile.sections["security"] == 0
+
+
+def test_store_keeps_most_recent_profiles(tmp_path) -> None:
+    """Test saving, pruning, listing order and fetching with stacks.
+
+    Given: A store limited to two profiles
+    When: Three profiles are saved
+    Then: Only the newest two remain, listed newest first
+    """
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    profiles = []
+    for index in range(3):
+        profile = _profile(f"/p{index}")
+        profile.id = f"{1000 + index}-0000000{index}"
+        profile.stacks[("app.main:handler", "app.auth.security:_checkpw")] = 3
+        store.save(profile)
+        profiles.append(profile)
+
+    assert [p["path"] for p in store.list()] == ["/p2", "/p1"]
+    fetched = store.get(profiles[2].id)
+    assert fetched["collapsed"] == "app.main:handler;app.auth.security:_checkpw 3\n"
+    assert store.get(profiles[0].id) is None
+
+
+def test_store_rejects_path_like_ids(tmp_path) -> None:
+    """Test that profile ids cannot escape the profile directory."""
+    store = ProfileStore(str(tmp_path), max_profiles=10)
+
+    assert store.get("../../etc/passwd") is None
@@ -0,0 +1,44 @@
+"""
+Unit tests for client address resolution behind reverse proxies.
+"""
+from typing import Optional
+
+import pytest
+from starlette.requests import Request
+
+from app.core.proxies import client_ip
+from app.core.settings import settings
+
+
+def _request(peer: str, forwarded_for: Optional[str] = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+def test_forwarded_for_ignored_without_trusted_proxies() -> None:
+    """Test that a client cannot choose its address with the header."""
+    assert client_ip(_request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_client_taken_from_forwarded_for_behind_trusted_proxy(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that clients behind a load balancer get their own address.
+
+    Given: A trusted proxy network and a forwarding chain with a spoofed first hop
+    When: The client address of requests relayed by the proxy is resolved
+    Then: The nearest untrusted hop is returned, not the proxy or the spoofed entry
+    """
+    monkeypatch.setattr(settings, "trusted_proxies", "10.0.0.0/8, ::1")
+
+    assert client_ip(_request("10.0.0.5", "198.51.100.1")) == "198.51.100.1"
+    assert client_ip(_request("10.0.0.5", "192.0.2.66, 198.51.100.2, 10.0.0.9")) == "198.51.100.2"
+    # Request from the proxy itself, or a direct client with the header
+    assert client_ip(_request("::1")) == "::1"
+    assert client_ip(_request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_invalid_trusted_proxy_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a malformed setting raises instead of trusting nothing silently."""
+    monkeypatch.setattr(settings, "trusted_proxies", "10.0.0.0/8, load-balancer")
+
+    with pytest.raises(ValueError):
+        client_ip(_request("10.0.0.5", "198.51.100.1"))
@@ -0,0 +1,51 @@
+"""
+Unit tests for the rate limit bucket stores.
+"""
+import pytest
+
+from app.auth import ratelimit
+from app.auth.ratelimit import MemoryBucketStore, SQLiteBucketStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each bucket store implementation."""
+    if request.param == "memory":
+        return MemoryBucketStore(shards=4)
+    return SQLiteBucketStore(str(tmp_path / "ratelimit.db"))
+
+
+def test_bucket_allows_burst_then_refills(store, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test burst capacity, the retry hint and refill over time.
+
+    Given: A bucket of 3 tokens refilling at 1 token per second
+    When: It is drained, then checked again 2 seconds later
+    Then: 3 requests pass, the 4th waits about 1 second, and after 2 seconds
+        exactly 2 more pass
+    """
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ratelimit.time, "time", lambda: now[0])
+
+    assert [store.take("k", 3, 1.0) for _ in range(3)] == [0, 0, 0]
+    assert store.take("k", 3, 1.0) == pytest.approx(1.0)
+    assert store.take("other", 3, 1.0) == 0
+
+    now[0] += 2
+    assert [store.take("k", 3, 1.0) > 0 for _ in range(3)] == [False, False, True]
+
+
+def test_idle_buckets_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that fully refilled buckets are swept from memory."""
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(ratelimit, "SWEEP_INTERVAL_OPS", 10)
+    store = MemoryBucketStore(shards=1)
+    for i in range(9):
+        store.take(f"idle{i}", 5, 1.0)
+
+    now[0] += 10
+    store.take("active", 5, 1.0)
+
+    assert store.stats()["buckets"] == 1
+    assert store.stats()["expired"] == 9
@@ -0,0 +1,99 @@
+"""
+Unit tests for read replica routing.
+"""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.db.routing import ReplicaRouter
+from app.models import User
+
+
+def _sqlite_url(path) -> str:
+    return f"sqlite:///{path}"
+
+
+@pytest.fixture
+def replica_urls(tmp_path) -> list:
+    """Two SQLite replica files with the schema and one marker user each."""
+    urls = []
+    for name in ("replica_a", "replica_b"):
+        url = _sqlite_url(tmp_path / f"{name}.db")
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.add(User(email=f"{name}@example.com", hashed_password="x"))
+            session.commit()
+        engine.dispose()
+        urls.append(url)
+    return urls
+
+
+@pytest.fixture
+def router(replica_urls):
+    """Router over the two replica files."""
+    router = ReplicaRouter(replica_urls, ejection_seconds=60)
+    yield router
+    router.configure([])
+
+
+def _read_marker(router: ReplicaRouter, primary) -> str:
+    with router.read_session(primary) as session:
+        if session is primary:
+            return "primary"
+        return session.query(User.email).scalar().split("@")[0]
+
+
+def test_reads_round_robin_across_replicas(router: ReplicaRouter) -> None:
+    """Test that consecutive reads alternate between replicas.
+
+    Given: A router with two healthy replicas
+    When: Four read sessions are opened
+    Then: Each replica serves every other read
+    """
+    primary = object()
+
+    markers = [_read_marker(router, primary) for _ in range(4)]
+
+    assert markers == ["replica_a", "replica_b", "replica_a", "replica_b"]
+
+
+def test_failing_replica_is_ejected(router: ReplicaRouter) -> None:
+    """Test that a replica raising a driver error leaves the rotation.
+
+    Given: A router whose first replica lost its schema
+    When: A read on that replica fails
+    Then: Later reads go only to the healthy replica
+    """
+    failing = router.replicas[0]
+    with failing.engine.begin() as connection:
+        connection.execute(text("DROP TABLE refresh_tokens"))
+        connection.execute(text("DROP TABLE users"))
+    primary = object()
+
+    with pytest.raises(OperationalError):
+        _read_marker(router, primary)
+
+    assert not failing.stats()["healthy"]
+    assert failing.failures == 1
+    assert [_read_marker(router, primary) for _ in range(3)] == ["replica_b"] * 3
+
+
+def test_all_replicas_ejected_falls_back_to_primary(router: ReplicaRouter) -> None:
+    """Test that reads use the primary when no replica is healthy."""
+    for replica in router.replicas:
+        router.eject(replica)
+    primary = object()
+
+    assert _read_marker(router, primary) == "primary"
+    assert router.stats()["primary_reads"] == 1
+
+
+def test_without_replicas_reads_use_primary() -> None:
+    """Test that an unconfigured router always yields the primary session."""
+    router = ReplicaRouter([])
+    primary = object()
+
+    assert _read_marker(router, primary) == "primary"
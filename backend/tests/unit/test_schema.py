@@ -0,0 +1,116 @@
+"""
+Unit tests for the startup schema check.
+"""
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, event, inspect
+
+from app.db.schema import SchemaError, ensure_schema, schema_fingerprint
+
+
+def _metadata(with_name: bool = False) -> MetaData:
+    metadata = MetaData()
+    columns = [Column("id", Integer, primary_key=True)]
+    if with_name:
+        columns.append(Column("name", String(50)))
+    Table("things", metadata, *columns)
+    return metadata
+
+
+def test_create_all_runs_once_per_model_change(tmp_path) -> None:
+    """Test that table creation is skipped while the stamp matches the models.
+
+    Given: An empty database
+    When: The schema is ensured three times, the models changing before the third
+    Then: Tables are created on the first and third boot only, and a
+        skipped boot costs a single statement
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+
+    assert ensure_schema(engine, _metadata()) is True
+    assert "things" in inspect(engine).get_table_names()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert ensure_schema(engine, _metadata()) is False
+    assert len(statements) == 1
+
+    assert ensure_schema(engine, _metadata(with_name=True)) is True
+    engine.dispose()
+
+
+def test_alembic_stamp_skips_create_all(tmp_path) -> None:
+    """Test that a database managed by migrations is left alone."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)")
+        conn.exec_driver_sql("INSERT INTO alembic_version VALUES ('abc123')")
+
+    assert ensure_schema(engine, _metadata()) is False
+    assert "things" not in inspect(engine).get_table_names()
+    engine.dispose()
+
+
+def test_fingerprint_tracks_definitions() -> None:
+    """Test that the fingerprint is stable and changes with a column."""
+    assert schema_fingerprint(_metadata()) == schema_fingerprint(_metadata())
+    assert schema_fingerprint(_metadata()) != schema_fingerprint(_metadata(with_name=True))
+
+
+def test_existing_database_is_upgraded_to_the_models(tmp_path) -> None:
+    """Test that a database created before token versioning is upgraded in place.
+
+    Given: A database with the original users and refresh_tokens tables and a user
+    When: The schema is ensured against the current models
+    Then: users.token_version is added (0 for existing rows) and the
+        refresh_tokens purge indexes are created
+    """
+    import app.models  # noqa: F401  (registers the tables on Base.metadata)
+    from app.db import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(320) NOT NULL, "
+            "hashed_password VARCHAR NOT NULL, role VARCHAR(32) NOT NULL, "
+            "created_at DATETIME, updated_at DATETIME)"
+        )
+        conn.exec_driver_sql("CREATE UNIQUE INDEX ix_users_email ON users (email)")
+        conn.exec_driver_sql(
+            "CREATE TABLE refresh_tokens (id INTEGER PRIMARY KEY, jti VARCHAR(36) NOT NULL, "
+            "user_id INTEGER NOT NULL REFERENCES users (id), revoked BOOLEAN NOT NULL, "
+            "created_at DATETIME, expires_at DATETIME NOT NULL)"
+        )
+        conn.exec_driver_sql("INSERT INTO users (email, hashed_password, role) VALUES ('a@example.com', 'x', 'user')")
+
+    assert ensure_schema(engine, Base.metadata) is True
+
+    inspector = inspect(engine)
+    assert "token_version" in {column["name"] for column in inspector.get_columns("users")}
+    assert {"ix_refresh_tokens_expires_at", "ix_refresh_tokens_revoked", "ix_refresh_tokens_jti"} <= {
+        index["name"] for index in inspector.get_indexes("refresh_tokens")
+    }
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT token_version FROM users").scalar() == 0
+
+    assert ensure_schema(engine, Base.metadata) is False
+    engine.dispose()
+
+
+def test_unfixable_schema_fails_without_stamping(tmp_path) -> None:
+    """Test that a column the upgrade cannot add fails startup every time.
+
+    Given: An existing table lacking a NOT NULL column without a default
+    When: The schema is ensured twice
+    Then: Both attempts raise SchemaError naming the column, and no stamp is written
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'drift.db'}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE things (id INTEGER PRIMARY KEY)")
+    metadata = MetaData()
+    Table("things", metadata, Column("id", Integer, primary_key=True), Column("name", String(50), nullable=False))
+
+    for _ in range(2):
+        with pytest.raises(SchemaError, match="column things.name"):
+            ensure_schema(engine, metadata)
+    assert "schema_stamp" not in inspect(engine).get_table_names()
+    engine.dispose()
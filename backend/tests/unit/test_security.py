@@ -0,0 +1,125 @@
+"""
+Unit tests for password hashing utilities and the hashing pool.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.auth.admission import hashing_limiter, rehash_limiter
+from app.auth.calibrate import calibrate
+from app.auth.security import (
+    HashingPool,
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    rehash_password_async,
+    verify_password,
+    verify_password_async,
+)
+from app.core.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_async_hash_roundtrip() -> None:
+    """Test that async hashing produces hashes the sync verifier accepts.
+
+    Given: A password hashed with hash_password_async
+    When: It is verified with both sync and async verifiers
+    Then: The correct password matches and a wrong one does not
+    """
+    hashed = await hash_password_async("securepassword123")
+
+    assert verify_password("securepassword123", hashed)
+    assert await verify_password_async("securepassword123", hashed)
+    assert not await verify_password_async("wrongpassword123", hashed)
+
+
+@pytest.mark.asyncio
+async def test_async_verify_accepts_sync_hash() -> None:
+    """Test that hashes from the sync helper verify on the pool."""
+    hashed = hash_password("securepassword123")
+
+    assert await verify_password_async("securepassword123", hashed)
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_queue_depth() -> None:
+    """Test that jobs beyond the worker count are reported as queued.
+
+    Given: A pool with a single worker blocked on an event
+    When: Three jobs are submitted
+    Then: One job is running and two are waiting in the queue
+    """
+    pool = HashingPool(max_workers=1)
+    release = threading.Event()
+
+    tasks = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+
+    assert pool.in_flight == 3
+    assert pool.queue_depth == 2
+    assert pool.stats()["queue_depth"] == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert pool.in_flight == 0
+    assert pool.queue_depth == 0
+    pool.shutdown()
+
+
+def test_pool_rejects_invalid_configuration() -> None:
+    """Test that invalid pool settings are rejected."""
+    with pytest.raises(ValueError):
+        HashingPool(max_workers=0)
+    with pytest.raises(ValueError):
+        HashingPool(max_workers=1, kind="fiber")
+
+
+def test_cost_comes_from_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that new hashes use the configured cost and old ones go stale.
+
+    Given: A hash made with BCRYPT_ROUNDS=4
+    When: The configured cost changes to 5
+    Then: The old hash needs a rehash, still verifies, and new hashes use 5
+    """
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    old_hash = hash_password("securepassword123")
+    assert old_hash.startswith("$2b$04$")
+    assert not needs_rehash(old_hash)
+
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+
+    assert needs_rehash(old_hash)
+    assert verify_password("securepassword123", old_hash)
+    assert hash_password("securepassword123").startswith("$2b$05$")
+
+
+@pytest.mark.asyncio
+async def test_rehash_yields_to_logins(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that hash upgrades never wait for, or take, a login's slot.
+
+    Given: Every login hashing slot in use
+    When: A rehash is requested, and again once the slots are free
+    Then: The first is skipped without queueing; the second hashes and
+        returns its low-priority slot
+    """
+    monkeypatch.setattr(hashing_limiter, "_active", hashing_limiter.max_concurrent)
+
+    assert await rehash_password_async("securepassword123") is None
+    assert hashing_limiter.waiting == 0
+
+    monkeypatch.setattr(hashing_limiter, "_active", 0)
+    hashed = await rehash_password_async("securepassword123")
+
+    assert verify_password("securepassword123", hashed)
+    assert rehash_limiter.active == 0
+
+
+def test_calibrate_stops_at_budget() -> None:
+    """Test that calibration recommends the last cost within the budget."""
+    best, measured = calibrate("bcrypt", target_seconds=0.0, samples=1)
+
+    assert best is None
+    assert [cost for cost, _seconds in measured] == [4]
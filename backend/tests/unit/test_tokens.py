@@ -0,0 +1,159 @@
+"""
+Unit tests for JWT creation, decoding and the verified-token cache.
+"""
+import hashlib
+import time
+
+import pytest
+from jose import jwt
+
+from app.auth.tokens import (
+    FastHS256Codec,
+    JoseCodec,
+    TokenError,
+    create_access_token,
+    decode_token,
+    token_cache,
+)
+from app.core import cache as cache_module
+from app.core.settings import settings
+
+
+def test_decode_populates_cache() -> None:
+    """Test that a second decode of the same token is a cache hit."""
+    token = create_access_token(user_id=1, role="user")
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first == second
+    assert first["sub"] == "1"
+    assert token_cache.stats()["hits"] >= 1
+    assert len(token_cache) == 1
+
+
+def test_cached_claims_are_copies() -> None:
+    """Test that callers mutating claims cannot corrupt the cache."""
+    token = create_access_token(user_id=1, role="user")
+    decode_token(token)["role"] = "admin"
+
+    assert decode_token(token)["role"] == "user"
+
+
+def test_invalid_tokens_are_not_cached() -> None:
+    """Test that failed verifications leave the cache untouched."""
+    assert decode_token("invalid.token.here") is None
+    assert len(token_cache) == 0
+
+
+def test_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the cache switch bypasses caching entirely."""
+    monkeypatch.setattr(settings, "token_cache_enabled", False)
+    token = create_access_token(user_id=1, role="user")
+
+    assert decode_token(token)["sub"] == "1"
+    assert len(token_cache) == 0
+
+
+def test_cache_entry_never_outlives_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that cached claims are not served past the token's exp.
+
+    Given: A cached access token with a 15 minute lifetime
+    When: The cache clock moves past the token expiry
+    Then: The cache entry is no longer served
+    """
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    token = create_access_token(user_id=1, role="user")
+    decode_token(token)
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    assert token_cache.get(key) is not None
+
+    now[0] += settings.access_token_expires_min * 60 + 1
+
+    assert token_cache.get(key) is None
+    assert token_cache.stats()["expirations"] == 1
+
+
+def test_secret_change_clears_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that claims cached under an old secret are not served after rotation.
+
+    Given: A token decoded and cached under the current secret
+    When: JWT_SECRET changes
+    Then: The token no longer decodes and the cache is empty
+    """
+    token = create_access_token(user_id=1, role="user")
+    assert decode_token(token) is not None
+
+    monkeypatch.setattr(settings, "jwt_secret", settings.jwt_secret + "-rotated")
+
+    assert decode_token(token) is None
+    assert len(token_cache) == 0
+
+
+def test_cache_hit_rechecks_nbf(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a cached token is rejected again if the clock steps before nbf."""
+    now = int(time.time())
+    token = FastHS256Codec(settings.jwt_secret).encode(_claims(nbf=now))
+    assert decode_token(token) is not None
+
+    monkeypatch.setattr(time, "time", lambda: now - 60)
+
+    assert decode_token(token) is None
+
+
+def _claims(**overrides) -> dict:
+    now = int(time.time())
+    claims = {"sub": "1", "role": "user", "ver": 0, "exp": now + 60, "iat": now}
+    claims.update(overrides)
+    return claims
+
+
+def test_fast_codec_matches_jose_byte_for_byte() -> None:
+    """Test that both codecs issue identical tokens and accept each other's.
+
+    Given: The same claims and secret
+    When: Each codec encodes them
+    Then: The tokens are equal and each codec decodes the other's token
+    """
+    fast, jose_codec = FastHS256Codec("secret"), JoseCodec("secret")
+    claims = _claims()
+
+    token = fast.encode(claims)
+
+    assert token == jose_codec.encode(claims)
+    assert jose_codec.decode(token) == claims
+    assert fast.decode(jwt.encode(claims, "secret", algorithm="HS256")) == claims
+
+
+@pytest.mark.parametrize(
+    "token_factory",
+    [
+        lambda: FastHS256Codec("other-secret").encode(_claims()),
+        lambda: FastHS256Codec("secret").encode(_claims(exp=int(time.time()) - 1)),
+        lambda: FastHS256Codec("secret").encode(_claims(exp="tomorrow")),
+        lambda: FastHS256Codec("secret").encode(_claims(nbf=int(time.time()) + 60)),
+        lambda: jwt.encode(_claims(), "secret", algorithm="HS512"),
+        lambda: "e30.e30.",
+        lambda: "not-a-token",
+    ],
+    ids=["bad-signature", "expired", "non-numeric-exp", "not-yet-valid", "wrong-alg", "alg-none", "garbage"],
+)
+def test_fast_codec_rejects_invalid_tokens(token_factory) -> None:
+    """Test that the fast codec rejects what python-jose rejects."""
+    token = token_factory()
+
+    with pytest.raises(TokenError):
+        FastHS256Codec("secret").decode(token)
+
+
+def test_codec_follows_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that switching codec or secret takes effect without a restart."""
+    monkeypatch.setattr(settings, "token_cache_enabled", False)
+    token = create_access_token(user_id=1, role="user")
+
+    monkeypatch.setattr(settings, "jwt_codec", "jose")
+    assert decode_token(token)["sub"] == "1"
+
+    monkeypatch.setattr(settings, "jwt_secret", "rotated-secret")
+    assert decode_token(token) is None